@@ -1,8 +1,67 @@
 import os
 import json
-import requests
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from core.metrics import CACHE_REQUESTS, LLM_FAILURES, LLM_REQUESTS
+from core.shared_cache import shared_cache
+
+# Set to a delay in seconds ("0.8") or a uniform range ("0.5-1.5") to replace the
+# OpenRouter call with a local canned response, e.g. for load tests
+LLM_STUB_ENV = "MERIDIAN_LLM_STUB_DELAY"
+
+STUB_RESPONSE = json.dumps({
+    "top_risks": ["Stubbed LLM risk one", "Stubbed LLM risk two"],
+    "reasoning": "Local LLM stub response."
+})
+
+MODEL = "arcee-ai/trinity-large-preview:free"
+
+# (model, temperature, system_prompt, user_prompt) -> response, successful calls only.
+# Agent prompts embed the signal values, so an unchanged state asks the same
+# questions and gets the same narrative back without another round trip.
+# MERIDIAN_LLM_CACHE=off disables it.
+_llm_cache = OrderedDict()
+_llm_cache_lock = threading.Lock()
+LLM_CACHE_SIZE = 256
+
+def _stub_delay(spec: str) -> float:
+    low, _, high = spec.partition("-")
+    low = float(low)
+    return random.uniform(low, float(high)) if high else low
 
 def call_llm(system_prompt: str, user_prompt: str, temperature: float = 0.0) -> str:
+    stub = os.getenv(LLM_STUB_ENV)
+    if stub:
+        time.sleep(_stub_delay(stub))
+        LLM_REQUESTS.inc(outcome="stub")
+        return STUB_RESPONSE
+
+    use_cache = os.getenv("MERIDIAN_LLM_CACHE", "on") != "off"
+    key = (MODEL, temperature, system_prompt, user_prompt)
+    shared = None
+    if use_cache:
+        with _llm_cache_lock:
+            cached = _llm_cache.get(key)
+            if cached is not None:
+                _llm_cache.move_to_end(key)
+        CACHE_REQUESTS.inc(cache="llm", result="hit" if cached is not None else "miss")
+        if cached is not None:
+            return cached
+        # Then the cache shared by all worker processes, so N workers pay for one call
+        shared = shared_cache()
+        if shared is not None:
+            cached = shared.get(("llm",) + key)
+            CACHE_REQUESTS.inc(cache="shared_llm", result="hit" if cached is not None else "miss")
+        if cached is not None:
+            with _llm_cache_lock:
+                _llm_cache[key] = cached
+            return cached
+
+    # Imported on first use: requests and config (dotenv) stay off the API's import path
+    import requests
     try:
         import config
         api_key = getattr(config, 'OPENROUTER_API_KEY', os.getenv("OPENROUTER_API_KEY"))
@@ -18,7 +77,7 @@ def call_llm(system_prompt: str, user_prompt: str, temperature: float = 0.0) ->
     }
     
     payload = {
-        "model": "arcee-ai/trinity-large-preview:free",
+        "model": MODEL,
         "temperature": temperature,
         "max_tokens": 800,
         "messages": [
@@ -36,6 +95,17 @@ def call_llm(system_prompt: str, user_prompt: str, temperature: float = 0.0) ->
         )
         response.raise_for_status()
         data = response.json()
-        return data["choices"][0]["message"]["content"]
-    except Exception:
+        content = data["choices"][0]["message"]["content"]
+    except Exception as e:
+        LLM_REQUESTS.inc(outcome="error")
+        LLM_FAILURES.inc(reason=type(e).__name__)
         return "LLM_ERROR"
+    LLM_REQUESTS.inc(outcome="ok")
+    if use_cache:
+        with _llm_cache_lock:
+            _llm_cache[key] = content
+            while len(_llm_cache) > LLM_CACHE_SIZE:
+                _llm_cache.popitem(last=False)
+        if shared is not None:
+            shared.put(("llm",) + key, content)
+    return content
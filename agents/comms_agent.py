@@ -1,20 +1,13 @@
 import json
-import datetime
-from collections import defaultdict
 from agents.base_agent import call_llm
+from core.metrics import AGENT_STAGE_SECONDS, StageTimer
+from core.signal_extractor import SignalContext
 
-def _parse_iso(iso_str: str) -> datetime.datetime:
-    if iso_str.endswith("Z"):
-        iso_str = iso_str[:-1] + "+00:00"
-    return datetime.datetime.fromisoformat(iso_str)
-
-def analyze(signals: dict, data: dict) -> dict:
-    tasks = data.get("tasks", [])
+def analyze(signals: dict, data: dict, intermediates: dict = None) -> dict:
+    timer = StageTimer(AGENT_STAGE_SECONDS, agent="comms_agent")
+    if intermediates is None:
+        intermediates = SignalContext(data).bundle()
     devs = data.get("developers", [])
-    threads = data.get("messages", [])
-    active_tasks = [t for t in tasks if t.get("status") != "done"]
-    
-    simulated_now = _parse_iso(data["metadata"]["simulated_now"])
     
     sig_data = signals.get("signals", {})
     silent_sig = sig_data.get("silent_dev_ratio", {"value": 0.0, "score": 0.0})
@@ -28,15 +21,8 @@ def analyze(signals: dict, data: dict) -> dict:
     confidence = 0.75  # comms signals are metadata-based, fixed moderate confidence
     
     # Evidence 1: Silent developers (no messages in 72h)
-    active_dev_ids = {t["assigned_to"] for t in active_tasks if t.get("assigned_to") is not None}
     dev_map = {d.get("dev_id"): d.get("name", d.get("dev_id")) for d in devs}
-    
-    devs_with_recent_msgs = set()
-    for m in threads:
-        if m.get("timestamp") and (simulated_now - _parse_iso(m["timestamp"])).total_seconds() <= 72 * 3600:
-            devs_with_recent_msgs.add(m.get("user_id"))
-            
-    silent_dev_names = [dev_map.get(d_id, d_id) for d_id in active_dev_ids if d_id not in devs_with_recent_msgs]
+    silent_dev_names = [dev_map.get(d_id, d_id) for d_id in intermediates["silent_dev_ids"]]
     
     if silent_dev_names:
         ev_1 = f"Silent developers (last 72h): {', '.join(silent_dev_names)}"
@@ -44,21 +30,11 @@ def analyze(signals: dict, data: dict) -> dict:
         ev_1 = "Silent developers (last 72h): None"
         
     # Evidence 2: Unanswered thread count
-    thread_msg_counts = defaultdict(int)
-    for m in threads:
-        t_id = m.get("thread_id")
-        if t_id:
-            thread_msg_counts[t_id] += 1
-            
-    unanswered_threads = sum(1 for c in thread_msg_counts.values() if c == 1)
+    unanswered_threads = sum(1 for c in intermediates["thread_sizes"].values() if c == 1)
     ev_2 = f"Unanswered threads: {unanswered_threads}"
     
     # Evidence 3: Escalation keyword count in last 72h
-    escalations = sum(
-        1 for m in threads 
-        if m.get("contains_trigger_word") == True 
-        and m.get("timestamp") and (simulated_now - _parse_iso(m["timestamp"])).total_seconds() <= 72 * 3600
-    )
+    escalations = escalation_sig["value"]
     ev_3 = f"Escalation keywords (last 72h): {escalations}"
     
     evidence = [ev_1, ev_2, ev_3]
@@ -85,8 +61,11 @@ def analyze(signals: dict, data: dict) -> dict:
         f"Based on this data, identify the top risks and explain the situation."
     )
     
+    timer.lap("evidence")
+
     # Call LLM
     llm_output = call_llm(system_prompt, user_prompt, temperature=0.0)
+    timer.lap("llm")
     
     # Parse Response
     top_risks = []
@@ -108,6 +87,8 @@ def analyze(signals: dict, data: dict) -> dict:
             top_risks = ["LLM unavailable — signal data still valid"]
             reasoning = "Analysis unavailable."
             
+    timer.lap("parse")
+
     return {
         "agent": "comms_agent",
         "risk_contribution": risk_contribution,
@@ -1,18 +1,12 @@
 import json
-import datetime
 from agents.base_agent import call_llm
+from core.metrics import AGENT_STAGE_SECONDS, StageTimer
+from core.signal_extractor import SignalContext
 
-def _parse_iso(iso_str: str) -> datetime.datetime:
-    if iso_str.endswith("Z"):
-        iso_str = iso_str[:-1] + "+00:00"
-    return datetime.datetime.fromisoformat(iso_str)
-
-def analyze(signals: dict, data: dict) -> dict:
-    tasks = data.get("tasks", [])
-    prs = data.get("pull_requests", [])
-    active_tasks = [t for t in tasks if t.get("status") != "done"]
-    
-    simulated_now = _parse_iso(data["metadata"]["simulated_now"])
+def analyze(signals: dict, data: dict, intermediates: dict = None) -> dict:
+    timer = StageTimer(AGENT_STAGE_SECONDS, agent="delay_agent")
+    if intermediates is None:
+        intermediates = SignalContext(data).bundle()
     
     sig_data = signals.get("signals", {})
     overdue_sig = sig_data.get("overdue_task_ratio", {"value": 0.0, "score": 0.0})
@@ -26,25 +20,20 @@ def analyze(signals: dict, data: dict) -> dict:
     confidence = 1.0  # delay signals are purely timestamp-based, always high confidence
     
     # Evidence 1: Overdue task count and oldest overdue
-    overdue_tasks = []
-    for t in active_tasks:
-        if t.get("due_date") and _parse_iso(t["due_date"]) < simulated_now:
-            overdue_tasks.append(t)
-            
-    if overdue_tasks:
-        oldest_overdue = min(overdue_tasks, key=lambda x: _parse_iso(x["due_date"]))
-        ev_1 = f"Overdue tasks: {len(overdue_tasks)} (Oldest: {oldest_overdue['task_id']} due {oldest_overdue['due_date']})"
+    overdue_task_ids = intermediates["overdue_task_ids"]
+    if overdue_task_ids:
+        oldest_overdue = intermediates["oldest_overdue"]
+        ev_1 = f"Overdue tasks: {len(overdue_task_ids)} (Oldest: {oldest_overdue['task_id']} due {oldest_overdue['due_date']})"
     else:
         ev_1 = "Overdue tasks: 0"
         
     # Evidence 2: Stale task count
-    stale_count = sum(1 for t in active_tasks if t.get("updated_at") and (simulated_now - _parse_iso(t["updated_at"])).total_seconds() > 5 * 24 * 3600)
+    stale_count = len(intermediates["stale_task_ids"])
     ev_2 = f"Stale tasks (>5 days no update): {stale_count}"
     
     # Evidence 3: Average PR age and oldest PR age
-    open_prs = [p for p in prs if p.get("status") == "open"]
-    if open_prs:
-        pr_ages = [(simulated_now - _parse_iso(p["created_at"])).total_seconds() / 86400 for p in open_prs]
+    pr_ages = intermediates["open_pr_ages_days"]
+    if pr_ages:
         avg_pr_age = sum(pr_ages) / len(pr_ages)
         oldest_pr_age = max(pr_ages)
         ev_3 = f"Average open PR age: {avg_pr_age:.1f} days (Oldest: {oldest_pr_age:.1f} days)"
@@ -75,8 +64,11 @@ def analyze(signals: dict, data: dict) -> dict:
         f"Based on this data, identify the top risks and explain the situation."
     )
     
+    timer.lap("evidence")
+
     # Call LLM
     llm_output = call_llm(system_prompt, user_prompt, temperature=0.0)
+    timer.lap("llm")
     
     # Parse Response
     top_risks = []
@@ -98,6 +90,8 @@ def analyze(signals: dict, data: dict) -> dict:
             top_risks = ["LLM unavailable — signal data still valid"]
             reasoning = "Analysis unavailable."
             
+    timer.lap("parse")
+
     return {
         "agent": "delay_agent",
         "risk_contribution": risk_contribution,
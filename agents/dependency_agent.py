@@ -1,11 +1,13 @@
 import json
-from collections import defaultdict
 from agents.base_agent import call_llm
+from core.metrics import AGENT_STAGE_SECONDS, StageTimer
+from core.signal_extractor import SignalContext
+
+def analyze(signals: dict, data: dict, intermediates: dict = None) -> dict:
+    timer = StageTimer(AGENT_STAGE_SECONDS, agent="dependency_agent")
+    if intermediates is None:
+        intermediates = SignalContext(data).bundle()
 
-def analyze(signals: dict, data: dict) -> dict:
-    tasks = data.get("tasks", [])
-    active_tasks = [t for t in tasks if t.get("status") != "done"]
-    
     sig_data = signals.get("signals", {})
     blocked_sig = sig_data.get("blocked_task_ratio", {"value": 0.0, "score": 0.0})
     crit_path_sig = sig_data.get("critical_path_depth", {"value": 0.0, "score": 0.0})
@@ -18,12 +20,7 @@ def analyze(signals: dict, data: dict) -> dict:
     confidence = 1.0 - (0.2 if blocked_sig["score"] < 0.3 else 0.0)
     
     # Evidence 1: Task with most dependents
-    dep_counts = defaultdict(int)
-    for t in tasks:
-        for dep in t.get("depends_on", []):
-            if dep:
-                dep_counts[dep] += 1
-                
+    dep_counts = intermediates["in_degree"]
     if dep_counts:
         most_deps_task = max(dep_counts, key=dep_counts.get)
         most_deps_count = dep_counts[most_deps_task]
@@ -32,30 +29,7 @@ def analyze(signals: dict, data: dict) -> dict:
         ev_1 = "Task with most dependents: None (0 dependents)"
         
     # Evidence 2: Longest dependency chain
-    adj = {t["task_id"]: t.get("depends_on", []) for t in tasks}
-    
-    def get_longest_path(node, memo):
-        if node in memo: return memo[node]
-        deps = adj.get(node, [])
-        if not deps:
-            memo[node] = [node]
-            return [node]
-        max_path = []
-        for dep in deps:
-            if dep in adj:
-                p = get_longest_path(dep, memo)
-                if len(p) > len(max_path):
-                    max_path = p
-        memo[node] = [node] + max_path
-        return memo[node]
-
-    memo = {}
-    longest_chain = []
-    for t_id in adj:
-        p = get_longest_path(t_id, memo)
-        if len(p) > len(longest_chain):
-            longest_chain = p
-            
+    longest_chain = intermediates["longest_chain"]
     if longest_chain:
         chain_str = " -> ".join(longest_chain)
         ev_2 = f"Longest dependency chain: {chain_str}"
@@ -63,7 +37,7 @@ def analyze(signals: dict, data: dict) -> dict:
         ev_2 = "Longest dependency chain: None"
         
     # Evidence 3: Blocked task count and ratio
-    blocked_count = sum(1 for t in active_tasks if t.get("status") == "blocked")
+    blocked_count = len(intermediates["blocked_task_ids"])
     blocked_ratio = blocked_sig["value"]
     ev_3 = f"Blocked tasks: {blocked_count} ({blocked_ratio:.0%} active blocked ratio)"
     
@@ -91,8 +65,11 @@ def analyze(signals: dict, data: dict) -> dict:
         f"Based on this data, identify the top risks and explain the situation."
     )
     
+    timer.lap("evidence")
+
     # Call LLM
     llm_output = call_llm(system_prompt, user_prompt, temperature=0.0)
+    timer.lap("llm")
     
     # Parse Response
     top_risks = []
@@ -115,6 +92,8 @@ def analyze(signals: dict, data: dict) -> dict:
             top_risks = ["LLM unavailable — signal data still valid"]
             reasoning = "Analysis unavailable."
             
+    timer.lap("parse")
+
     return {
         "agent": "dependency_agent",
         "risk_contribution": risk_contribution,
@@ -133,9 +112,9 @@ if __name__ == "__main__":
     # Add project root to sys.path so we can import core.signal_extractor correctly
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
     from core.signal_extractor import extract_signals
+    from core.state_loader import load_project_state
 
-    with open("data/unified_project_state.json") as f:
-        data = json.load(f)
+    data, _ = load_project_state()
 
     signals = extract_signals(data)
     result = analyze(signals, data)
@@ -1,18 +1,12 @@
 import json
-import datetime
 from agents.base_agent import call_llm
+from core.metrics import AGENT_STAGE_SECONDS, StageTimer
+from core.signal_extractor import SignalContext
 
-def _parse_iso(iso_str: str) -> datetime.datetime:
-    if iso_str.endswith("Z"):
-        iso_str = iso_str[:-1] + "+00:00"
-    return datetime.datetime.fromisoformat(iso_str)
-
-def analyze(signals: dict, data: dict) -> dict:
-    tasks = data.get("tasks", [])
-    prs = data.get("pull_requests", [])
-    sprints = data.get("sprints", [])
-    
-    simulated_now = _parse_iso(data["metadata"]["simulated_now"])
+def analyze(signals: dict, data: dict, intermediates: dict = None) -> dict:
+    timer = StageTimer(AGENT_STAGE_SECONDS, agent="scope_agent")
+    if intermediates is None:
+        intermediates = SignalContext(data).bundle()
     
     sig_data = signals.get("signals", {})
     mid_sprint_sig = sig_data.get("mid_sprint_task_additions", {"value": 0.0, "score": 0.0})
@@ -26,32 +20,19 @@ def analyze(signals: dict, data: dict) -> dict:
     confidence = 1.0 - (0.1 if mid_sprint_sig["score"] == 0.0 else 0.0)
     
     # Evidence 1: Baseline task count vs current count
-    total_tasks = len(tasks)
-    baseline_count = sum(1 for t in tasks if t.get("is_baseline") == True)
+    total_tasks = len(data.get("tasks", []))
+    baseline_count = intermediates["baseline_count"]
     ev_1 = f"Scope growth: {baseline_count} baseline tasks -> {total_tasks} current tasks"
     
     # Evidence 2: Mid-sprint additions
-    current_sprint = None
-    for sp in sprints:
-        if _parse_iso(sp["start_date"]) <= simulated_now <= _parse_iso(sp["end_date"]):
-            current_sprint = sp
-            break
-
-    mid_additions = []
-    if current_sprint:
-        sp_start = _parse_iso(current_sprint["start_date"])
-        for t in tasks:
-            if t.get("sprint_id") == current_sprint["sprint_id"]:
-                if _parse_iso(t["created_at"]) > sp_start and t.get("is_baseline") == False:
-                    mid_additions.append(t["task_id"])
-                    
+    mid_additions = intermediates["mid_sprint_task_ids"]
     if mid_additions:
         ev_2 = f"Mid-sprint additions ({len(mid_additions)}): {', '.join(mid_additions)}"
     else:
         ev_2 = "Mid-sprint additions: None"
         
     # Evidence 3: Out of scope PRs
-    out_of_scope_prs = sum(1 for p in prs if p.get("task_id") is None)
+    out_of_scope_prs = out_of_scope_sig["value"]
     ev_3 = f"PRs with no linked task: {out_of_scope_prs}"
     
     evidence = [ev_1, ev_2, ev_3]
@@ -78,8 +59,11 @@ def analyze(signals: dict, data: dict) -> dict:
         f"Based on this data, identify the top risks and explain the situation."
     )
     
+    timer.lap("evidence")
+
     # Call LLM
     llm_output = call_llm(system_prompt, user_prompt, temperature=0.0)
+    timer.lap("llm")
     
     # Parse Response
     top_risks = []
@@ -101,6 +85,8 @@ def analyze(signals: dict, data: dict) -> dict:
             top_risks = ["LLM unavailable — signal data still valid"]
             reasoning = "Analysis unavailable."
             
+    timer.lap("parse")
+
     return {
         "agent": "scope_agent",
         "risk_contribution": risk_contribution,
@@ -2,10 +2,11 @@ import asyncio
 import json
 from concurrent.futures import ThreadPoolExecutor
 
-from core.signal_extractor import extract_signals
+from core.signal_extractor import signal_context
 from core.risk_formula import compute_risk_score
 from core.whatif_engine import run_simulation as run_whatif_simulation
-from core.monte_carlo import run_monte_carlo
+from core.monte_carlo import cached_monte_carlo
+from core.metrics import EXECUTOR_QUEUE_DEPTH
 
 from agents import dependency_agent
 from agents import workload_agent
@@ -13,9 +14,9 @@ from agents import scope_agent
 from agents import delay_agent
 from agents import comms_agent
 
-def _safe_analyze(agent_module, signals, data):
+def _safe_analyze(agent_module, signals, data, intermediates):
     try:
-        return agent_module.analyze(signals, data)
+        return agent_module.analyze(signals, data, intermediates)
     except Exception as e:
         # If any single agent fails, we construct a fallback output mimicking its expected format
         agent_name = agent_module.__name__.split('.')[-1]
@@ -29,23 +30,34 @@ def _safe_analyze(agent_module, signals, data):
             "signal_refs": []
         }
 
-async def run_full_analysis(data: dict) -> dict:
-    signals = extract_signals(data)
+def _queued_analyze(agent_module, signals, data, intermediates):
+    try:
+        return _safe_analyze(agent_module, signals, data, intermediates)
+    finally:
+        EXECUTOR_QUEUE_DEPTH.dec(pool="agents")
+
+async def run_full_analysis(data: dict, state_version: str = None) -> dict:
+    # One fused extraction feeds both the signals and every agent's evidence
+    context = signal_context(data, state_version)
+    signals = context.signals()
+    intermediates = context.bundle()
     
     # Compute the risk score deterministically
     risk_data = compute_risk_score(signals)
     
+    agent_modules = [
+        dependency_agent,
+        workload_agent,
+        scope_agent,
+        delay_agent,
+        comms_agent
+    ]
     loop = asyncio.get_event_loop()
+    EXECUTOR_QUEUE_DEPTH.inc(len(agent_modules), pool="agents")
     with ThreadPoolExecutor(max_workers=5) as executor:
         futures = [
-            loop.run_in_executor(executor, _safe_analyze, agent_module, signals, data)
-            for agent_module in [
-                dependency_agent,
-                workload_agent,
-                scope_agent,
-                delay_agent,
-                comms_agent
-            ]
+            loop.run_in_executor(executor, _queued_analyze, agent_module, signals, data, intermediates)
+            for agent_module in agent_modules
         ]
         results = await asyncio.gather(*futures)
         
@@ -62,21 +74,22 @@ async def run_full_analysis(data: dict) -> dict:
     }
 
     # Run Monte Carlo analysis
-    mc_result = run_monte_carlo(signals)
+    mc_result = cached_monte_carlo(signals, state_version)
     final_output['monte_carlo'] = mc_result
 
     return final_output
 
-def run_simulation(data: dict, mutation: dict) -> dict:
-    return run_whatif_simulation(data, mutation)
+def run_simulation(data: dict, mutation: dict, state_version: str = None,
+                   monte_carlo: bool = False, n_simulations: int = 10000) -> dict:
+    return run_whatif_simulation(data, mutation, state_version, monte_carlo, n_simulations)
 
 if __name__ == "__main__":
     import os
     import sys
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from core.state_loader import load_project_state
     
-    with open("data/unified_project_state.json") as f:
-        data = json.load(f)
+    data, _ = load_project_state()
 
     result = asyncio.run(run_full_analysis(data))
 
@@ -1,11 +1,13 @@
 import json
-from collections import defaultdict
 from agents.base_agent import call_llm
+from core.metrics import AGENT_STAGE_SECONDS, StageTimer
+from core.signal_extractor import SignalContext
 
-def analyze(signals: dict, data: dict) -> dict:
-    tasks = data.get("tasks", [])
+def analyze(signals: dict, data: dict, intermediates: dict = None) -> dict:
+    timer = StageTimer(AGENT_STAGE_SECONDS, agent="workload_agent")
+    if intermediates is None:
+        intermediates = SignalContext(data).bundle()
     devs = data.get("developers", [])
-    active_tasks = [t for t in tasks if t.get("status") != "done"]
     
     sig_data = signals.get("signals", {})
     overload_sig = sig_data.get("overloaded_dev_ratio", {"value": 0.0, "score": 0.0})
@@ -19,11 +21,7 @@ def analyze(signals: dict, data: dict) -> dict:
     confidence = 1.0 - (0.15 if unassigned_sig["score"] < 0.2 else 0.0)
     
     # Evidence 1: List each developer's open task count
-    open_assigned = defaultdict(int)
-    for t in active_tasks:
-        if t.get("assigned_to"):
-            open_assigned[t["assigned_to"]] += 1
-            
+    open_assigned = intermediates["open_assigned"]
     dev_counts = []
     most_overloaded = None
     max_tasks = -1
@@ -52,7 +50,7 @@ def analyze(signals: dict, data: dict) -> dict:
         ev_2 = "Most overloaded dev: None"
         
     # Evidence 3: Unassigned task count
-    unassigned_count = sum(1 for t in active_tasks if t.get("assigned_to") is None)
+    unassigned_count = len(intermediates["unassigned_task_ids"])
     ev_3 = f"Unassigned tasks: {unassigned_count}"
     
     evidence = [ev_1, ev_2, ev_3]
@@ -79,11 +77,14 @@ def analyze(signals: dict, data: dict) -> dict:
         f"Based on this data, identify the top risks and explain the situation."
     )
     
+    timer.lap("evidence")
+
     try:
         llm_output = call_llm(system_prompt, user_prompt, temperature=0.0)
     except Exception as e:
         print(f"WORKLOAD AGENT LLM ERROR: {e}")
         llm_output = "LLM_ERROR"
+    timer.lap("llm")
     
     # Parse Response
     top_risks = []
@@ -105,6 +106,8 @@ def analyze(signals: dict, data: dict) -> dict:
             top_risks = ["LLM unavailable — signal data still valid"]
             reasoning = "Analysis unavailable."
             
+    timer.lap("parse")
+
     return {
         "agent": "workload_agent",
         "risk_contribution": risk_contribution,
@@ -123,9 +126,9 @@ if __name__ == "__main__":
     # Add project root to sys.path so we can import core.signal_extractor correctly
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
     from core.signal_extractor import extract_signals
+    from core.state_loader import load_project_state
 
-    with open("data/unified_project_state.json") as f:
-        data = json.load(f)
+    data, _ = load_project_state()
 
     signals = extract_signals(data)
     result = analyze(signals, data)
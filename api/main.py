@@ -1,10 +1,44 @@
+import time
+_import_start = time.perf_counter()
+
+import asyncio
 import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from api.routes import router
+from api.routes import router, get_data_path
 from api.websocket import ws_router
+from api.profiling import profile_router
+from core.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS, STARTUP_SECONDS
+from core.precompute import scheduler_from_env
+from core.warmup import prewarm_narratives, warm_up
+
+STARTUP_SECONDS.set(time.perf_counter() - _import_start, phase="import")
 
-app = FastAPI(title="Meridian Risk Intelligence")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # MERIDIAN_WARMUP=off skips warm-up; MERIDIAN_WARMUP_NARRATIVES=on also
+    # runs the agents once in the background to fill the LLM cache
+    narratives = None
+    if os.getenv("MERIDIAN_WARMUP", "on") != "off":
+        try:
+            timings = await asyncio.get_running_loop().run_in_executor(None, warm_up, get_data_path())
+            print("Meridian warm-up: " + ", ".join(f"{k} {v * 1000:.0f} ms" for k, v in timings.items()))
+        except Exception as e:
+            print(f"Meridian warm-up failed: {e}")  # Requests still work, just cold
+        if os.getenv("MERIDIAN_WARMUP_NARRATIVES") == "on":
+            narratives = asyncio.create_task(prewarm_narratives(get_data_path()))
+    # Keeps a finished analysis in memory for /api/analysis (MERIDIAN_PRECOMPUTE=off disables it)
+    app.state.precompute = scheduler_from_env([get_data_path()])
+    if app.state.precompute is not None:
+        app.state.precompute.start()
+    yield
+    if app.state.precompute is not None:
+        await app.state.precompute.stop()
+    if narratives is not None and not narratives.done():
+        narratives.cancel()
+
+app = FastAPI(title="Meridian Risk Intelligence", lifespan=lifespan)
 
 allowed_origin = os.getenv("ALLOWED_ORIGIN", "*")
 origins = [
@@ -20,5 +54,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    HTTP_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # Label by route template, not raw path, to keep the series count bounded
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            route=getattr(route, "path", "unmatched"),
+            method=request.method,
+            status=status,
+        )
+
 app.include_router(router)
 app.include_router(ws_router)
+app.include_router(profile_router)
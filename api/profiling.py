@@ -0,0 +1,152 @@
+import hmac
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from core.profiler import SamplingProfiler
+
+# Profiling is off unless this is set; the value is the admin token requests must present
+PROFILE_TOKEN_ENV = "MERIDIAN_PROFILE_TOKEN"
+PROFILE_HEADER = "x-meridian-profile"
+PROFILE_QUERY_PARAM = "profile"
+
+MAX_STORED_PROFILES = 16
+TOP_N = 20
+
+profile_router = APIRouter()
+
+# profile_id -> {"endpoint", "created_at", "summary", "folded"}, most recent last
+_profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+# The sampler and tracemalloc see the whole process, so only one profile runs at a time
+_active = threading.Lock()
+
+
+def _admin_token():
+    return os.getenv(PROFILE_TOKEN_ENV) or None
+
+
+def _token_matches(supplied: str, admin_token: str) -> bool:
+    return hmac.compare_digest(supplied.encode("utf-8"), admin_token.encode("utf-8"))
+
+
+def _require_admin(request: Request):
+    admin_token = _admin_token()
+    if admin_token is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY_PARAM)
+    if supplied is None or not _token_matches(supplied, admin_token):
+        raise HTTPException(status_code=403, detail="Admin profiling token required.")
+
+
+class _NoProfile:
+    """Stand-in used when profiling was not requested: every method is a no-op."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def attach(self, response):
+        return response
+
+
+NO_PROFILE = _NoProfile()
+
+
+class _RequestProfile:
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.profile_id = uuid.uuid4().hex[:16]
+        self.profiler = SamplingProfiler()
+
+    def __enter__(self):
+        if not _active.acquire(blocking=False):
+            raise HTTPException(status_code=409, detail="Another profile is already running.")
+        self.profiler.start()
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self.profiler.stop()
+        finally:
+            _active.release()
+        with _profiles_lock:
+            _profiles[self.profile_id] = {
+                "endpoint": self.endpoint,
+                "created_at": time.time(),
+                "summary": self.profiler.summary(TOP_N),
+                "folded": self.profiler.folded(),
+            }
+            while len(_profiles) > MAX_STORED_PROFILES:
+                _profiles.popitem(last=False)
+        return False
+
+    def attach(self, response):
+        response.headers["X-Profile-Id"] = self.profile_id
+        response.headers["X-Profile-Url"] = f"/api/profiles/{self.profile_id}"
+        return response
+
+
+def profile_request(request: Request, endpoint: str):
+    """
+    Returns a context manager that profiles the enclosed work when the request
+    carries the admin token (header or ?profile=), and NO_PROFILE otherwise.
+    With MERIDIAN_PROFILE_TOKEN unset this is a single environment lookup.
+    """
+    admin_token = _admin_token()
+    if admin_token is None:
+        return NO_PROFILE
+    supplied = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY_PARAM)
+    if supplied is None:
+        return NO_PROFILE
+    if not _token_matches(supplied, admin_token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token.")
+    return _RequestProfile(endpoint)
+
+
+def _get_profile(profile_id: str) -> dict:
+    with _profiles_lock:
+        profile = _profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found or expired.")
+    return profile
+
+
+@profile_router.get("/api/profiles")
+def list_profiles(request: Request):
+    _require_admin(request)
+    with _profiles_lock:
+        items = list(_profiles.items())
+    return [
+        {
+            "profile_id": profile_id,
+            "endpoint": profile["endpoint"],
+            "created_at": profile["created_at"],
+            "duration_s": profile["summary"]["duration_s"],
+        }
+        for profile_id, profile in reversed(items)
+    ]
+
+
+@profile_router.get("/api/profiles/{profile_id}")
+def get_profile_summary(profile_id: str, request: Request):
+    _require_admin(request)
+    profile = _get_profile(profile_id)
+    return {"profile_id": profile_id, "endpoint": profile["endpoint"], **profile["summary"]}
+
+
+@profile_router.get("/api/profiles/{profile_id}/download")
+def download_profile(profile_id: str, request: Request):
+    _require_admin(request)
+    profile = _get_profile(profile_id)
+    return PlainTextResponse(
+        profile["folded"],
+        headers={"Content-Disposition": f'attachment; filename="meridian-{profile["endpoint"]}-{profile_id}.folded"'},
+    )
@@ -1,17 +1,32 @@
 import json
+import time
 import asyncio
 from pathlib import Path
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
 
-from api.schemas import MutationRequest, RiskAnalysisResponse, SimulationResponse
-from agents import supervisor_agent
-from core.signal_extractor import extract_signals
-from core.monte_carlo import run_monte_carlo
+from api.schemas import (
+    MutationRequest, RiskAnalysisResponse, SimulationResponse,
+    SweepRequest, SweepResponse, OptimizeRequest, OptimizeResponse,
+)
+from api.serialization import encode_response
+from api.profiling import profile_request
+from core.monte_carlo import cached_monte_carlo
+from core.whatif_engine import run_simulation
+from core.schedule_simulation import run_schedule_monte_carlo
+from core.whatif_sweep import run_sweep
+from core.mitigation_optimizer import optimize_mitigation
+from core.impact_ranking import ACTIONS, rank_mitigations
+from core.forecast import MAX_HORIZON_DAYS, forecast
+from core.state_loader import DATA_PATH, load_project_signals, load_project_state, query_signals
+from core.metrics import CACHE_REQUESTS, render_metrics
+from core.precompute import compute_analysis, tag_result
+from core.shared_cache import get_or_compute
+from core.history_store import default_store
+from core.signal_extractor import _parse_iso
 
 router = APIRouter()
 
-DATA_PATH = Path(__file__).parent.parent / "data" / "unified_project_state.json"
-
 def get_data_path() -> Path:
     return DATA_PATH
 
@@ -19,54 +34,222 @@ def get_data_path() -> Path:
 def health_check():
     return {"status": "ok", "system": "Meridian"}
 
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@router.get("/api/signals")
+def signals_endpoint(http_request: Request, names: str = Query(None)):
+    selected = [n.strip() for n in names.split(",") if n.strip()] if names else None
+    try:
+        result, _ = query_signals(selected, get_data_path())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Signal extraction failed.")
+    return encode_response(http_request, result)
+
 @router.get("/api/analysis", response_model=RiskAnalysisResponse)
-async def get_analysis():
+async def get_analysis(http_request: Request):
+    profile = profile_request(http_request, "analysis")
+    with profile:
+        data_path = get_data_path()
+        try:
+            data, version = load_project_state(data_path)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail="Failed to load project state data.")
+
+        # A result the background scheduler finished for this exact state version,
+        # or is computing right now (e.g. just after startup): wait for that run
+        precompute = getattr(http_request.app.state, "precompute", None)
+        ready = precompute.ready(data_path) if precompute is not None else None
+        if precompute is not None and ready is None:
+            pending = precompute.pending(data_path, version)
+            if pending is not None:
+                # Shielded: a client that disconnects must not cancel the scheduler's run
+                await asyncio.shield(pending)
+                ready = precompute.ready(data_path)
+        if precompute is not None:
+            CACHE_REQUESTS.inc(cache="precomputed_analysis", result="hit" if ready is not None else "miss")
+
+        if ready is not None:
+            result = tag_result(ready)
+        else:
+            try:
+                # Recorded in history by whichever worker computes it, not per request
+                refresh_s = precompute.refresh_s if precompute is not None else 0.0
+                analysis = await compute_analysis(data_path, data, version, refresh_s)
+                result = analysis["result"]
+            except Exception as e:
+                raise HTTPException(status_code=500, detail="Internal analysis failed.")
+            if precompute is not None:
+                precompute.store(data_path, version, result, computed_at=analysis["computed_at"])
+    response = encode_response(http_request, result)
+    if ready is not None:
+        response.headers["Age"] = str(int(result["precomputed"]["age_seconds"]))
+    return profile.attach(response)
+
+@router.get("/api/precompute")
+def precompute_status(http_request: Request):
+    precompute = getattr(http_request.app.state, "precompute", None)
+    if precompute is None:
+        return {"enabled": False, "states": []}
+    return {
+        "enabled": True,
+        "poll_s": precompute.poll_s,
+        "refresh_s": precompute.refresh_s,
+        "concurrency": precompute.concurrency,
+        "states": precompute.status(),
+    }
+
+@router.post("/api/simulate", response_model=SimulationResponse)
+def simulate(request: MutationRequest, http_request: Request):
+    profile = profile_request(http_request, "simulate")
+    with profile:
+        data_path = get_data_path()
+        try:
+            data, version = load_project_state(data_path)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail="Failed to load project state data.")
+
+        mutation = {"type": request.type}
+        if request.type == "add_developers":
+            mutation["count"] = request.count
+        elif request.type == "extend_deadline":
+            mutation["days"] = request.days
+        elif request.type == "remove_scope":
+            mutation["task_count"] = request.task_count
+        elif request.type == "close_prs":
+            mutation["pr_count"] = request.pr_count
+
+        try:
+            key = ("whatif", version, mutation, request.monte_carlo, request.n_simulations)
+            result = get_or_compute(key, lambda: run_simulation(
+                data, mutation, version,
+                monte_carlo=request.monte_carlo,
+                n_simulations=request.n_simulations,
+            ))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail="Simulation failed.")
+    return profile.attach(encode_response(http_request, result))
+
+@router.post("/api/simulate/sweep", response_model=SweepResponse)
+def simulate_sweep(request: SweepRequest, http_request: Request):
     data_path = get_data_path()
     try:
-        with open(data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data, version = load_project_state(data_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to load project state data.")
 
+    ranges = {k: v.model_dump() for k, v in request if v is not None}
     try:
-        # Await the async function directly inside the async route
-        result = await supervisor_agent.run_full_analysis(data)
-        return result
+        result = run_sweep(data, ranges, version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail="Internal analysis failed.")
+        raise HTTPException(status_code=500, detail="Sweep failed.")
+    return encode_response(http_request, result)
 
-@router.post("/api/simulate", response_model=SimulationResponse)
-def simulate(request: MutationRequest):
+@router.post("/api/optimize", response_model=OptimizeResponse)
+def optimize(request: OptimizeRequest, http_request: Request):
+    data_path = get_data_path()
+    try:
+        data, version = load_project_state(data_path)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Failed to load project state data.")
+
+    try:
+        result = optimize_mitigation(
+            data,
+            request.costs,
+            target_score=request.target_score,
+            target_level=request.target_level,
+            max_amounts=request.max_amounts,
+            state_version=version,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Optimization failed.")
+    return encode_response(http_request, result)
+
+@router.get("/api/impact-ranking")
+def impact_ranking(http_request: Request, limit: int = Query(10, ge=1, le=1000), actions: str = ",".join(ACTIONS)):
     data_path = get_data_path()
     try:
-        with open(data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data, _ = load_project_state(data_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to load project state data.")
 
-    mutation = {"type": request.type}
-    if request.type == "add_developers":
-        mutation["count"] = request.count
-    elif request.type == "extend_deadline":
-        mutation["days"] = request.days
-    elif request.type == "remove_scope":
-        mutation["task_count"] = request.task_count
-    elif request.type == "close_prs":
-        mutation["pr_count"] = request.pr_count
+    try:
+        result = rank_mitigations(data, limit=limit, actions=[a.strip() for a in actions.split(",") if a.strip()])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Impact ranking failed.")
+    return encode_response(http_request, result)
+
+@router.get("/api/forecast")
+def forecast_endpoint(http_request: Request, days: int = Query(30, ge=1, le=MAX_HORIZON_DAYS)):
+    data_path = get_data_path()
+    try:
+        data, version = load_project_state(data_path)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Failed to load project state data.")
 
     try:
-        result = supervisor_agent.run_simulation(data, mutation)
-        return result
+        result = forecast(data, days=days, state_version=version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail="Simulation failed.")
+        raise HTTPException(status_code=500, detail="Forecast failed.")
+    return encode_response(http_request, result)
 
 @router.get("/api/monte-carlo")
-async def monte_carlo_endpoint():
+async def monte_carlo_endpoint(http_request: Request):
+    profile = profile_request(http_request, "monte-carlo")
+    with profile:
+        try:
+            signals, version = load_project_signals(get_data_path())
+            result = cached_monte_carlo(signals, version, n_simulations=10000)
+        except Exception as e:
+            return {"error": str(e)}
+    return profile.attach(encode_response(http_request, result))
+
+@router.get("/api/monte-carlo/schedule")
+def schedule_monte_carlo_endpoint(
+    http_request: Request,
+    n_simulations: int = Query(10000, ge=100, le=100000),
+    seed: int = Query(None),
+):
+    data_path = get_data_path()
+    try:
+        data, _ = load_project_state(data_path)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Failed to load project state data.")
+
+    try:
+        result = run_schedule_monte_carlo(data, n_simulations=n_simulations, seed=seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Schedule simulation failed.")
+    return encode_response(http_request, result)
+
+@router.get("/api/history")
+def history(
+    http_request: Request,
+    start: str = Query(None, alias="from"),
+    end: str = Query(None, alias="to"),
+    resolution: str = "auto",
+    project: str = None,
+):
     try:
-        with open(DATA_PATH) as f:
-            data = json.load(f)
-        signals = extract_signals(data)
-        result = run_monte_carlo(signals, n_simulations=10000)
-        return result
+        end_t = _parse_iso(end).timestamp() if end else time.time()
+        start_t = _parse_iso(start).timestamp() if start else end_t - 7 * 86400
+        result = default_store().query(start_t, end_t, resolution=resolution, project=project)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        return {"error": str(e)}
+        raise HTTPException(status_code=500, detail="History query failed.")
+    return encode_response(http_request, result)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional
 
 class MutationRequest(BaseModel):
     type: str
@@ -7,6 +7,25 @@ class MutationRequest(BaseModel):
     days: int = 0
     task_count: int = 0
     pr_count: int = 0
+    monte_carlo: bool = False
+    n_simulations: int = Field(10000, ge=100, le=200000)
+
+class SweepRange(BaseModel):
+    start: int = Field(0, ge=0)
+    stop: int = Field(0, ge=0)
+    step: int = Field(1, ge=1)
+
+class SweepRequest(BaseModel):
+    add_developers: Optional[SweepRange] = None
+    extend_deadline: Optional[SweepRange] = None
+    remove_scope: Optional[SweepRange] = None
+    close_prs: Optional[SweepRange] = None
+
+class OptimizeRequest(BaseModel):
+    costs: Dict[str, float]
+    target_score: float = 60.0
+    target_level: Optional[str] = None
+    max_amounts: Dict[str, int] = {}
 
 class AgentOutput(BaseModel):
     agent: str
@@ -27,6 +46,8 @@ class RiskAnalysisResponse(BaseModel):
     signals: Dict[str, Any]
     timestamp: str
     formula_version: str
+    monte_carlo: Optional[Dict[str, Any]] = None
+    precomputed: Optional[Dict[str, Any]] = None
 
 class SimulationResponse(BaseModel):
     baseline: Dict[str, Any]
@@ -34,3 +55,27 @@ class SimulationResponse(BaseModel):
     delta: Dict[str, Any]
     mutation_applied: Dict[str, Any]
     simulation_version: str
+    monte_carlo: Optional[Dict[str, Any]] = None
+
+class SweepResponse(BaseModel):
+    baseline: Dict[str, Any]
+    axes: List[Dict[str, Any]]
+    shape: List[int]
+    scores: List[float]
+    risk_levels: List[str]
+    boundaries: List[Dict[str, Any]]
+    best: Dict[str, Any]
+    n_points: int
+    sweep_version: str
+
+class OptimizeResponse(BaseModel):
+    baseline: Dict[str, Any]
+    target_score: float
+    achieved: bool
+    plan: Dict[str, int]
+    plan_cost: float
+    plan_score: float
+    plan_level: str
+    pareto_front: List[Dict[str, Any]]
+    evaluations: int
+    optimizer_version: str
@@ -0,0 +1,104 @@
+import gzip
+import json
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import Response
+
+# Optional fast paths — each falls back to the stdlib when not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Payloads smaller than this are sent uncompressed; the header overhead isn't worth it
+COMPRESSION_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def _accepted_tokens(header_value: str) -> dict:
+    """Helper to parse an Accept / Accept-Encoding header into {token: q}."""
+    tokens = {}
+    for part in header_value.split(","):
+        pieces = [p.strip() for p in part.split(";")]
+        token = pieces[0].lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in pieces[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        tokens[token] = q
+    return tokens
+
+
+def dumps_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def negotiate_media_type(request: Request) -> str:
+    if msgpack is None:
+        return JSON_MEDIA_TYPE
+    accepted = _accepted_tokens(request.headers.get("accept", ""))
+    for media_type in MSGPACK_MEDIA_TYPES:
+        if accepted.get(media_type, 0.0) > 0.0:
+            return media_type
+    return JSON_MEDIA_TYPE
+
+
+def negotiate_encoding(request: Request) -> str:
+    accepted = _accepted_tokens(request.headers.get("accept-encoding", ""))
+    if brotli is not None and accepted.get("br", 0.0) > 0.0:
+        return "br"
+    if accepted.get("gzip", 0.0) > 0.0:
+        return "gzip"
+    return "identity"
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+def encode_response(request: Request, payload: Any, status_code: int = 200) -> Response:
+    """
+    Serialises a payload the server built itself, bypassing response_model
+    re-validation. Honours `Accept: application/msgpack` and compresses large
+    bodies with brotli or gzip according to `Accept-Encoding`.
+    """
+    media_type = negotiate_media_type(request)
+    if media_type == JSON_MEDIA_TYPE:
+        body = dumps_json(payload)
+    else:
+        body = msgpack.packb(payload, use_bin_type=True)
+
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if len(body) >= COMPRESSION_MIN_BYTES:
+        encoding = negotiate_encoding(request)
+        if encoding != "identity":
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
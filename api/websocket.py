@@ -4,19 +4,16 @@ from pathlib import Path
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from concurrent.futures import ThreadPoolExecutor
 
-from core.signal_extractor import extract_signals
+from core.signal_extractor import signal_context
 from core.risk_formula import compute_risk_score
-
-from agents import dependency_agent
-from agents import workload_agent
-from agents import scope_agent
-from agents import delay_agent
-from agents import comms_agent
+from core.state_loader import DATA_PATH, load_project_state
+from core.metrics import EXECUTOR_QUEUE_DEPTH
+from core.history_store import record_analysis
 
 ws_router = APIRouter()
 
 def get_data_path() -> Path:
-    return Path(__file__).parent.parent / "data" / "unified_project_state.json"
+    return DATA_PATH
 
 @ws_router.websocket("/ws/analysis")
 async def websocket_analysis(websocket: WebSocket):
@@ -40,15 +37,17 @@ async def websocket_analysis(websocket: WebSocket):
         return
 
     await websocket.accept()
+    # The agents (and their LLM client) load on first use, not at startup
+    from agents import dependency_agent, workload_agent, scope_agent, delay_agent, comms_agent
     
     try:
         await websocket.send_json({"event": "connected", "message": "Meridian analysis starting"})
         
-        data_path = get_data_path()
-        with open(data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data, version = load_project_state(get_data_path())
             
-        signals = extract_signals(data)
+        context = signal_context(data, version)
+        signals = context.signals()
+        intermediates = context.bundle()
         await websocket.send_json({"event": "signals_ready", "data": signals})
         
         agents_to_run = [
@@ -66,8 +65,9 @@ async def websocket_analysis(websocket: WebSocket):
             for name, agent_module in agents_to_run:
                 await websocket.send_json({"event": "agent_start", "agent": name})
                 
+                EXECUTOR_QUEUE_DEPTH.inc(pool="ws_agents")
                 try:
-                    result = await loop.run_in_executor(executor, agent_module.analyze, signals, data)
+                    result = await loop.run_in_executor(executor, agent_module.analyze, signals, data, intermediates)
                 except Exception as e:
                     # Fallback output
                     result = {
@@ -79,6 +79,8 @@ async def websocket_analysis(websocket: WebSocket):
                         "reasoning": "Exception encountered during execution.",
                         "signal_refs": []
                     }
+                finally:
+                    EXECUTOR_QUEUE_DEPTH.dec(pool="ws_agents")
                 
                 agent_results.append(result)
                 await websocket.send_json({"event": "agent_complete", "agent": name, "data": result})
@@ -99,6 +101,10 @@ async def websocket_analysis(websocket: WebSocket):
         }
         
         await websocket.send_json({"event": "risk_score_ready", "data": final_output})
+        try:
+            await loop.run_in_executor(None, record_analysis, final_output, data)
+        except Exception:
+            pass  # History is best-effort
         await websocket.send_json({"event": "complete", "message": "Analysis complete"})
         
     except WebSocketDisconnect:
@@ -0,0 +1,294 @@
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import websockets
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+from agents.base_agent import LLM_STUB_ENV
+
+DEFAULT_MIX = "analysis=1,simulate=4,monte-carlo=2,ws=1"
+
+MUTATIONS = [
+    {"type": "add_developers",  "count": 2},
+    {"type": "extend_deadline", "days": 14},
+    {"type": "remove_scope",    "task_count": 5},
+    {"type": "close_prs",       "pr_count": 3},
+]
+
+PERCENTILES = (50, 95, 99)
+
+
+class Recorder:
+    """Latencies and error counts per endpoint / WebSocket event, ignoring the warm-up window."""
+
+    def __init__(self, measure_from: float):
+        self.measure_from = measure_from
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.error_samples = {}
+
+    def record(self, name: str, started: float, latency: float, error: str = None):
+        if started < self.measure_from:
+            return
+        if error is None:
+            self.latencies[name].append(latency)
+        else:
+            self.errors[name] += 1
+            self.error_samples.setdefault(name, error)
+
+    def report(self, duration: float) -> dict:
+        report = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            ok = sorted(self.latencies[name])
+            total = len(ok) + self.errors[name]
+            entry = {
+                "requests": total,
+                "errors": self.errors[name],
+                "error_rate": self.errors[name] / total if total else 0.0,
+                "throughput_rps": len(ok) / duration if duration else 0.0,
+            }
+            for p in PERCENTILES:
+                entry[f"p{p}_ms"] = _percentile(ok, p) * 1000 if ok else None
+            entry["max_ms"] = ok[-1] * 1000 if ok else None
+            if name in self.error_samples:
+                entry["first_error"] = self.error_samples[name]
+            report[name] = entry
+        return report
+
+
+def _percentile(ordered: list, p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def _parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+# ---- Scenarios ----
+
+def _http(host: str, port: int, method: str, path: str, body: dict = None, timeout: float = 60.0):
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        payload = json.dumps(body) if body is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        conn.request(method, path, body=payload, headers=headers)
+        response = conn.getresponse()
+        raw = response.read()
+    finally:
+        conn.close()
+    if response.status >= 400:
+        return f"HTTP {response.status}"
+    # Some endpoints report failures as {"error": ...} with a 200
+    if raw.startswith(b'{"error"'):
+        return json.loads(raw).get("error", "error")
+    return None
+
+
+async def _timed_http(ctx, name: str, method: str, path: str, body: dict = None):
+    started = time.perf_counter()
+    try:
+        error = await asyncio.get_running_loop().run_in_executor(
+            ctx["executor"], _http, ctx["host"], ctx["port"], method, path, body, ctx["timeout"])
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    ctx["recorder"].record(name, started, time.perf_counter() - started, error)
+
+
+async def scenario_analysis(ctx):
+    await _timed_http(ctx, "GET /api/analysis", "GET", "/api/analysis")
+
+
+async def scenario_simulate(ctx):
+    await _timed_http(ctx, "POST /api/simulate", "POST", "/api/simulate", ctx["rng"].choice(MUTATIONS))
+
+
+async def scenario_monte_carlo(ctx):
+    await _timed_http(ctx, "GET /api/monte-carlo", "GET", "/api/monte-carlo")
+
+
+async def scenario_ws(ctx):
+    """One full /ws/analysis session; every event is timed from the start of the connection."""
+    recorder = ctx["recorder"]
+    started = time.perf_counter()
+    error = None
+    try:
+        async with asyncio.timeout(ctx["timeout"]):
+            async with websockets.connect(f"ws://{ctx['host']}:{ctx['port']}/ws/analysis", max_size=None) as ws:
+                async for raw in ws:
+                    message = json.loads(raw)
+                    event = message.get("event")
+                    if event in ("agent_start", "agent_complete"):
+                        event = f"{event}[{message.get('agent')}]"
+                    recorder.record(f"WS {event}", started, time.perf_counter() - started)
+                    if message.get("event") == "error":
+                        error = message.get("message", "error event")
+                        break
+                    if message.get("event") == "complete":
+                        break
+                else:
+                    error = "closed before complete"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    recorder.record("WS /ws/analysis (session)", started, time.perf_counter() - started, error)
+
+
+SCENARIOS = {
+    "analysis":    scenario_analysis,
+    "simulate":    scenario_simulate,
+    "monte-carlo": scenario_monte_carlo,
+    "ws":          scenario_ws,
+}
+
+
+# ---- Drivers ----
+
+async def closed_loop(ctx, mix: dict, concurrency: int, deadline: float):
+    """`concurrency` virtual users, each issuing its next request as soon as the last one returns."""
+    names, weights = list(mix), list(mix.values())
+
+    async def user():
+        while time.perf_counter() < deadline:
+            await SCENARIOS[ctx["rng"].choices(names, weights)[0]](ctx)
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+
+
+async def open_loop(ctx, mix: dict, rate: float, max_in_flight: int, deadline: float):
+    """
+    Poisson arrivals at `rate` per second regardless of how fast the server
+    answers, so a saturated server shows up as growing latency and drops.
+    """
+    names, weights = list(mix), list(mix.values())
+    in_flight = set()
+    next_arrival = time.perf_counter()
+    while next_arrival < deadline:
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        name = ctx["rng"].choices(names, weights)[0]
+        if len(in_flight) >= max_in_flight:
+            ctx["recorder"].record(f"dropped ({name})", time.perf_counter(), 0.0, "max in-flight reached")
+        else:
+            task = asyncio.create_task(SCENARIOS[name](ctx))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        next_arrival += ctx["rng"].expovariate(rate)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+# ---- Server ----
+
+def launch_server(host: str, port: int, llm_delay: str, workers: int) -> subprocess.Popen:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env[LLM_STUB_ENV] = llm_delay
+    cmd = [sys.executable, "-m", "uvicorn", "api.main:app", "--host", host, "--port", str(port),
+           "--log-level", "warning", "--workers", str(workers)]
+    return subprocess.Popen(cmd, cwd=ROOT, env=env)
+
+
+def wait_until_healthy(host: str, port: int, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if _http(host, port, "GET", "/api/health", timeout=2.0) is None:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {host}:{port} did not become healthy within {timeout:.0f}s")
+
+
+def print_report(report: dict, duration: float):
+    print(f"\n{'endpoint / event':<44} {'n':>6} {'err%':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    print("-" * 96)
+    fmt = lambda v: f"{v:9.1f}" if v is not None else f"{'-':>9}"
+    for name, entry in report.items():
+        print(f"{name:<44} {entry['requests']:>6} {entry['error_rate']*100:>5.1f}% {entry['throughput_rps']:>8.2f} "
+              f"{fmt(entry['p50_ms'])} {fmt(entry['p95_ms'])} {fmt(entry['p99_ms'])}")
+    errors = {name: e["first_error"] for name, e in report.items() if "first_error" in e}
+    for name, error in errors.items():
+        print(f"  first error for {name}: {error}")
+    print(f"\nMeasured over {duration:.1f}s")
+
+
+async def run(args) -> dict:
+    mix = _parse_mix(args.mix)
+    start = time.perf_counter()
+    measure_from = start + args.warmup
+    deadline = measure_from + args.duration
+    ctx = {
+        "host": args.host,
+        "port": args.port,
+        "timeout": args.timeout,
+        "rng": random.Random(args.seed),
+        "recorder": Recorder(measure_from),
+        "executor": ThreadPoolExecutor(max_workers=max(args.concurrency, args.max_in_flight)),
+    }
+    try:
+        if args.rate:
+            await open_loop(ctx, mix, args.rate, args.max_in_flight, deadline)
+        else:
+            await closed_loop(ctx, mix, args.concurrency, deadline)
+    finally:
+        ctx["executor"].shutdown(wait=False)
+    # Requests still running at the deadline are counted, so measure up to when they finished
+    duration = time.perf_counter() - measure_from
+    return {"duration_s": duration, "endpoints": ctx["recorder"].report(duration)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Meridian HTTP and WebSocket API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--no-launch", action="store_true", help="target an already running server")
+    parser.add_argument("--server-workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--llm-delay", default="0.8", help="stubbed LLM latency in seconds, or a range like 0.5-1.5")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted scenarios (default {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=8, help="closed-loop virtual users")
+    parser.add_argument("--rate", type=float, default=None, help="open-loop Poisson arrivals per second (overrides --concurrency)")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="open-loop cap; arrivals beyond it are dropped")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of load before measuring")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request / per-session timeout")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="also write the report to this file")
+    args = parser.parse_args()
+
+    server = None
+    if not args.no_launch:
+        server = launch_server(args.host, args.port, args.llm_delay, args.server_workers)
+    try:
+        wait_until_healthy(args.host, args.port)
+        mode = f"open loop at {args.rate}/s" if args.rate else f"closed loop with {args.concurrency} users"
+        print(f"Load test: {mode}, mix {args.mix}, LLM stub delay {args.llm_delay}s")
+        result = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    print_report(result["endpoints"], result["duration_s"])
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(dict(result, config=vars(args)), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+import argparse
+import gc
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.signal_extractor import SignalContext, extract_signals, _parse_iso
+from core.risk_formula import compute_risk_score
+from core.monte_carlo import run_monte_carlo, run_paired_monte_carlo
+from core.whatif_engine import run_simulation
+from core.replay import daily_instants, replay
+from data.simulate_project import generate_state
+from agents import dependency_agent, workload_agent, scope_agent, delay_agent, comms_agent
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+TASK_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+MC_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+QUICK_TASK_SIZES = (100, 1_000, 10_000)
+QUICK_MC_SIZES = (1_000, 10_000, 100_000)
+
+# A case whose run at one size exceeds this is not run at the larger sizes
+DEFAULT_BUDGET_S = 60.0
+
+# Flagged when a run is this many times slower / hungrier than the stored baseline
+DEFAULT_TIME_THRESHOLD = 1.25
+DEFAULT_MEMORY_THRESHOLD = 1.25
+# Flagged when time grows faster than n^x between consecutive sizes (catches accidental O(N^2))
+DEFAULT_SCALING_THRESHOLD = 1.5
+# Sizes whose runs take less than this are too noisy to judge scaling from
+SCALING_MIN_WALL_S = 0.05
+
+SIMULATED_NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+SEED = 1234
+
+STUB_LLM_RESPONSE = json.dumps({
+    "top_risks": ["Stubbed risk one", "Stubbed risk two"],
+    "reasoning": "Stubbed LLM response for benchmarking."
+})
+
+AGENTS = {
+    "dependency": dependency_agent,
+    "workload":   workload_agent,
+    "scope":      scope_agent,
+    "delay":      delay_agent,
+    "comms":      comms_agent,
+}
+
+MUTATIONS = [
+    {"type": "add_developers",  "count": 2},
+    {"type": "extend_deadline", "days": 14},
+    {"type": "remove_scope",    "task_count": 5},
+    {"type": "close_prs",       "pr_count": 3},
+]
+
+
+def _stub_llm(system_prompt: str, user_prompt: str, temperature: float = 0.0) -> str:
+    return STUB_LLM_RESPONSE
+
+
+def stub_llm_calls():
+    """Agents import call_llm by name, so the stub has to replace each module's reference."""
+    for module in AGENTS.values():
+        module.call_llm = _stub_llm
+
+
+def build_state(n_tasks: int) -> dict:
+    return generate_state(
+        seed=SEED,
+        n_tasks=n_tasks,
+        n_devs=max(10, n_tasks // 20),
+        n_prs=n_tasks // 3,
+        n_messages=n_tasks,
+        simulated_now=SIMULATED_NOW,
+    )
+
+
+def measure(fn, min_time: float = 0.5, max_repeats: int = 5) -> dict:
+    """
+    Wall time is the best of several timed runs (stopping after `min_time` in
+    total); memory comes from one extra run under tracemalloc, so tracing
+    overhead never leaks into the timings.
+    """
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_repeats:
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+        if time.perf_counter() - started >= min_time:
+            break
+
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained_blocks = sys.getallocatedblocks() - blocks_before
+    del result
+
+    return {
+        "wall_s": min(timings),
+        "repeats": len(timings),
+        "peak_bytes": peak,
+        "retained_blocks": retained_blocks,
+    }
+
+
+def state_cases(state: dict) -> dict:
+    context = SignalContext(state)
+    signals, intermediates = context.signals(), context.bundle()
+    year_before = (_parse_iso(state["metadata"]["simulated_now"]) - timedelta(days=365)).isoformat()
+    cases = {
+        "extract_signals":    lambda: extract_signals(state),
+        "compute_risk_score": lambda: compute_risk_score(signals),
+        "whatif.run_simulation": lambda: [run_simulation(state, m) for m in MUTATIONS],
+        "replay.365d":        lambda: replay(state, daily_instants(state, start=year_before)),
+    }
+    for name, module in AGENTS.items():
+        cases[f"agent.{name}"] = (lambda module=module: module.analyze(signals, state, intermediates))
+    return cases
+
+
+def monte_carlo_cases(n: int, signals: dict) -> dict:
+    def seeded_monte_carlo():
+        random.seed(SEED)
+        return run_monte_carlo(signals, n_simulations=n)
+
+    return {
+        "monte_carlo":        seeded_monte_carlo,
+        "monte_carlo.paired": lambda: run_paired_monte_carlo(signals, signals, n_simulations=n, seed=SEED),
+    }
+
+
+def run_suite(task_sizes, mc_sizes, budget: float, only=None) -> dict:
+    results = {}
+    over_budget = set()
+
+    def record(case: str, size: int, fn):
+        if only and not any(case.startswith(prefix) for prefix in only):
+            return
+        if case in over_budget:
+            results.setdefault(case, {})[str(size)] = {"skipped": "over budget at a smaller size"}
+            print(f"  {case:<24} n={size:<9,} skipped")
+            return
+        stats = measure(fn)
+        results.setdefault(case, {})[str(size)] = stats
+        print(f"  {case:<24} n={size:<9,} {stats['wall_s']*1000:10.2f} ms  "
+              f"peak {stats['peak_bytes']/1e6:9.2f} MB  blocks {stats['retained_blocks']:+,}")
+        if stats["wall_s"] > budget:
+            over_budget.add(case)
+
+    # 1. Engines that scale with the project size
+    for n_tasks in task_sizes:
+        print(f"\nProject with {n_tasks:,} tasks")
+        t0 = time.perf_counter()
+        state = build_state(n_tasks)
+        print(f"  (generated in {time.perf_counter() - t0:.1f}s)")
+        for case, fn in state_cases(state).items():
+            record(case, n_tasks, fn)
+        del state
+        gc.collect()
+
+    # 2. Monte Carlo scales with the number of simulations, not the project
+    signals = extract_signals(build_state(QUICK_TASK_SIZES[0]))
+    for n in mc_sizes:
+        print(f"\nMonte Carlo with {n:,} simulations")
+        for case, fn in monte_carlo_cases(n, signals).items():
+            record(case, n, fn)
+
+    return results
+
+
+def scaling_exponents(case_results: dict) -> list:
+    """log-log slope of wall time between consecutive measured sizes."""
+    points = sorted(
+        (int(size), stats["wall_s"]) for size, stats in case_results.items()
+        if "wall_s" in stats and stats["wall_s"] >= SCALING_MIN_WALL_S
+    )
+    return [
+        (n1, n2, math.log(t2 / t1) / math.log(n2 / n1))
+        for (n1, t1), (n2, t2) in zip(points, points[1:])
+    ]
+
+
+def find_regressions(results: dict, baseline: dict, time_threshold: float,
+                     memory_threshold: float, scaling_threshold: float) -> list:
+    regressions = []
+    for case, by_size in results.items():
+        for n1, n2, exponent in scaling_exponents(by_size):
+            if exponent > scaling_threshold:
+                regressions.append(f"{case}: time grows as n^{exponent:.2f} between {n1:,} and {n2:,}")
+
+        for size, stats in by_size.items():
+            base = baseline.get(case, {}).get(size)
+            if not base or "wall_s" not in stats or "wall_s" not in base:
+                continue
+            time_ratio = stats["wall_s"] / base["wall_s"] if base["wall_s"] else 1.0
+            memory_ratio = stats["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] else 1.0
+            if time_ratio > time_threshold:
+                regressions.append(f"{case} n={int(size):,}: {time_ratio:.2f}x slower than baseline")
+            if memory_ratio > memory_threshold:
+                regressions.append(f"{case} n={int(size):,}: {memory_ratio:.2f}x peak memory of baseline")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Meridian's core engines across project sizes.")
+    parser.add_argument("--quick", action="store_true", help=f"task sizes {QUICK_TASK_SIZES}, Monte Carlo sizes {QUICK_MC_SIZES}")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None, help="task counts to benchmark")
+    parser.add_argument("--mc-sizes", type=int, nargs="+", default=None, help="Monte Carlo simulation counts")
+    parser.add_argument("--only", nargs="+", default=None, help="run only cases starting with these prefixes")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_S, help="seconds per run before larger sizes are skipped")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    parser.add_argument("--scaling-threshold", type=float, default=DEFAULT_SCALING_THRESHOLD)
+    parser.add_argument("--json", default=None, help="also write the raw results to this file")
+    args = parser.parse_args()
+
+    task_sizes = args.sizes or (QUICK_TASK_SIZES if args.quick else TASK_SIZES)
+    mc_sizes = args.mc_sizes or (QUICK_MC_SIZES if args.quick else MC_SIZES)
+
+    stub_llm_calls()
+    results = run_suite(task_sizes, mc_sizes, args.budget, args.only)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        print(f"\nNo baseline at {args.baseline}; only checking scaling. Use --save-baseline to store one.")
+
+    regressions = find_regressions(results, baseline, args.time_threshold,
+                                   args.memory_threshold, args.scaling_threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s):")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
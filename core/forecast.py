@@ -0,0 +1,90 @@
+import os
+import sys
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.metrics import CACHE_REQUESTS, timed
+from core.replay import DAY_US, TimeIndex, replay
+from core.snapshot import _to_us
+from core.whatif_engine import score_baseline
+
+MAX_HORIZON_DAYS = 365
+
+_index_cache = OrderedDict()
+INDEX_CACHE_SIZE = 8
+
+
+def time_index(data: dict, state_version: str = None) -> TimeIndex:
+    """TimeIndex for a state, cached per state version."""
+    if state_version is not None:
+        cached = _index_cache.get(state_version)
+        if cached is not None:
+            CACHE_REQUESTS.inc(cache="time_index", result="hit")
+            _index_cache.move_to_end(state_version)
+            return cached
+        CACHE_REQUESTS.inc(cache="time_index", result="miss")
+
+    index = TimeIndex(data)
+
+    if state_version is not None:
+        _index_cache[state_version] = index
+        while len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+@timed("forecast")
+def forecast(data: dict, days: int = 30, state_version: str = None) -> dict:
+    """
+    Projects signals and risk score for each of the next `days` days if
+    nothing changes: no task moves, no PR merges, nobody posts. Due dates,
+    staleness, PR ages and the message window keep moving, so this is the
+    replay engine evaluated at future instants, all horizons in one pass.
+    """
+    if not 1 <= days <= MAX_HORIZON_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_HORIZON_DAYS}.")
+
+    base_signals, base_risk = score_baseline(data, state_version)
+    index = time_index(data, state_version)
+    now_us = _to_us(data["metadata"]["simulated_now"])
+    instants = [now_us + day * DAY_US for day in range(days + 1)]
+    timeline = replay(data, instants, index=index, static_signals=base_signals)
+
+    points = [{"day": day, **point} for day, point in enumerate(timeline)]
+    first_critical = next((p for p in points if p["risk_level"] == "CRITICAL"), None)
+    level_changes = [
+        {"day": cur["day"], "date": cur["simulated_now"], "from": prev["risk_level"], "to": cur["risk_level"]}
+        for prev, cur in zip(points, points[1:])
+        if cur["risk_level"] != prev["risk_level"]
+    ]
+    return {
+        "simulated_now": data["metadata"]["simulated_now"],
+        "horizon_days": days,
+        "current": {"risk_score": base_risk["total_score"], "risk_level": base_risk["risk_level"]},
+        "first_critical": (
+            {"day": first_critical["day"], "date": first_critical["simulated_now"], "risk_score": first_critical["risk_score"]}
+            if first_critical else None
+        ),
+        "level_changes": level_changes,
+        "points": points,
+    }
+
+
+if __name__ == "__main__":
+    from core.state_loader import load_project_state
+
+    data, version = load_project_state()
+    result = forecast(data, days=30, state_version=version)
+
+    print(f"\n{'='*50}")
+    print(f"  30-DAY FORECAST (no further activity) from {result['simulated_now'][:10]}")
+    print(f"{'='*50}")
+    print(f"  Now: {result['current']['risk_score']} ({result['current']['risk_level']})")
+    if result["first_critical"]:
+        fc = result["first_critical"]
+        print(f"  First CRITICAL: day {fc['day']} ({fc['date'][:10]}), score {fc['risk_score']}")
+    else:
+        print("  Stays below CRITICAL for the whole horizon")
+    for p in result["points"]:
+        bar = "█" * int(p["risk_score"] / 5)
+        print(f"  +{p['day']:<3} {p['simulated_now'][:10]}  {p['risk_score']:6.2f}  {p['risk_level']:<9} {bar}")
@@ -0,0 +1,335 @@
+import datetime
+import fcntl
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Set MERIDIAN_HISTORY=off to stop recording analyses
+HISTORY_ENV = "MERIDIAN_HISTORY"
+HISTORY_DIR = Path(os.getenv("MERIDIAN_HISTORY_DIR") or Path(__file__).parent.parent / "data" / "history")
+
+# Rollup resolutions and their bucket width in seconds
+RESOLUTIONS = {"hour": 3600, "day": 86400}
+# resolution="auto" picks the finest resolution whose point count stays reasonable for a chart
+AUTO_RAW_MAX_SPAN = 2 * 86400
+AUTO_HOUR_MAX_SPAN = 90 * 86400
+
+MONTE_CARLO_FIELDS = ("mean_score", "median_score", "percentile_5", "percentile_95", "probability_critical")
+
+
+def _utc(t: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(t, datetime.timezone.utc)
+
+
+def _iso(t: float) -> str:
+    return _utc(t).isoformat().replace("+00:00", "Z")
+
+
+def analysis_point(result: dict, project: str, recorded_at: float = None) -> dict:
+    """
+    Flattens an analysis result into one history point: risk score, the five
+    dimension scores, the 15 signal values and, when present, the Monte Carlo
+    summary. Signal scores are not stored; signal_entry() derives them.
+    """
+    metrics = {"risk_score": result["risk_score"]}
+    for dimension, score in result["agent_scores"].items():
+        metrics[f"dimension.{dimension}"] = score
+    for name, sig in result["signals"]["signals"].items():
+        metrics[f"signal.{name}"] = sig["value"]
+    mc = result.get("monte_carlo")
+    if mc:
+        for field in MONTE_CARLO_FIELDS:
+            metrics[f"monte_carlo.{field}"] = mc[field]
+    return {
+        "t": round(time.time() if recorded_at is None else recorded_at, 3),
+        "project": project,
+        "risk_level": result["risk_level"],
+        "simulated_now": result.get("timestamp"),
+        "metrics": metrics,
+    }
+
+
+def _as_row(point: dict) -> dict:
+    """A raw point in rollup-row shape: a bucket of one."""
+    return {
+        "t": point["t"], "project": point["project"], "n": 1, "risk_level": point["risk_level"],
+        "mean": point["metrics"], "min": point["metrics"], "max": point["metrics"],
+    }
+
+
+def _merge_rows(rows, width: int) -> list:
+    """Merges rows (raw points or finer rollups) into buckets of `width` seconds per project."""
+    buckets = {}
+    for row in rows:
+        key = (int(row["t"] // width) * width, row["project"])
+        b = buckets.get(key)
+        if b is None:
+            buckets[key] = b = {
+                "t": key[0], "project": key[1], "n": 0, "risk_level": None, "last_t": None,
+                "sum": {}, "count": {}, "min": {}, "max": {},
+            }
+        n = row["n"]
+        b["n"] += n
+        for metric, value in row["mean"].items():
+            b["sum"][metric] = b["sum"].get(metric, 0.0) + value * n
+            b["count"][metric] = b["count"].get(metric, 0) + n
+        for metric, value in row["min"].items():
+            b["min"][metric] = min(b["min"].get(metric, value), value)
+        for metric, value in row["max"].items():
+            b["max"][metric] = max(b["max"].get(metric, value), value)
+        # The bucket's level is that of its latest analysis
+        last_t = row.get("last_t", row["t"])
+        if b["last_t"] is None or last_t >= b["last_t"]:
+            b["last_t"], b["risk_level"] = last_t, row["risk_level"]
+
+    merged = []
+    for key in sorted(buckets):
+        b = buckets[key]
+        total, count = b.pop("sum"), b.pop("count")
+        b["mean"] = {metric: total[metric] / count[metric] for metric in total}
+        merged.append(b)
+    return merged
+
+
+class HistoryStore:
+    """
+    Append-only, gzip-compressed history of analysis points under one directory:
+
+        raw/YYYY-MM-DD.jsonl.gz      every point, partitioned by UTC day
+        hour/YYYY-MM.jsonl.gz        closed hourly buckets, partitioned by month
+        day/YYYY.jsonl.gz            closed daily buckets, partitioned by year
+        rollups.json                 start of the first bucket not yet rolled up
+
+    Every append is one complete gzip member, so files are only ever appended
+    to and a reader never needs to rewrite them. Rollups are computed once a
+    bucket has closed, on the next append or query, and the still-open bucket
+    is aggregated on the fly. A point older than a rollup's watermark (stamped
+    before its writer got the lock, or backfilled) is appended to the closed
+    rollup as a bucket of one, and queries fold it into its bucket. A file
+    lock makes this safe across workers.
+    """
+
+    def __init__(self, root=HISTORY_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    # ---- Files ----
+
+    @contextmanager
+    def _locked(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.root / ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _append(path: Path, rows: list):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+        with open(path, "ab") as f:
+            f.write(gzip.compress(payload.encode("utf-8")))
+
+    @staticmethod
+    def _read(path: Path):
+        if not path.exists():
+            return
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+        except (EOFError, zlib.error):
+            # A member cut short by a crash mid-append; everything before it is intact
+            return
+
+    def _path(self, resolution: str, t: float) -> Path:
+        return self._partitions(resolution, t, t)[0]
+
+    def _partitions(self, resolution: str, start: float, end: float) -> list:
+        """Files of `resolution` that can hold rows in [start, end)."""
+        first, last = _utc(start), _utc(end)
+        if resolution == "raw":
+            day, paths = first.date(), []
+            while day <= last.date():
+                paths.append(self.root / "raw" / f"{day:%Y-%m-%d}.jsonl.gz")
+                day += datetime.timedelta(days=1)
+            return paths
+        if resolution == "hour":
+            months = range(first.year * 12 + first.month - 1, last.year * 12 + last.month)
+            return [self.root / "hour" / f"{m // 12:04d}-{m % 12 + 1:02d}.jsonl.gz" for m in months]
+        return [self.root / "day" / f"{year:04d}.jsonl.gz" for year in range(first.year, last.year + 1)]
+
+    def _read_range(self, resolution: str, start: float, end: float):
+        """Rows of `resolution` ("raw", "hour" or "day") with start <= t < end, oldest first."""
+        if end <= start:
+            return
+        for path in self._partitions(resolution, start, end):
+            for row in self._read(path):
+                if start <= row["t"] < end:
+                    yield row
+
+    def _watermarks(self) -> dict:
+        try:
+            return json.loads((self.root / "rollups.json").read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _first_raw_t(self):
+        raw_files = sorted((self.root / "raw").glob("*.jsonl.gz"))
+        if not raw_files:
+            return None
+        day = datetime.datetime.strptime(raw_files[0].name[:10], "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
+        return day.timestamp()
+
+    # ---- Rollups ----
+
+    def _roll_up(self, now: float):
+        """Rolls every closed hour and day since the last run into its rollup file. Caller holds the lock."""
+        marks = self._watermarks()
+        first = self._first_raw_t()
+        if first is None:
+            return marks
+        changed = False
+        source = "raw"
+        for resolution, width in RESOLUTIONS.items():
+            closed_until = int(now // width) * width
+            start = marks.get(resolution, int(first // width) * width)
+            if start < closed_until:
+                rows = self._read_range(source, start, closed_until)
+                merged = _merge_rows(rows if source != "raw" else map(_as_row, rows), width)
+                by_file = {}
+                for row in merged:
+                    by_file.setdefault(self._path(resolution, row["t"]), []).append(row)
+                for path, file_rows in by_file.items():
+                    self._append(path, file_rows)
+                marks[resolution] = closed_until
+                changed = True
+            # Days are built from the (already complete) hours
+            source = resolution
+        if changed:
+            tmp = self.root / "rollups.json.tmp"
+            tmp.write_text(json.dumps(marks))
+            os.replace(tmp, self.root / "rollups.json")
+        return marks
+
+    # ---- Public API ----
+
+    def record(self, point: dict):
+        with self._locked():
+            self._append(self._path("raw", point["t"]), [point])
+            marks = self._watermarks()
+            for resolution in RESOLUTIONS:
+                if point["t"] < marks.get(resolution, float("-inf")):
+                    # Its bucket was rolled up already
+                    self._append(self._path(resolution, point["t"]), [_as_row(point)])
+            # Only pay for a rollup when an hour has closed since the last one
+            if point["t"] >= marks.get("hour", 0) + RESOLUTIONS["hour"]:
+                self._roll_up(point["t"])
+
+    def query(self, start: float, end: float, resolution: str = "auto", project: str = None) -> dict:
+        """
+        Points with start <= t < end. resolution is "raw", "hour", "day" or
+        "auto". Closed buckets come from the rollup files; only the open
+        bucket at the end of the range is aggregated from finer data.
+        """
+        if end <= start:
+            raise ValueError("'to' must be after 'from'.")
+        if resolution == "auto":
+            span = end - start
+            resolution = "raw" if span <= AUTO_RAW_MAX_SPAN else "hour" if span <= AUTO_HOUR_MAX_SPAN else "day"
+        if resolution not in ("raw", *RESOLUTIONS):
+            raise ValueError(f"Unknown resolution: {resolution}. Use raw, hour, day or auto.")
+
+        if resolution == "raw":
+            rows = [
+                {"t": p["t"], "project": p["project"], "n": 1, "risk_level": p["risk_level"], "mean": p["metrics"]}
+                for p in self._read_range("raw", start, end)
+            ]
+        else:
+            with self._locked():
+                marks = self._roll_up(time.time())
+            width = RESOLUTIONS[resolution]
+            # A bucket straddling `start` is included whole, as charts expect
+            start = int(start // width) * width
+            rolled_until = marks.get(resolution, start)
+            # Merging folds late points into the buckets they belong to
+            rows = _merge_rows(self._read_range(resolution, start, min(end, rolled_until)), width)
+            if end > rolled_until:
+                hour_mark = marks.get("hour", rolled_until)
+                open_rows = []
+                if resolution == "day":
+                    open_rows += self._read_range("hour", max(start, rolled_until), min(end, hour_mark))
+                open_rows += map(_as_row, self._read_range("raw", max(start, hour_mark, rolled_until), end))
+                rows += _merge_rows(open_rows, width)
+
+        if project is not None:
+            rows = [row for row in rows if row["project"] == project]
+        points = []
+        for row in rows:
+            point = {"t": _iso(row["t"]), "project": row["project"], "count": row["n"],
+                     "risk_level": row["risk_level"], "mean": row["mean"]}
+            if "min" in row and resolution != "raw":
+                point["min"], point["max"] = row["min"], row["max"]
+            points.append(point)
+        return {"from": _iso(start), "to": _iso(end), "resolution": resolution, "points": points}
+
+
+_default_store = None
+
+
+def default_store() -> HistoryStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = HistoryStore()
+    return _default_store
+
+
+def record_analysis(result: dict, data: dict):
+    """Appends an analysis to the default store unless MERIDIAN_HISTORY=off."""
+    if os.getenv(HISTORY_ENV, "").lower() in ("off", "0", "false"):
+        return
+    project = data.get("metadata", {}).get("project_id", "default")
+    default_store().record(analysis_point(result, project))
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    from core.state_loader import load_project_signals
+    from core.risk_formula import compute_risk_score
+    from core.monte_carlo import run_monte_carlo
+
+    signals, _ = load_project_signals()
+    risk = compute_risk_score(signals)
+    mc = run_monte_carlo(signals, n_simulations=1000)
+
+    # A quarter of synthetic analyses, six per hour, into a throwaway store
+    store = HistoryStore(tempfile.mkdtemp(prefix="meridian-history-"))
+    rng = random.Random(7)
+    end = time.time()
+    t = end - 90 * 86400
+    t0 = time.perf_counter()
+    n = 0
+    while t < end:
+        score = max(0.0, min(100.0, risk["total_score"] + rng.gauss(0, 5)))
+        result = {"risk_score": round(score, 2), "risk_level": risk["risk_level"], "agent_scores": risk["agent_scores"],
+                  "signals": signals, "monte_carlo": mc}
+        store.record(analysis_point(result, "proj_meridian", recorded_at=t))
+        t += 600
+        n += 1
+    print(f"Recorded {n} analyses in {time.perf_counter() - t0:.2f}s → {store.root}")
+
+    for resolution in ("day", "hour", "raw"):
+        t0 = time.perf_counter()
+        out = store.query(end - 90 * 86400, end, resolution=resolution)
+        print(f"  {resolution:<5} {len(out['points']):>6} points in {(time.perf_counter() - t0) * 1000:.1f} ms")
@@ -0,0 +1,350 @@
+import heapq
+import os
+import sys
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.signal_extractor import extract_signals, signal_entry, _parse_iso, _safe_div
+from core.risk_formula import compute_risk_score
+
+ACTIONS = ("remove_task", "unblock_task", "close_pr")
+
+
+def _max_after(hist: Counter, values_desc: list, changes: list) -> int:
+    """
+    Max key of a value histogram after moving a few entries. `changes` is a
+    list of (old_value, new_value) pairs; new_value None drops the entry.
+    `values_desc` is the histogram's keys sorted in descending order.
+    """
+    adjusted = {}
+    for old, new in changes:
+        adjusted[old] = adjusted.get(old, hist.get(old, 0)) - 1
+        if new is not None:
+            adjusted[new] = adjusted.get(new, hist.get(new, 0)) + 1
+    candidates = [v for v, c in adjusted.items() if c > 0]
+    # Untouched keys keep their counts; only the largest one can beat the adjusted keys
+    for value in values_desc:
+        if value not in adjusted:
+            candidates.append(value)
+            break
+    return max(candidates) if candidates else 0
+
+
+class _DependencyGraph:
+    """Longest depends_on chain, and its length with any single task removed."""
+
+    def __init__(self, tasks: list):
+        self.adj = {t["task_id"]: t["depends_on"] for t in tasks}
+        nodes = set(self.adj)
+        for deps in self.adj.values():
+            nodes.update(deps)
+        self.nodes = nodes
+
+        self.down = self._longest_chains(exclude=None)
+        self.depth = max(self.down.values()) if self.down else 0
+
+        # up[v]: longest chain of dependents above v
+        up = dict.fromkeys(nodes, 0)
+        for node in self._order:
+            for dep in self.adj.get(node, []):
+                up[dep] = max(up[dep], up[node] + 1)
+
+        # A node lies on every longest chain iff it is the only node on a longest
+        # chain at its level (chains visit exactly one node per level)
+        critical_by_level = defaultdict(list)
+        for node in nodes:
+            if up[node] + self.down[node] == self.depth:
+                critical_by_level[self.down[node]].append(node)
+        self.articulation = {nodes_[0] for nodes_ in critical_by_level.values() if len(nodes_) == 1}
+        self._without = {}
+
+    def _longest_chains(self, exclude) -> dict:
+        indegree = dict.fromkeys(self.nodes, 0)
+        for node, deps in self.adj.items():
+            if node == exclude:
+                continue
+            for dep in deps:
+                if dep != exclude:
+                    indegree[dep] += 1
+        stack = [n for n, d in indegree.items() if d == 0 and n != exclude]
+        order = []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for dep in self.adj.get(node, []):
+                if dep == exclude:
+                    continue
+                indegree[dep] -= 1
+                if indegree[dep] == 0:
+                    stack.append(dep)
+        if len(order) != len(self.nodes) - (exclude is not None):
+            raise ValueError("Task dependency graph contains a cycle.")
+
+        down = {}
+        for node in reversed(order):
+            deps = [dep for dep in self.adj.get(node, []) if dep != exclude]
+            down[node] = 1 + max(down[dep] for dep in deps) if deps else 0
+        if exclude is None:
+            self._order = order
+        return down
+
+    def depths_by_removal(self, removal_order: list) -> list:
+        """
+        Longest chain once the first k tasks of `removal_order` are removed,
+        as remove_scope removes them, for every k. A chain survives exactly
+        the removals before its earliest-removed task, so one pass finds,
+        for each chain length, the most removals some chain of it survives.
+        """
+        never = len(removal_order) + 1
+        rank = {task_id: i + 1 for i, task_id in enumerate(removal_order)}
+        # survives[node][n]: most removals an n-edge chain down from node survives
+        survives = {}
+        best = [0] * (self.depth + 1)
+        for node in reversed(self._order):
+            r = rank.get(node, never)
+            deps = self.adj.get(node, [])
+            row = [r]
+            for n in range(1, self.down[node] + 1):
+                row.append(min(r, max(survives[dep][n - 1] for dep in deps if len(survives[dep]) >= n)))
+            survives[node] = row
+            for n, removals in enumerate(row):
+                if removals > best[n]:
+                    best[n] = removals
+
+        depths = []
+        n = self.depth
+        for k in range(len(removal_order) + 1):
+            while n > 0 and best[n] <= k:
+                n -= 1
+            depths.append(n)
+        return depths
+
+    def depth_without(self, task_id: str) -> int:
+        if task_id not in self.articulation:
+            return self.depth
+        if task_id not in self._without:
+            down = self._longest_chains(exclude=task_id)
+            self._without[task_id] = max(down.values()) if down else 0
+        return self._without[task_id]
+
+
+def rank_mitigations(data: dict, limit: int = 10, actions=ACTIONS) -> dict:
+    """
+    Ranks single-item mitigations by their marginal effect on the risk score:
+    removing each open non-baseline task (the tasks remove_scope may cut;
+    references to it are dropped as remove_scope drops them), unblocking each
+    blocked task, and closing each open PR. Baseline counters are built in one pass
+    and each candidate is scored from O(1) counter adjustments (plus the
+    dependency fan-out of the task), instead of a full re-extraction.
+    """
+    unknown = set(actions) - set(ACTIONS)
+    if unknown:
+        raise ValueError(f"Unknown actions: {', '.join(sorted(unknown))}.")
+
+    simulated_now = _parse_iso(data["metadata"]["simulated_now"])
+    tasks = data.get("tasks", [])
+    prs = data.get("pull_requests", [])
+    devs = data.get("developers", [])
+
+    base_signals = extract_signals(data)
+    base = base_signals["signals"]
+    base_risk = compute_risk_score(base_signals)
+
+    def score_with(overrides: dict) -> dict:
+        return compute_risk_score({"signals": dict(base, **overrides)})
+
+    candidates = []
+
+    # ---- Baseline counters (one pass over tasks) ----
+    current_sprint = None
+    for sp in data.get("sprints", []):
+        if _parse_iso(sp["start_date"]) <= simulated_now <= _parse_iso(sp["end_date"]):
+            current_sprint = sp
+            break
+    sp_start = _parse_iso(current_sprint["start_date"]) if current_sprint else None
+
+    total_tasks = len(tasks)
+    baseline_count = 0
+    mid_sprint = 0
+    active = []
+    counts = Counter()
+    open_assigned = Counter()
+    assignee_tasks = Counter()
+    dep_counts = Counter()
+    for t in tasks:
+        is_mid = (
+            current_sprint is not None
+            and t["sprint_id"] == current_sprint["sprint_id"]
+            and _parse_iso(t["created_at"]) > sp_start
+            and t["is_baseline"] == False
+        )
+        mid_sprint += is_mid
+        baseline_count += t["is_baseline"] == True
+        for dep in t["depends_on"]:
+            if dep:
+                dep_counts[dep] += 1
+        if t["status"] == "done":
+            continue
+        flags = {
+            "blocked": t["status"] == "blocked",
+            "unassigned": t["assigned_to"] is None,
+            "overdue": _parse_iso(t["due_date"]) < simulated_now,
+            "stale": (simulated_now - _parse_iso(t["updated_at"])).total_seconds() > 5 * 24 * 3600,
+            "mid_sprint": is_mid,
+        }
+        counts.update(k for k, v in flags.items() if v)
+        if t["assigned_to"]:
+            open_assigned[t["assigned_to"]] += 1
+        if t["assigned_to"] is not None:
+            assignee_tasks[t["assigned_to"]] += 1
+        active.append((t, flags))
+    total_active = len(active)
+
+    # ---- Unblock each blocked task: only blocked_task_ratio moves ----
+    if "unblock_task" in actions:
+        blocked_after = {
+            "blocked_task_ratio": signal_entry("blocked_task_ratio", _safe_div(counts["blocked"] - 1, total_active))
+        }
+        risk = score_with(blocked_after)
+        for t, flags in active:
+            if flags["blocked"]:
+                candidates.append(("unblock_task", t["task_id"], risk, ["blocked_task_ratio"]))
+
+    # ---- Remove each open task ----
+    if "remove_task" in actions:
+        graph = _DependencyGraph(tasks)
+        load_hist = Counter(open_assigned.values())
+        load_desc = sorted(load_hist, reverse=True)
+        dep_hist = Counter(dep_counts.values())
+        dep_desc = sorted(dep_hist, reverse=True)
+        dev_multiplicity = Counter(d["dev_id"] for d in devs)
+        overloaded = sum(1 for d in devs if open_assigned[d["dev_id"]] > 5)
+        recent_users = set()
+        for m in data.get("messages", []):
+            if (simulated_now - _parse_iso(m["timestamp"])).total_seconds() <= 72 * 3600:
+                recent_users.add(m["user_id"])
+        silent = sum(1 for d_id in assignee_tasks if d_id not in recent_users)
+        total_active_devs = len(assignee_tasks)
+
+        for t, flags in active:
+            if t["is_baseline"] == True:
+                continue  # Committed scope; remove_scope never cuts it
+            active_after = total_active - 1
+            assignee = t["assigned_to"]
+
+            load_changes = []
+            overloaded_after = overloaded
+            if assignee:
+                c = open_assigned[assignee]
+                load_changes.append((c, c - 1 if c > 1 else None))
+                if c == 6:
+                    overloaded_after -= dev_multiplicity[assignee]
+            silent_after, devs_after = silent, total_active_devs
+            if assignee is not None and assignee_tasks[assignee] == 1:
+                devs_after -= 1
+                silent_after -= assignee not in recent_users
+
+            # The removed task's own dependents vanish; its dependencies lose one dependent each
+            dep_changes = []
+            if t["task_id"] in dep_counts:
+                dep_changes.append((dep_counts[t["task_id"]], None))
+            for dep, n in Counter(d for d in t["depends_on"] if d and d != t["task_id"]).items():
+                c = dep_counts[dep]
+                dep_changes.append((c, c - n if c > n else None))
+
+            overrides = {
+                "blocked_task_ratio":        signal_entry("blocked_task_ratio", _safe_div(counts["blocked"] - flags["blocked"], active_after)),
+                "critical_path_depth":       signal_entry("critical_path_depth", graph.depth_without(t["task_id"])),
+                "dependency_centrality_max": signal_entry("dependency_centrality_max", _max_after(dep_hist, dep_desc, dep_changes)),
+                "overloaded_dev_ratio":      signal_entry("overloaded_dev_ratio", _safe_div(overloaded_after, len(devs))),
+                "task_concentration_index":  signal_entry("task_concentration_index", _safe_div(_max_after(load_hist, load_desc, load_changes), active_after)),
+                "unassigned_task_ratio":     signal_entry("unassigned_task_ratio", _safe_div(counts["unassigned"] - flags["unassigned"], active_after)),
+                "mid_sprint_task_additions": signal_entry("mid_sprint_task_additions", mid_sprint - flags["mid_sprint"]),
+                "scope_growth_rate":         signal_entry("scope_growth_rate", _safe_div(
+                                                 (total_tasks - 1) - (baseline_count - (t["is_baseline"] == True)),
+                                                 baseline_count - (t["is_baseline"] == True))),
+                "overdue_task_ratio":        signal_entry("overdue_task_ratio", _safe_div(counts["overdue"] - flags["overdue"], active_after)),
+                "stale_task_ratio":          signal_entry("stale_task_ratio", _safe_div(counts["stale"] - flags["stale"], active_after)),
+                "silent_dev_ratio":          signal_entry("silent_dev_ratio", _safe_div(silent_after, devs_after)),
+            }
+            changed = [name for name, sig in overrides.items() if sig != base[name]]
+            candidates.append(("remove_task", t["task_id"], score_with(overrides), changed))
+
+    # ---- Close each open PR: only avg_pr_age_days moves ----
+    if "close_pr" in actions:
+        open_prs = [p for p in prs if p["status"] == "open"]
+        ages = [(simulated_now - _parse_iso(p["created_at"])).total_seconds() / 86400 for p in open_prs]
+        total_age = sum(ages)
+        for p, age in zip(open_prs, ages):
+            remaining = len(ages) - 1
+            avg_after = (total_age - age) / remaining if remaining else 0.0
+            risk = score_with({"avg_pr_age_days": signal_entry("avg_pr_age_days", avg_after)})
+            candidates.append(("close_pr", p["pr_id"], risk, ["avg_pr_age_days"]))
+
+    base_score = base_risk["total_score"]
+    ranked = heapq.nsmallest(limit, candidates, key=lambda c: c[2]["total_score"])
+    return {
+        "baseline": {
+            "total_score": base_score,
+            "risk_level": base_risk["risk_level"],
+        },
+        "ranking": [
+            {
+                "action": action,
+                "id": item_id,
+                "total_score": risk["total_score"],
+                "risk_level": risk["risk_level"],
+                "delta": risk["total_score"] - base_score,
+                "signals_changed": changed,
+            }
+            for action, item_id, risk, changed in ranked
+        ],
+        "n_candidates": len(candidates),
+        "ranking_version": "1.0"
+    }
+
+
+def rescore_candidate(data: dict, action: str, item_id: str) -> float:
+    """Score after one mitigation by full re-extraction, the way the what-if engine applies it."""
+    from core.whatif_engine import ScenarioOverlay
+
+    overlay = ScenarioOverlay(data)
+    if action == "remove_task":
+        overlay.remove_tasks({item_id})
+    elif action == "unblock_task":
+        overlay.patch_task(next(t for t in overlay.tasks() if t["task_id"] == item_id), status="in_progress")
+    else:
+        overlay.patch_pr(next(p for p in overlay.pull_requests() if p["pr_id"] == item_id),
+                         status="closed", merged_at=data["metadata"]["simulated_now"])
+    return compute_risk_score(extract_signals(overlay.materialize()))["total_score"]
+
+
+if __name__ == "__main__":
+    import argparse
+    from core.state_loader import load_project_state
+
+    parser = argparse.ArgumentParser(description="Rank single-item mitigations for the project state.")
+    parser.add_argument("--verify", action="store_true",
+                        help="check every candidate's score against a full re-extraction of the mutated state")
+    args = parser.parse_args()
+
+    data, _ = load_project_state()
+
+    if args.verify:
+        ranking = rank_mitigations(data, limit=sys.maxsize)["ranking"]
+        mismatches = [
+            (item["action"], item["id"], item["total_score"], full)
+            for item in ranking
+            for full in [rescore_candidate(data, item["action"], item["id"])]
+            if abs(full - item["total_score"]) > 1e-9
+        ]
+        for action, item_id, fast, full in mismatches:
+            print(f"  {action:<13} {item_id:<10} ranked {fast:.4f}  full {full:.4f}")
+        print(f"{len(ranking) - len(mismatches)}/{len(ranking)} candidates match a full re-extraction")
+        sys.exit(1 if mismatches else 0)
+
+    result = rank_mitigations(data, limit=10)
+    print(f"\nBaseline: {result['baseline']['total_score']:.2f} ({result['baseline']['risk_level']})")
+    print(f"Top {len(result['ranking'])} of {result['n_candidates']} single-item mitigations:")
+    for item in result["ranking"]:
+        print(f"  {item['action']:<13} {item['id']:<10} {item['delta']:+7.2f}  -> {item['total_score']:.2f} ({item['risk_level']})")
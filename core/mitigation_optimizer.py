@@ -0,0 +1,522 @@
+import bisect
+import datetime
+import math
+import os
+import sys
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.impact_ranking import _DependencyGraph
+from core.risk_formula import compute_risk_score
+from core.signal_extractor import signal_entry, _parse_iso, _safe_div
+from core.whatif_engine import COMBINED_MUTATION_ORDER, score_baseline, score_plan
+
+# Upper score bound (exclusive) of each level, matching compute_risk_score
+LEVEL_THRESHOLDS = {"LOW": 40.0, "MODERATE": 60.0, "HIGH": 75.0}
+
+DEFAULT_MAX_AMOUNTS = {
+    "add_developers":  10,
+    "extend_deadline": 30,
+}
+
+MAX_EVALUATIONS = 600
+
+
+def _default_max_amounts(data: dict) -> dict:
+    tasks = data.get("tasks", [])
+    prs = data.get("pull_requests", [])
+    amounts = dict(DEFAULT_MAX_AMOUNTS)
+    amounts["remove_scope"] = sum(1 for t in tasks if t["is_baseline"] == False and t["status"] != "done")
+    amounts["close_prs"] = sum(1 for p in prs if p["status"] == "open")
+    return amounts
+
+
+def _pareto_front(points: list) -> list:
+    """Non-dominated (cost, score) points: no other plan is both cheaper and lower-risk."""
+    front = []
+    best_score = float("inf")
+    for point in sorted(points, key=lambda p: (p["cost"], p["total_score"])):
+        if point["total_score"] < best_score:
+            front.append(point)
+            best_score = point["total_score"]
+    return front
+
+
+class _PlanModel:
+    """
+    Signals of a combined plan from per-lever counters over the baseline,
+    equal to score_plan's. Levers apply in COMBINED_MUTATION_ORDER and each
+    signal depends on only a few of them:
+
+        remove_scope                    task counts, dependency graph, scope
+        remove_scope, add_developers    workload and silent-developer ratios
+        remove_scope, extend_deadline   overdue ratio
+        close_prs                       average open PR age
+
+    remove_scope always cuts the last k open non-baseline tasks, so every
+    amount removes a prefix of one reversed list and the counts shift by
+    prefix sums. Each factor is memoized on the amounts it depends on.
+    """
+
+    def __init__(self, data: dict, base_signals: dict):
+        self.base = base_signals["signals"]
+        now = _parse_iso(data["metadata"]["simulated_now"])
+        self.tasks = data.get("tasks", [])
+        self.dev_ids = [d["dev_id"] for d in data.get("developers", [])]
+        self.baseline_count = sum(1 for t in self.tasks if t["is_baseline"] == True)
+        active = [i for i, t in enumerate(self.tasks) if t["status"] != "done"]
+        self.active_count = len(active)
+        # Removal candidates, in the order growing remove_scope amounts take them
+        self.removable = [i for i in active if self.tasks[i]["is_baseline"] == False][::-1]
+
+        stale_before = now - datetime.timedelta(days=5)
+        sprint = next((sp for sp in data.get("sprints", [])
+                       if _parse_iso(sp["start_date"]) <= now <= _parse_iso(sp["end_date"])), None)
+        sprint_start = _parse_iso(sprint["start_date"]) if sprint else None
+
+        def mid_sprint(t):
+            return (sprint is not None and t["is_baseline"] == False and t["sprint_id"] == sprint["sprint_id"]
+                    and _parse_iso(t["created_at"]) > sprint_start)
+
+        flags = {
+            "blocked": lambda t: t["status"] == "blocked",
+            "unassigned": lambda t: t["assigned_to"] is None,
+            "stale": lambda t: _parse_iso(t["updated_at"]) < stale_before,
+            "mid_sprint": mid_sprint,
+        }
+        self.totals = {name: sum(1 for i in active if flag(self.tasks[i])) for name, flag in flags.items()}
+        self.totals["mid_sprint"] = sum(1 for t in self.tasks if mid_sprint(t))
+        # removed[name][k]: flagged tasks among the first k removal candidates
+        self.removed = {}
+        for name, flag in flags.items():
+            prefix = [0]
+            for i in self.removable:
+                prefix.append(prefix[-1] + flag(self.tasks[i]))
+            self.removed[name] = prefix
+
+        self.centrality = self._centrality_sweep()
+        self._depths = None
+
+        # Workload: open tasks per assignee, and each assignee's open tasks in task order
+        self.open_assigned = Counter(self.tasks[i]["assigned_to"] for i in active if self.tasks[i]["assigned_to"])
+        self.active_devs = Counter(self.tasks[i]["assigned_to"] for i in active if self.tasks[i]["assigned_to"] is not None)
+        self.dev_tasks = defaultdict(list)
+        for i in active:
+            if self.tasks[i]["assigned_to"]:
+                self.dev_tasks[self.tasks[i]["assigned_to"]].append(i)
+        recent_from = now - datetime.timedelta(hours=72)
+        self.recent_users = {m["user_id"] for m in data.get("messages", []) if _parse_iso(m["timestamp"]) >= recent_from}
+
+        # Overdue: extending by d days leaves overdue the tasks due before now - d
+        self.now = now
+        self.dues = {i: _parse_iso(self.tasks[i]["due_date"]) for i in active}
+        self.sorted_dues = sorted(self.dues.values())
+
+        # PR age: open PRs in list order, and the order close_prs closes them in
+        open_prs = [p for p in data.get("pull_requests", []) if p["status"] == "open"]
+        created = [_parse_iso(p["created_at"]) for p in open_prs]
+        self.pr_ages = [(now - c).total_seconds() / 86400 for c in created]
+        self.close_order = sorted(range(len(open_prs)), key=created.__getitem__)
+
+        self._memo = {}
+
+    def _centrality_sweep(self) -> list:
+        """Max in-degree after each removal, removing candidates one at a time."""
+        dep_counts = Counter(dep for t in self.tasks for dep in t["depends_on"] if dep)
+        hist = Counter(dep_counts.values())
+        top = max(hist) if hist else 0
+        maxima = [top]
+        removed = set()
+        for i in self.removable:
+            task = self.tasks[i]
+            # Its own edges go, and remove_tasks drops every reference to it
+            for dep in task["depends_on"]:
+                if dep and dep not in removed:
+                    hist[dep_counts[dep]] -= 1
+                    dep_counts[dep] -= 1
+                    hist[dep_counts[dep]] += 1
+            removed.add(task["task_id"])
+            hist[dep_counts.pop(task["task_id"], 0)] -= 1
+            while top > 0 and hist[top] <= 0:
+                top -= 1
+            maxima.append(top)
+        return maxima
+
+    def _depth(self, k: int) -> int:
+        if self._depths is None:
+            removal_order = [self.tasks[i]["task_id"] for i in self.removable]
+            self._depths = _DependencyGraph(self.tasks).depths_by_removal(removal_order)
+        return self._depths[k]
+
+    def _memoized(self, key: tuple, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def _scope(self, k: int) -> dict:
+        active = self.active_count - k
+        ratio = lambda name: _safe_div(self.totals[name] - self.removed[name][k], active)
+        values = {
+            "blocked_task_ratio": ratio("blocked"),
+            "critical_path_depth": self._depth(k),
+            "dependency_centrality_max": self.centrality[k],
+            "unassigned_task_ratio": ratio("unassigned"),
+            "mid_sprint_task_additions": self.totals["mid_sprint"] - self.removed["mid_sprint"][k],
+            "scope_growth_rate": _safe_div(len(self.tasks) - k - self.baseline_count, self.baseline_count),
+            "stale_task_ratio": ratio("stale"),
+        }
+        return {name: signal_entry(name, value) for name, value in values.items()}
+
+    def _workload(self, k: int, n: int) -> dict:
+        cut = self.removable[:k]
+        loads = self.open_assigned - Counter(self.tasks[i]["assigned_to"] for i in cut if self.tasks[i]["assigned_to"])
+        active_devs = set(self.active_devs - Counter(self.tasks[i]["assigned_to"] for i in cut))
+        new_ids = [f"dev_{len(self.dev_ids) + j + 1}_sim" for j in range(max(n, 0))]
+        if loads and new_ids:
+            # max() over open_assigned keeps the dev whose first open task comes first
+            cut = set(cut)
+            top = max(loads.values())
+            dev = min((d for d, c in loads.items() if c == top),
+                      key=lambda d: next(i for i in self.dev_tasks[d] if i not in cut))
+            moved = min(3 * n, loads[dev])
+            loads[dev] -= moved
+            if not loads[dev]:
+                del loads[dev]
+                active_devs.discard(dev)
+            # Round-robin: new dev j takes every n-th of the moved tasks
+            for j, new_id in enumerate(new_ids[:moved]):
+                loads[new_id] = moved // n + (j < moved % n)
+                active_devs.add(new_id)
+        dev_ids = self.dev_ids + new_ids
+        values = {
+            "overloaded_dev_ratio": _safe_div(sum(1 for d in dev_ids if loads.get(d, 0) > 5), len(dev_ids)),
+            "task_concentration_index": _safe_div(max(loads.values()) if loads else 0, self.active_count - k),
+            "silent_dev_ratio": _safe_div(sum(1 for d in active_devs if d not in self.recent_users), len(active_devs)),
+        }
+        return {name: signal_entry(name, value) for name, value in values.items()}
+
+    def _overdue(self, k: int, days: int) -> dict:
+        cutoff = self.now - datetime.timedelta(days=days)
+        overdue = bisect.bisect_left(self.sorted_dues, cutoff)
+        overdue -= sum(1 for i in self.removable[:k] if self.dues[i] < cutoff)
+        return {"overdue_task_ratio": signal_entry("overdue_task_ratio", _safe_div(overdue, self.active_count - k))}
+
+    def _pr_age(self, c: int) -> dict:
+        closed = set(self.close_order[:c])
+        ages = [age for j, age in enumerate(self.pr_ages) if j not in closed]
+        return {"avg_pr_age_days": signal_entry("avg_pr_age_days", sum(ages) / len(ages) if ages else 0.0)}
+
+    def signals(self, plan: dict) -> dict:
+        k = min(max(plan.get("remove_scope", 0), 0), len(self.removable))
+        n = plan.get("add_developers", 0)
+        days = plan.get("extend_deadline", 0)
+        c = plan.get("close_prs", 0)
+        signals = dict(self.base)
+        if k:
+            signals.update(self._memoized(("scope", k), lambda: self._scope(k)))
+        if k or n > 0:
+            signals.update(self._memoized(("workload", k, n), lambda: self._workload(k, n)))
+        if k or days:
+            signals.update(self._memoized(("overdue", k, days), lambda: self._overdue(k, days)))
+        if c > 0:
+            signals.update(self._memoized(("pr_age", c), lambda: self._pr_age(c)))
+        return {"signals": signals}
+
+
+class _PlanScorer:
+    """Memoized plan -> risk scoring over one shared baseline."""
+
+    def __init__(self, data: dict, base_signals: dict, levers: tuple, costs: dict, max_evaluations: int):
+        self.model = _PlanModel(data, base_signals)
+        self.levers = levers
+        self.costs = costs
+        self.max_evaluations = max_evaluations
+        self.memo = {}
+        self.flat = {}  # lever -> largest maximum it was scanned to without improving
+
+    def key(self, plan: dict) -> tuple:
+        return tuple(plan.get(lever, 0) for lever in self.levers)
+
+    def cost(self, plan: dict) -> float:
+        return sum(self.costs[lever] * plan.get(lever, 0) for lever in self.levers)
+
+    def exhausted(self) -> bool:
+        return len(self.memo) >= self.max_evaluations
+
+    def score(self, plan: dict) -> dict:
+        key = self.key(plan)
+        risk = self.memo.get(key)
+        if risk is None:
+            risk = compute_risk_score(self.model.signals(plan))
+            self.memo[key] = risk
+        return risk
+
+    def evaluated(self) -> list:
+        points = []
+        for key, risk in self.memo.items():
+            plan = {lever: amount for lever, amount in zip(self.levers, key) if amount}
+            points.append({
+                "plan": plan,
+                "cost": self.cost(plan),
+                "total_score": risk["total_score"],
+                "risk_level": risk["risk_level"],
+            })
+        return points
+
+
+def _gallop(start: int, max_amount: int):
+    """start + 1, 2, 4, ... and finally max_amount itself."""
+    step = 1
+    while start + step < max_amount:
+        yield start + step
+        step *= 2
+    if start < max_amount:
+        yield max_amount
+
+
+def _best_step(scorer: _PlanScorer, plan: dict, lever: str, max_amount: int, current: float, target: float):
+    """
+    Most efficient increase of one lever (score drop per unit cost), galloping
+    over increases of 1, 2, 4, ... so plateaus cost a few evaluations, not one
+    per unit. An increase that reaches the target is bisected down to the
+    smallest one that still does and ends the gallop. Returns (efficiency,
+    candidate, total) or None; a lever that never improves up to its maximum
+    is remembered and not scanned again.
+    """
+    if scorer.flat.get(lever, -1) >= max_amount:
+        return None
+    best = None
+    previous = plan.get(lever, 0)
+    for amount in _gallop(previous, max_amount):
+        if scorer.exhausted():
+            break
+        total = scorer.score(dict(plan, **{lever: amount}))["total_score"]
+        if total < target:
+            low, high = previous, amount
+            while high - low > 1 and not scorer.exhausted():
+                middle = (low + high) // 2
+                if scorer.score(dict(plan, **{lever: middle}))["total_score"] < target:
+                    high = middle
+                else:
+                    low = middle
+            amount = high
+            total = scorer.score(dict(plan, **{lever: amount}))["total_score"]
+        if total < current:
+            candidate = dict(plan, **{lever: amount})
+            extra_cost = scorer.cost(candidate) - scorer.cost(plan)
+            efficiency = (current - total) / extra_cost if extra_cost > 0 else float("inf")
+            if best is None or efficiency >= best[0]:
+                best = (efficiency, candidate, total)
+            if total < target:
+                break
+        previous = amount
+    if best is None and previous >= max_amount:
+        scorer.flat[lever] = max_amount
+    return best
+
+
+def _affordable(scorer: _PlanScorer, plan: dict, lever: str, max_amount: int, cost_limit: float) -> int:
+    """The largest amount of `lever` that keeps the plan's cost under `cost_limit`."""
+    if cost_limit is None or scorer.costs[lever] <= 0:
+        return max_amount
+    room = cost_limit - scorer.cost(plan)
+    return min(max_amount, plan.get(lever, 0) + math.ceil(room / scorer.costs[lever]) - 1)
+
+
+def _greedy(scorer: _PlanScorer, max_amounts: dict, target: float, plan: dict = None, cost_limit: float = None) -> dict:
+    plan = dict(plan or {})
+    current = scorer.score(plan)["total_score"]
+    while current >= target and not scorer.exhausted():
+        best = None
+        for lever in scorer.levers:
+            max_amount = _affordable(scorer, plan, lever, max_amounts[lever], cost_limit)
+            step = _best_step(scorer, plan, lever, max_amount, current, target)
+            if step is not None and (best is None or step[0] > best[0]):
+                best = step
+        if best is None:
+            break
+        _, plan, current = best
+    return plan
+
+
+def _single_lever_seed(scorer: _PlanScorer, max_amounts: dict, target: float):
+    """Cheapest one-lever plan that reaches the target, each lever's amount found by bisection."""
+    best = None
+    for lever in scorer.levers:
+        high = max_amounts[lever]
+        if high <= 0 or scorer.exhausted() or scorer.score({lever: high})["total_score"] >= target:
+            continue
+        low = 0
+        while high - low > 1 and not scorer.exhausted():
+            middle = (low + high) // 2
+            if scorer.score({lever: middle})["total_score"] < target:
+                high = middle
+            else:
+                low = middle
+        if best is None or scorer.cost({lever: high}) < scorer.cost(best):
+            best = {lever: high}
+    return best
+
+
+def _trade(scorer: _PlanScorer, plan: dict, lever: str, other: str, max_amounts: dict, target: float):
+    """
+    Raises `other` by 1, 2, 4, ... and for each bisects `lever` down to the
+    smallest amount that still reaches the target. Returns the cheapest such
+    plan if it beats `plan`, else None.
+    """
+    amount, start = plan[lever], plan.get(other, 0)
+    current = scorer.score(plan)["total_score"]
+    best, best_cost = None, scorer.cost(plan)
+    high = amount
+    for raised in _gallop(start, max_amounts[other]):
+        # Raising the other lever already costs as much as this lever saves at most
+        if scorer.exhausted() or scorer.costs[other] * (raised - start) >= scorer.costs[lever] * amount:
+            break
+        base = dict(plan, **{other: raised})
+        if scorer.score(base)["total_score"] >= current:
+            continue  # Nothing gained to trade back, e.g. a plateau
+        # A larger raise never needs more of `lever` than a smaller one did
+        low = -1
+        while high - low > 1 and not scorer.exhausted():
+            middle = (low + high) // 2
+            if scorer.score(dict(base, **{lever: middle}))["total_score"] < target:
+                high = middle
+            else:
+                low = middle
+        candidate = {k: v for k, v in dict(base, **{lever: high}).items() if v}
+        if scorer.score(candidate)["total_score"] < target and scorer.cost(candidate) < best_cost:
+            best, best_cost = candidate, scorer.cost(candidate)
+    return best
+
+
+def _local_search(scorer: _PlanScorer, plan: dict, max_amounts: dict, target: float) -> dict:
+    """
+    Two moves, keeping any plan that is cheaper and still under target:
+    trade one lever for another (see _trade), or destroy-and-repair: cut one
+    lever (dropping it, then halving the cut down to a single unit) and
+    greedily repair the plan back under target.
+    """
+    improved = True
+    while improved and not scorer.exhausted():
+        improved = False
+        best_cost = scorer.cost(plan)
+        for lever in scorer.levers:
+            amount = plan.get(lever, 0)
+            if not amount:
+                continue
+            for other in scorer.levers:
+                candidate = _trade(scorer, plan, lever, other, max_amounts, target) if other != lever else None
+                if candidate is not None:
+                    plan, best_cost, improved = candidate, scorer.cost(candidate), True
+                    break
+                if scorer.exhausted():
+                    return plan
+            cut = 0 if improved else amount
+            while cut >= 1 and not improved:
+                reduced_amount = amount - cut
+                reduced = {k: v for k, v in dict(plan, **{lever: reduced_amount}).items() if v}
+                # Repair without re-growing the lever that was just cut
+                limits = dict(max_amounts, **{lever: reduced_amount})
+                candidate = _greedy(scorer, limits, target, reduced, cost_limit=best_cost)
+                if scorer.score(candidate)["total_score"] < target and scorer.cost(candidate) < best_cost:
+                    plan, best_cost, improved = candidate, scorer.cost(candidate), True
+                if scorer.exhausted():
+                    return plan
+                cut //= 2
+            if improved:
+                break
+    return plan
+
+
+def optimize_mitigation(data: dict, costs: dict, target_score: float = 60.0, target_level: str = None,
+                        max_amounts: dict = None, state_version: str = None,
+                        max_evaluations: int = MAX_EVALUATIONS) -> dict:
+    """
+    Searches for the cheapest combined mutation plan whose score is below the
+    target: the cheapest single-lever plan that reaches it, else greedy
+    descent by score-drop per unit cost, followed by a cut-and-repair local
+    search. Every evaluated plan feeds the cost-vs-risk Pareto front.
+    """
+    if target_level is not None:
+        if target_level not in LEVEL_THRESHOLDS:
+            raise ValueError(f"target_level must be one of {', '.join(LEVEL_THRESHOLDS)}.")
+        target_score = LEVEL_THRESHOLDS[target_level]
+
+    unknown = set(costs) - set(COMBINED_MUTATION_ORDER)
+    if unknown:
+        raise ValueError(f"Unknown mutation types: {', '.join(sorted(unknown))}.")
+    levers = tuple(lever for lever in COMBINED_MUTATION_ORDER if lever in costs)
+    if not levers:
+        raise ValueError("At least one mutation cost is required.")
+    if any(costs[lever] < 0 for lever in levers):
+        raise ValueError("Mutation costs must be non-negative.")
+
+    limits = _default_max_amounts(data)
+    limits.update(max_amounts or {})
+
+    base_signals, base_risk = score_baseline(data, state_version)
+    scorer = _PlanScorer(data, base_signals, levers, costs, max_evaluations)
+
+    plan = _greedy(scorer, limits, target_score, _single_lever_seed(scorer, limits, target_score))
+    achieved = scorer.score(plan)["total_score"] < target_score
+    if achieved:
+        plan = _local_search(scorer, plan, limits, target_score)
+
+    plan = {lever: plan[lever] for lever in levers if plan.get(lever)}
+    risk = scorer.score(plan)
+    return {
+        "baseline": {
+            "total_score": base_risk["total_score"],
+            "risk_level": base_risk["risk_level"],
+        },
+        "target_score": target_score,
+        "achieved": achieved,
+        "plan": plan,
+        "plan_cost": scorer.cost(plan),
+        "plan_score": risk["total_score"],
+        "plan_level": risk["risk_level"],
+        "pareto_front": _pareto_front(scorer.evaluated()),
+        "evaluations": len(scorer.memo),
+        "optimizer_version": "1.0"
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+    from core.state_loader import load_project_state
+
+    parser = argparse.ArgumentParser(description="Cheapest mitigation plan for the project state.")
+    parser.add_argument("--verify", type=int, metavar="N", default=0,
+                        help="check N random plans' scores against score_plan's re-extraction")
+    args = parser.parse_args()
+
+    data, _ = load_project_state()
+
+    if args.verify:
+        base_signals, _ = score_baseline(data)
+        model = _PlanModel(data, base_signals)
+        limits = _default_max_amounts(data)
+        rng = random.Random(0)
+        mismatches = []
+        for _ in range(args.verify):
+            plan = {lever: rng.randint(0, limits[lever]) for lever in COMBINED_MUTATION_ORDER if rng.random() < 0.6}
+            fast = compute_risk_score(model.signals(plan))["total_score"]
+            full = score_plan(data, plan, base_signals)["total_score"]
+            if abs(fast - full) > 1e-9:
+                mismatches.append((plan, fast, full))
+        for plan, fast, full in mismatches:
+            print(f"  {plan}  model {fast:.4f}  full {full:.4f}")
+        print(f"{args.verify - len(mismatches)}/{args.verify} plans match score_plan")
+        sys.exit(1 if mismatches else 0)
+
+    costs = {"add_developers": 10.0, "extend_deadline": 1.0, "remove_scope": 3.0, "close_prs": 0.5}
+    result = optimize_mitigation(data, costs, target_score=60.0)
+
+    print(f"\nBaseline: {result['baseline']['total_score']:.2f} ({result['baseline']['risk_level']})")
+    print(f"Target:   < {result['target_score']:.0f}  achieved={result['achieved']}")
+    print(f"Plan:     {result['plan']}  cost={result['plan_cost']:.1f}  score={result['plan_score']:.2f}")
+    print(f"Evaluations: {result['evaluations']}")
+    print(f"\nPareto front ({len(result['pareto_front'])} plans):")
+    for point in result["pareto_front"]:
+        print(f"  cost={point['cost']:6.1f}  score={point['total_score']:6.2f}  {point['plan']}")
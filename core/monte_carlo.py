@@ -1,8 +1,14 @@
 import random
 import math
 import statistics
+from collections import OrderedDict
 from typing import Dict
 
+import numpy as np
+
+from core.metrics import CACHE_REQUESTS, timed
+from core.shared_cache import get_or_compute
+
 WEIGHTS = {
     'dependency': 0.30,
     'delay':      0.25,
@@ -37,6 +43,7 @@ def sample_all_signals(signals: dict) -> dict:
 def mean3(a, b, c):
     return (a + b + c) / 3.0
 
+@timed("run_monte_carlo")
 def run_monte_carlo(signals: dict, n_simulations: int = 10000) -> dict:
     simulation_scores = []
 
@@ -109,14 +116,110 @@ def run_monte_carlo(signals: dict, n_simulations: int = 10000) -> dict:
     }
 
 
-if __name__ == "__main__":
-    import json
-    from core.signal_extractor import extract_signals
+# (state_version, n_simulations) -> run_monte_carlo result
+_result_cache = OrderedDict()
+RESULT_CACHE_SIZE = 8
+
+
+def cached_monte_carlo(signals: dict, state_version: str = None, n_simulations: int = 10000) -> dict:
+    """run_monte_carlo, cached per state version: one distribution per state rather than a fresh draw per request."""
+    if state_version is None:
+        return run_monte_carlo(signals, n_simulations)
+    key = (state_version, n_simulations)
+    cached = _result_cache.get(key)
+    if cached is not None:
+        CACHE_REQUESTS.inc(cache="monte_carlo", result="hit")
+        _result_cache.move_to_end(key)
+        return cached
+    CACHE_REQUESTS.inc(cache="monte_carlo", result="miss")
+
+    # Another worker process may already hold this state's distribution
+    result = get_or_compute(("monte_carlo", state_version, n_simulations),
+                            lambda: run_monte_carlo(signals, n_simulations))
+    _result_cache[key] = result
+    while len(_result_cache) > RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+    return result
+
+def _score_matrix(samples: np.ndarray, index: dict) -> np.ndarray:
+    """Vectorised risk formula over an (n_simulations, n_signals) sample matrix."""
+    col = lambda name: samples[:, index[name]]
+
+    dep   = (col('blocked_task_ratio') + col('critical_path_depth') + col('dependency_centrality_max')) / 3.0
+    work  = (col('overloaded_dev_ratio') + col('task_concentration_index') + col('unassigned_task_ratio')) / 3.0
+    scope = (col('mid_sprint_task_additions') + col('scope_growth_rate') + col('out_of_scope_pr_count')) / 3.0
+    delay = (col('overdue_task_ratio') + col('stale_task_ratio') + col('avg_pr_age_days')) / 3.0
+    comms = (col('silent_dev_ratio') + col('unanswered_thread_ratio') + col('escalation_keyword_count')) / 3.0
+
+    base = dep*0.30 + delay*0.25 + work*0.20 + scope*0.15 + comms*0.10
+
+    penalty = np.where((col('critical_path_depth') > 0.70) & (col('overloaded_dev_ratio') > 0.60), 0.05, 0.0)
+    penalty = penalty + np.where((col('overdue_task_ratio') > 0.70) & (col('silent_dev_ratio') > 0.50), 0.04, 0.0)
+    penalty = np.minimum(penalty, 0.09)
+
+    return np.minimum(base + penalty, 1.0) * 100
+
+
+def _summarize_scores(scores: np.ndarray) -> dict:
+    ordered = np.sort(scores)
+    n = len(ordered)
+    levels = np.searchsorted([40.0, 60.0, 75.0], ordered, side='right')
+    counts = np.bincount(levels, minlength=4)
+    return {
+        "mean_score":              round(float(ordered.mean()), 2),
+        "median_score":            round(float(np.median(ordered)), 2),
+        "std_deviation":           round(float(ordered.std(ddof=1)), 2),
+        "percentile_5":            round(float(ordered[int(n * 0.05)]), 2),
+        "percentile_95":           round(float(ordered[int(n * 0.95)]), 2),
+        "risk_level_distribution": {
+            level: round(float(c) / n * 100, 1)
+            for level, c in zip(('LOW', 'MODERATE', 'HIGH', 'CRITICAL'), counts)
+        },
+        "probability_critical":    round(float(counts[3]) / n, 4),
+    }
+
+
+@timed("run_paired_monte_carlo")
+def run_paired_monte_carlo(base_signals: dict, sim_signals: dict, n_simulations: int = 10000, seed: int = None) -> dict:
+    """
+    Monte Carlo for a baseline and a mutated signal set in one vectorised pass.
+    Both sides share the same noise draws (common random numbers), so the
+    per-run delta isolates the effect of the mutation rather than sampling noise.
+    """
+    names = list(base_signals['signals'])
+    index = {name: i for i, name in enumerate(names)}
+    base_mu = np.array([base_signals['signals'][name]['score'] for name in names])
+    sim_mu = np.array([sim_signals['signals'][name]['score'] for name in names])
+    sigma = np.array([UNCERTAINTY.get(name, DEFAULT_UNCERTAINTY) for name in names])
+
+    noise = np.random.default_rng(seed).standard_normal((n_simulations, len(names))) * sigma
+    base_scores = _score_matrix(np.clip(base_mu + noise, 0.0, 1.0), index)
+    sim_scores = _score_matrix(np.clip(sim_mu + noise, 0.0, 1.0), index)
+
+    deltas = sim_scores - base_scores
+    base_critical = base_scores >= 75
+    sim_critical = sim_scores >= 75
 
-    with open("data/unified_project_state.json") as f:
-        data = json.load(f)
+    return {
+        "n_simulations": n_simulations,
+        "baseline":      _summarize_scores(base_scores),
+        "simulated":     _summarize_scores(sim_scores),
+        "delta": {
+            "mean_score":                  round(float(deltas.mean()), 2),
+            "std_deviation":               round(float(deltas.std(ddof=1)), 2),
+            "percentile_5":                round(float(np.sort(deltas)[int(n_simulations * 0.05)]), 2),
+            "percentile_95":               round(float(np.sort(deltas)[int(n_simulations * 0.95)]), 2),
+            "probability_critical":        round(float(sim_critical.mean() - base_critical.mean()), 4),
+            "probability_escape_critical": round(float((base_critical & ~sim_critical).mean()), 4),
+        },
+        "simulation_version": "1.0"
+    }
+
+
+if __name__ == "__main__":
+    from core.state_loader import load_project_signals
 
-    signals = extract_signals(data)
+    signals, _ = load_project_signals()
     result = run_monte_carlo(signals, n_simulations=10000)
 
     print(f"\n{'='*50}")
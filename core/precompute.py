@@ -0,0 +1,178 @@
+import asyncio
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.history_store import record_analysis
+from core.metrics import STAGE_SECONDS
+from core.shared_cache import aget_or_compute
+from core.state_loader import DATA_PATH, load_project_state, state_version
+from core.warmup import warm_up
+
+
+class PrecomputeScheduler:
+    """
+    Keeps a finished analysis per project state in memory, so reads do no
+    work on the request path. Every `poll_s` seconds each state file's
+    version is checked; a new version, or a result older than `refresh_s`
+    (0 = only on change), is recomputed in the background, at most
+    `concurrency` analyses at a time. A run that fails is not retried for
+    the same version until the refresh interval passes.
+    """
+
+    def __init__(self, paths=(DATA_PATH,), poll_s: float = 5.0, refresh_s: float = 0.0, concurrency: int = 1):
+        if poll_s <= 0 or concurrency < 1:
+            raise ValueError("poll_s must be positive and concurrency at least 1.")
+        self.paths = [str(p) for p in paths]
+        self.poll_s = poll_s
+        self.refresh_s = refresh_s
+        self.concurrency = concurrency
+        self._ready = {}    # path -> {"version", "computed_at", "duration_s", "result"}
+        self._failed = {}   # path -> (version, failed_at)
+        self._running = {}  # path -> (version, asyncio.Task)
+        self._semaphore = None
+        self._poller = None
+
+    def start(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._poller = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        tasks = [t for t in [self._poller, *(task for _, task in self._running.values())] if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def ready(self, path=DATA_PATH):
+        """The stored analysis for `path` if it was computed from the state's current version, else None."""
+        path = str(path)
+        entry = self._ready.get(path)
+        if entry is None:
+            return None
+        try:
+            current = state_version(path)
+        except OSError:
+            return None
+        return entry if entry["version"] == current else None
+
+    def pending(self, path, version: str):
+        """The in-flight analysis task for `path` at `version`, if one is running; it returns the result or None."""
+        running = self._running.get(str(path))
+        return running[1] if running is not None and running[0] == version else None
+
+    def store(self, path, version: str, result: dict, duration_s: float = None, computed_at: float = None):
+        """Records a finished analysis, e.g. one a request computed itself, stamped with when it was computed."""
+        self._ready[str(path)] = {"version": version, "computed_at": computed_at or time.time(),
+                                  "duration_s": duration_s, "result": result}
+
+    def status(self) -> list:
+        now = time.time()
+        return [
+            {
+                "path": path,
+                "state_version": self._ready[path]["version"] if path in self._ready else None,
+                "age_seconds": round(now - self._ready[path]["computed_at"], 1) if path in self._ready else None,
+                "current": self.ready(path) is not None,
+                "running": path in self._running,
+            }
+            for path in self.paths
+        ]
+
+    async def _poll(self):
+        while True:
+            for path in self.paths:
+                self._maybe_refresh(path)
+            await asyncio.sleep(self.poll_s)
+
+    def _due(self, since: float) -> bool:
+        return bool(self.refresh_s) and time.time() - since >= self.refresh_s
+
+    def _maybe_refresh(self, path: str):
+        if path in self._running:
+            return
+        try:
+            version = state_version(path)
+        except OSError:
+            return
+        failed = self._failed.get(path)
+        if failed is not None and failed[0] == version and not self._due(failed[1]):
+            return
+        entry = self._ready.get(path)
+        if entry is None or entry["version"] != version or self._due(entry["computed_at"]):
+            self._running[path] = (version, asyncio.create_task(self._compute(path, version)))
+
+    async def _compute(self, path: str, version: str):
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._semaphore:
+                t0 = time.perf_counter()
+                # The CPU-bound steps fill their per-version caches off the event loop,
+                # so the analysis below only waits on the agents
+                await loop.run_in_executor(None, warm_up, path)
+                data, version = await loop.run_in_executor(None, load_project_state, path)
+                analysis = await compute_analysis(path, data, version, self.refresh_s)
+                duration = time.perf_counter() - t0
+                STAGE_SECONDS.observe(duration, stage="precompute_analysis")
+                self.store(path, version, analysis["result"], duration, analysis["computed_at"])
+                self._failed.pop(path, None)
+                return analysis["result"]
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Meridian precompute failed for {path}: {e}")
+            self._failed[path] = (version, time.time())
+            return None
+        finally:
+            self._running.pop(path, None)
+
+
+async def compute_analysis(path, data: dict, version: str, refresh_s: float = 0.0) -> dict:
+    """
+    run_full_analysis for one state version, computed once across worker
+    processes: the first to claim it runs the agents and records the result
+    in history, the others take it from the shared cache. Returns
+    {"result", "computed_at"}, the time being when the agents actually ran.
+    With a refresh interval the shared entry is per interval (epoch of
+    `refresh_s` seconds), so a due refresh computes a new analysis instead
+    of reading the old one back.
+    """
+    async def analyse():
+        # The agents (and their LLM client) load on first analysis, not at startup
+        from agents import supervisor_agent
+
+        result = await supervisor_agent.run_full_analysis(data, version)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, record_analysis, result, data)
+        except Exception:
+            pass  # History is best-effort; never fail the analysis over it
+        return {"result": result, "computed_at": time.time()}
+
+    epoch = int(time.time() // refresh_s) if refresh_s else 0
+    return await aget_or_compute(("analysis", str(path), version, epoch), analyse)
+
+
+def tag_result(entry: dict) -> dict:
+    """A stored analysis with its provenance under "precomputed"."""
+    computed_at = datetime.datetime.fromtimestamp(entry["computed_at"], datetime.timezone.utc)
+    return {
+        **entry["result"],
+        "precomputed": {
+            "computed_at": computed_at.isoformat().replace("+00:00", "Z"),
+            "age_seconds": round(time.time() - entry["computed_at"], 1),
+            "state_version": entry["version"],
+        },
+    }
+
+
+def scheduler_from_env(paths=(DATA_PATH,)):
+    """A PrecomputeScheduler for `paths` configured from the environment, or None when MERIDIAN_PRECOMPUTE=off."""
+    if os.getenv("MERIDIAN_PRECOMPUTE", "on") == "off":
+        return None
+    return PrecomputeScheduler(
+        paths,
+        poll_s=float(os.getenv("MERIDIAN_PRECOMPUTE_POLL_S", "5")),
+        refresh_s=float(os.getenv("MERIDIAN_PRECOMPUTE_REFRESH_S", "0")),
+        concurrency=int(os.getenv("MERIDIAN_PRECOMPUTE_CONCURRENCY", "1")),
+    )
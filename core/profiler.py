@@ -0,0 +1,129 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+DEFAULT_INTERVAL_S = 0.005
+MAX_STACK_DEPTH = 64
+
+# Leaf frames of threads parked waiting for work; counted as idle, not as hotspots
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("base_events.py", "_run_once"),
+    ("thread.py", "_worker"),
+    ("queue.py", "get"),
+}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler over every thread of the process, so work
+    handed to executor threads shows up alongside the request handler.
+    Optionally traces allocations with tracemalloc for the same window.
+    Nothing runs until start(); there is no cost when it is not in use.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL_S, trace_memory: bool = True):
+        self.interval = interval
+        self.trace_memory = trace_memory
+        self.stacks = Counter()
+        self.idle_samples = 0
+        self.samples = 0
+        self.duration = 0.0
+        self.memory_snapshot = None
+        self.memory_peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._owns_tracemalloc = False
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="meridian-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._started
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.memory_snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ))
+            self.memory_peak = tracemalloc.get_traced_memory()[1]
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+                if leaf in IDLE_FRAMES:
+                    self.idle_samples += 1
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[tuple(reversed(stack))] += 1
+                self.samples += 1
+
+    def folded(self) -> str:
+        """Collapsed stacks ("root;...;leaf count"), the input format of flamegraph.pl and speedscope."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top: int = 20) -> dict:
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+
+        share = lambda n: round(n / self.samples, 4) if self.samples else 0.0
+        summary = {
+            "duration_s": round(self.duration, 4),
+            "interval_s": self.interval,
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "top_self": [
+                {"function": label, "samples": n, "share": share(n)}
+                for label, n in self_counts.most_common(top)
+            ],
+            "top_cumulative": [
+                {"function": label, "samples": n, "share": share(n)}
+                for label, n in total_counts.most_common(top)
+            ],
+        }
+        if self.memory_snapshot is not None:
+            summary["memory"] = {
+                "peak_bytes": self.memory_peak,
+                "top_allocations": [
+                    {"location": str(stat.traceback), "size_bytes": stat.size, "blocks": stat.count}
+                    for stat in self.memory_snapshot.statistics("lineno")[:top]
+                ],
+            }
+        return summary
@@ -1,5 +1,8 @@
 import math
 
+from core.metrics import timed
+
+@timed("compute_risk_score")
 def compute_risk_score(signal_result: dict) -> dict:
     signals = signal_result.get("signals", {})
     
@@ -106,12 +109,9 @@ if __name__ == "__main__":
     import os
     # Add root to sys.path so 'core.signal_extractor' works regardless of where the script runs from
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-    from core.signal_extractor import extract_signals
-
-    with open("data/unified_project_state.json") as f:
-        data = json.load(f)
+    from core.state_loader import load_project_signals
 
-    signals_output = extract_signals(data)
+    signals_output, _ = load_project_signals()
     result = compute_risk_score(signals_output)
 
     print(f"\n{'='*40}")
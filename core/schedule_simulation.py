@@ -0,0 +1,208 @@
+import datetime
+import math
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.metrics import timed
+from core.signal_extractor import _parse_iso
+
+DAY_S = 86400.0
+# Fewer completed tasks than this and durations are fitted to planned (created -> due) spans instead
+MIN_HISTORY = 5
+MIN_DURATION_DAYS = 1 / 24
+DEFAULT_SIGMA = 0.5
+# An in-progress task is assumed half done
+IN_PROGRESS_REMAINING = 0.5
+# Runs are simulated in batches so the (tasks x runs) finish matrix stays around this
+# many cells: small enough to stay cache-friendly, large enough to amortise the per-level loop
+BATCH_CELLS = 1 << 21
+HISTOGRAM_BINS = 20
+
+
+def _days_between(start: str, end: str) -> float:
+    return (_parse_iso(end) - _parse_iso(start)).total_seconds() / DAY_S
+
+
+def fit_durations(tasks: list) -> dict:
+    """
+    Log-normal task duration model. Completed tasks give observed durations
+    (created_at -> updated_at, the time they were marked done); with too few
+    of those, planned spans (created_at -> due_date) stand in.
+    """
+    done = [max(_days_between(t["created_at"], t["updated_at"]), MIN_DURATION_DAYS) for t in tasks if t["status"] == "done"]
+    if len(done) >= MIN_HISTORY:
+        logs = np.log(done)
+        return {"source": "completed_tasks", "samples": len(done),
+                "mu": float(logs.mean()), "sigma": max(float(logs.std(ddof=1)), 0.1)}
+    planned = [max(_days_between(t["created_at"], t["due_date"]), MIN_DURATION_DAYS) for t in tasks]
+    return {"source": "planned_durations", "samples": len(planned),
+            "mu": float(np.log(np.median(planned))) if planned else 0.0, "sigma": DEFAULT_SIGMA}
+
+
+def _dag_levels(tasks: list):
+    """
+    Topological levels of the depends_on DAG (latest record per task_id;
+    dependencies on unknown ids are ignored). Returns (task_ids, by_id,
+    levels). Each level is (nodes, ranks): ranks[k] = (positions, deps) lists
+    the k-th dependency of every node in the level that has more than k, so
+    the max over dependencies is a few whole-array np.maximum calls.
+    """
+    by_id = {t["task_id"]: t for t in tasks}
+    ids = list(by_id)
+    index = {task_id: i for i, task_id in enumerate(ids)}
+    deps = [[index[d] for d in by_id[task_id]["depends_on"] if d in index] for task_id in ids]
+
+    dependents = [[] for _ in ids]
+    pending = [len(d) for d in deps]
+    for node, node_deps in enumerate(deps):
+        for dep in node_deps:
+            dependents[dep].append(node)
+
+    level = [i for i, n in enumerate(pending) if n == 0]
+    levels, placed = [], 0
+    while level:
+        placed += len(level)
+        ranks = []
+        for k in range(max(len(deps[node]) for node in level)):
+            positions = [i for i, node in enumerate(level) if len(deps[node]) > k]
+            ranks.append((np.array(positions, dtype=np.int64),
+                          np.array([deps[level[i]][k] for i in positions], dtype=np.int64)))
+        levels.append((np.array(level, dtype=np.int64), ranks))
+        following = []
+        for node in level:
+            for nxt in dependents[node]:
+                pending[nxt] -= 1
+                if pending[nxt] == 0:
+                    following.append(nxt)
+        level = following
+    if placed != len(ids):
+        raise ValueError("Task dependency graph contains a cycle.")
+    return ids, by_id, levels
+
+
+def _iso(t: datetime.datetime) -> str:
+    return t.isoformat().replace("+00:00", "Z")
+
+
+@timed("run_schedule_monte_carlo")
+def run_schedule_monte_carlo(data: dict, n_simulations: int = 10000, seed: int = None) -> dict:
+    """
+    Simulates when the project finishes. Each run samples a remaining
+    duration for every open task from the fitted log-normal (halved for
+    in-progress tasks; blocked tasks add an exponential wait with the mean
+    of their current blocked ages), then propagates finish times through the
+    depends_on DAG one topological level at a time, for a whole batch of runs
+    at once. Done tasks take no further time. Developer capacity is not
+    modelled: independent tasks run in parallel.
+    """
+    if n_simulations < 1:
+        raise ValueError("n_simulations must be at least 1.")
+    metadata = data["metadata"]
+    now = _parse_iso(metadata["simulated_now"])
+    tasks = data.get("tasks", [])
+    model = fit_durations(tasks)
+    ids, by_id, levels = _dag_levels(tasks)
+    n_tasks = len(ids)
+
+    status = [by_id[task_id]["status"] for task_id in ids]
+    scale = np.array([0.0 if s == "done" else IN_PROGRESS_REMAINING if s == "in_progress" else 1.0 for s in status],
+                     dtype=np.float32)
+    blocked = np.array([s == "blocked" for s in status])
+    blocked_ages = [max((now - _parse_iso(by_id[ids[i]]["updated_at"])).total_seconds() / DAY_S, 1.0)
+                    for i in np.flatnonzero(blocked)]
+    blocked_wait = float(np.mean(blocked_ages)) if blocked_ages else 0.0
+    open_nodes = np.flatnonzero(scale > 0)
+
+    rng = np.random.default_rng(seed)
+    batch = max(1, min(n_simulations, BATCH_CELLS // max(n_tasks, 1)))
+    completion = np.empty(n_simulations, dtype=np.float64)
+    for lo in range(0, n_simulations, batch):
+        runs = min(batch, n_simulations - lo)
+        # Tasks x runs, so gathering a dependency's finish times reads one contiguous row
+        duration = np.zeros((n_tasks, runs), dtype=np.float32)
+        z = rng.standard_normal((len(open_nodes), runs), dtype=np.float32)
+        duration[open_nodes] = np.exp(model["mu"] + model["sigma"] * z) * scale[open_nodes, None]
+        if blocked_wait:
+            duration[blocked] += rng.exponential(blocked_wait, (int(blocked.sum()), runs)).astype(np.float32)
+
+        finish = duration
+        for nodes, ranks in levels:
+            if not ranks:
+                continue
+            # Every node past level 0 has a dependency of rank 0
+            ready = finish[ranks[0][1]]
+            for positions, deps in ranks[1:]:
+                ready[positions] = np.maximum(ready[positions], finish[deps])
+            finish[nodes] += ready
+        completion[lo:lo + runs] = finish.max(axis=0) if n_tasks else 0.0
+
+    completion.sort()
+    pct = lambda q: float(completion[min(int(n_simulations * q), n_simulations - 1)])
+    at = lambda days: now + datetime.timedelta(days=days)
+
+    result = {
+        "n_simulations": n_simulations,
+        "simulated_now": metadata["simulated_now"],
+        "open_tasks": int(len(open_nodes)),
+        "dag_levels": len(levels),
+        "duration_model": {
+            "source": model["source"],
+            "samples": model["samples"],
+            "median_days": round(math.exp(model["mu"]), 3),
+            "sigma": round(model["sigma"], 3),
+            "blocked_wait_days": round(blocked_wait, 3),
+        },
+        "completion_date": {
+            "mean": _iso(at(float(completion.mean()))),
+            **{f"p{int(q * 100)}": _iso(at(pct(q))) for q in (0.05, 0.10, 0.50, 0.90, 0.95)},
+        },
+        "remaining_days": {
+            "mean": round(float(completion.mean()), 2),
+            **{f"p{int(q * 100)}": round(pct(q), 2) for q in (0.05, 0.10, 0.50, 0.90, 0.95)},
+        },
+    }
+
+    deadline = metadata.get("deadline_date")
+    if deadline:
+        deadline_days = (_parse_iso(deadline) - now).total_seconds() / DAY_S
+        slip = completion - deadline_days
+        result["deadline_date"] = deadline
+        result["probability_on_time"] = round(float(np.searchsorted(completion, deadline_days, side="right")) / n_simulations, 4)
+        result["slip_days"] = {"mean": round(float(slip.mean()), 2), "p50": round(pct(0.50) - deadline_days, 2),
+                               "p90": round(pct(0.90) - deadline_days, 2)}
+
+    counts, edges = np.histogram(completion, bins=HISTOGRAM_BINS)
+    result["histogram"] = [
+        {"date": _iso(at(float(edge))), "probability": round(float(c) / n_simulations, 4)}
+        for edge, c in zip(edges[:-1], counts)
+    ]
+    return result
+
+
+if __name__ == "__main__":
+    import time
+    from core.state_loader import load_project_state
+
+    data, _ = load_project_state()
+    t0 = time.perf_counter()
+    result = run_schedule_monte_carlo(data, n_simulations=10000, seed=7)
+    elapsed = time.perf_counter() - t0
+
+    print(f"\n{'='*50}")
+    print(f"  SCHEDULE MONTE CARLO — {result['n_simulations']:,} RUNS ({elapsed * 1000:.0f} ms)")
+    print(f"{'='*50}")
+    model = result["duration_model"]
+    print(f"  Durations: log-normal from {model['samples']} {model['source'].replace('_', ' ')}, "
+          f"median {model['median_days']} d, sigma {model['sigma']}")
+    print(f"  Open tasks: {result['open_tasks']} over {result['dag_levels']} DAG levels")
+    for key in ("p10", "p50", "p90"):
+        print(f"  {key.upper()} completion: {result['completion_date'][key][:10]}  (+{result['remaining_days'][key]} days)")
+    if "deadline_date" in result:
+        print(f"  Deadline: {result['deadline_date'][:10]}  P(on time) = {result['probability_on_time']:.1%}, "
+              f"median slip {result['slip_days']['p50']:+.1f} days")
+    print("\n  Completion distribution:")
+    for b in result["histogram"]:
+        print(f"  {b['date'][:10]}  {'█' * int(b['probability'] * 200)}")
@@ -0,0 +1,392 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.metrics import CACHE_REQUESTS
+
+# One file, mapped by every uvicorn worker on the host:
+#
+#   header   magic, layout version, slot count, data size, write head, next seq
+#   slots    open-addressed table: key digest, seq, record offset, record length
+#   data     ring of records: key digest, seq, payload length, crc32, JSON payload
+#
+# Records are appended at the write head and the head wraps to 0 when a record
+# does not fit before the end, so the oldest entries are overwritten first
+# (FIFO eviction within a fixed size). A slot is only trusted if the record it
+# points at still carries the same key, seq and checksum, so entries the ring
+# has overwritten read as misses. Readers take a shared flock, writers an
+# exclusive one; a thread lock covers threads sharing the process's descriptor.
+
+MAGIC = b"MERIDIAN"
+LAYOUT_VERSION = 2
+HEADER = struct.Struct("<8sIIQQQ")
+SLOT = struct.Struct("<16sQQQ")
+RECORD = struct.Struct("<16sQQI")
+HEADER_BYTES = 64
+PROBES = 8
+
+DEFAULT_SIZE_MB = 64
+DEFAULT_SLOTS = 4096
+# Leases are considered abandoned after this long, e.g. if their worker died
+DEFAULT_LEASE_S = 120.0
+
+
+def _code_version() -> str:
+    """
+    Digest of the application sources' sizes and mtimes. It is part of every
+    key, so entries written by a previous deploy read as misses.
+    """
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    h = hashlib.blake2b(digest_size=8)
+    for package in ("agents", "api", "core"):
+        directory = os.path.join(root, package)
+        for name in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+            if name.endswith(".py"):
+                st = os.stat(os.path.join(directory, name))
+                h.update(f"{package}/{name}:{st.st_size}:{st.st_mtime_ns};".encode("utf-8"))
+    return h.hexdigest()
+
+
+CODE_VERSION = _code_version()
+
+
+def _digest(key: tuple) -> bytes:
+    payload = json.dumps([CODE_VERSION, key], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+
+def default_path() -> str:
+    """A tmpfs path under /dev/shm when there is one, so the file never touches disk."""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, f"meridian-cache-{os.getuid()}.bin")
+
+
+class SharedCache:
+    """
+    A fixed-size JSON value cache shared by every process that maps the same
+    file. Keys are tuples, e.g. ("monte_carlo", state_version, 10000); values
+    are anything json can encode. Values larger than a quarter of the data
+    region are not stored.
+    """
+
+    def __init__(self, path: str = None, size_bytes: int = DEFAULT_SIZE_MB << 20, n_slots: int = DEFAULT_SLOTS):
+        self.path = path or default_path()
+        self.n_slots = n_slots
+        self.data_offset = HEADER_BYTES + n_slots * SLOT.size
+        self.data_size = size_bytes - self.data_offset
+        if self.data_size < 1 << 16:
+            raise ValueError("Shared cache size too small for its slot table.")
+        self.max_value_bytes = self.data_size // 4
+        self._lock = threading.Lock()
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._file = os.fdopen(fd, "r+b")
+        with self._locked(fcntl.LOCK_EX):
+            self._initialize(size_bytes)
+        self._map = mmap.mmap(self._file.fileno(), size_bytes)
+
+    @contextmanager
+    def _locked(self, mode):
+        with self._lock:
+            fcntl.flock(self._file, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+
+    def _initialize(self, size_bytes: int):
+        """Formats the file unless it already holds this layout (another worker got here first)."""
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell() == size_bytes:
+            self._file.seek(0)
+            magic, version, n_slots, data_size, _, _ = HEADER.unpack(self._file.read(HEADER.size))
+            if (magic, version, n_slots, data_size) == (MAGIC, LAYOUT_VERSION, self.n_slots, self.data_size):
+                return
+        self._file.truncate(0)
+        self._file.truncate(size_bytes)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, LAYOUT_VERSION, self.n_slots, self.data_size, 0, 1))
+        self._file.flush()
+
+    def _header(self) -> tuple:
+        return HEADER.unpack_from(self._map, 0)
+
+    def _slot_positions(self, digest: bytes):
+        start = int.from_bytes(digest[:8], "little") % self.n_slots
+        return [HEADER_BYTES + ((start + i) % self.n_slots) * SLOT.size for i in range(PROBES)]
+
+    def _read_slot(self, pos: int, digest: bytes):
+        """The payload a slot points at, if the slot is for `digest` and its record is intact."""
+        key, seq, offset, length = SLOT.unpack_from(self._map, pos)
+        if key != digest or seq == 0:
+            return None
+        if offset + RECORD.size + length > self.data_size:
+            return None
+        start = self.data_offset + offset
+        r_key, r_seq, r_length, crc = RECORD.unpack_from(self._map, start)
+        if (r_key, r_seq, r_length) != (digest, seq, length):
+            return None
+        payload = self._map[start + RECORD.size:start + RECORD.size + length]
+        return payload if zlib.crc32(payload) == crc else None
+
+    def _get_locked(self, digest: bytes):
+        for pos in self._slot_positions(digest):
+            payload = self._read_slot(pos, digest)
+            if payload is not None:
+                return payload
+        return None
+
+    def _put_locked(self, digest: bytes, payload: bytes):
+        magic, version, n_slots, data_size, head, seq = self._header()
+        record_bytes = RECORD.size + len(payload)
+        if head + record_bytes > data_size:
+            head = 0
+        start = self.data_offset + head
+        self._map[start:start + RECORD.size] = RECORD.pack(digest, seq, len(payload), zlib.crc32(payload))
+        self._map[start + RECORD.size:start + record_bytes] = payload
+
+        # Same key, else a free or overwritten slot, else the oldest in the probe window
+        positions = self._slot_positions(digest)
+        target = None
+        for pos in positions:
+            key, slot_seq, _, _ = SLOT.unpack_from(self._map, pos)
+            if key == digest:
+                target = pos
+                break
+            if target is None and (slot_seq == 0 or self._read_slot(pos, key) is None):
+                target = pos
+        if target is None:
+            target = min(positions, key=lambda pos: SLOT.unpack_from(self._map, pos)[1])
+        SLOT.pack_into(self._map, target, digest, seq, head, len(payload))
+        HEADER.pack_into(self._map, 0, magic, version, n_slots, data_size, head + record_bytes, seq + 1)
+
+    def get(self, key: tuple):
+        digest = _digest(key)
+        with self._locked(fcntl.LOCK_SH):
+            payload = self._get_locked(digest)
+        return None if payload is None else json.loads(payload)
+
+    def put(self, key: tuple, value) -> bool:
+        """Stores `value` under `key`; False if it is too large or not JSON, and so was not shared."""
+        try:
+            payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError):
+            return False
+        if len(payload) > self.max_value_bytes:
+            return False
+        with self._locked(fcntl.LOCK_EX):
+            self._put_locked(_digest(key), payload)
+        return True
+
+    def claim(self, key: tuple, lease_s: float = DEFAULT_LEASE_S):
+        """
+        Takes the lease to compute `key` unless anyone holds a live one, so one
+        caller computes an entry while the others wait for it. Returns the
+        lease's owner token, or None if it is taken.
+        """
+        digest = _digest(("lease",) + tuple(key))
+        owner = f"{os.getpid()}:{os.urandom(8).hex()}"
+        now = time.time()
+        with self._locked(fcntl.LOCK_EX):
+            payload = self._get_locked(digest)
+            if payload is not None and json.loads(payload)["expires"] > now:
+                return None
+            self._put_locked(digest, json.dumps({"owner": owner, "expires": now + lease_s}).encode("utf-8"))
+        return owner
+
+    def release(self, key: tuple, owner: str):
+        """Ends the lease `owner` took, unless it expired and someone else has claimed it since."""
+        digest = _digest(("lease",) + tuple(key))
+        with self._locked(fcntl.LOCK_EX):
+            payload = self._get_locked(digest)
+            if payload is not None and json.loads(payload)["owner"] == owner:
+                self._put_locked(digest, json.dumps({"owner": owner, "expires": 0}).encode("utf-8"))
+
+    def leased(self, key: tuple) -> bool:
+        with self._locked(fcntl.LOCK_SH):
+            payload = self._get_locked(_digest(("lease",) + tuple(key)))
+        return payload is not None and json.loads(payload)["expires"] > time.time()
+
+    def stats(self) -> dict:
+        with self._locked(fcntl.LOCK_SH):
+            _, _, n_slots, data_size, head, seq = self._header()
+            used = sum(1 for i in range(n_slots) if SLOT.unpack_from(self._map, HEADER_BYTES + i * SLOT.size)[1])
+        return {"path": self.path, "slots": n_slots, "slots_used": used, "data_bytes": data_size,
+                "write_head": head, "writes": seq - 1}
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+# (pid, SharedCache) for this process: a forked worker opens its own descriptor and mapping
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_cache():
+    """
+    This process's handle on the shared cache, or None when disabled
+    (MERIDIAN_SHARED_CACHE=off) or unavailable. MERIDIAN_SHARED_CACHE_PATH
+    and MERIDIAN_SHARED_CACHE_MB set the file and its size.
+    """
+    global _shared
+    if os.getenv("MERIDIAN_SHARED_CACHE", "on") == "off":
+        return None
+    pid = os.getpid()
+    if _shared is not None and _shared[0] == pid:
+        return _shared[1]
+    with _shared_lock:
+        if _shared is None or _shared[0] != pid:
+            try:
+                cache = SharedCache(os.getenv("MERIDIAN_SHARED_CACHE_PATH") or None,
+                                    int(float(os.getenv("MERIDIAN_SHARED_CACHE_MB", DEFAULT_SIZE_MB)) * (1 << 20)))
+            except (OSError, ValueError) as e:
+                print(f"Meridian shared cache unavailable: {e}")
+                cache = None
+            _shared = (pid, cache)
+    return _shared[1]
+
+
+# Digest -> Future of each computation this process is running, so concurrent
+# threads and tasks asking for the same key wait on one computation instead of
+# each taking the (cross-process) lease path
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _lookup(cache, key: tuple):
+    value = cache.get(key)
+    CACHE_REQUESTS.inc(cache=f"shared_{key[0]}", result="hit" if value is not None else "miss")
+    return value
+
+
+def _join(key: tuple):
+    """(future, leading): the in-process computation of `key`, and whether this caller must run it."""
+    digest = _digest(key)
+    with _inflight_lock:
+        future = _inflight.get(digest)
+        if future is not None:
+            return future, False
+        future = _inflight[digest] = Future()
+        return future, True
+
+
+def _settle(key: tuple, future: Future, value=None, error: BaseException = None):
+    with _inflight_lock:
+        _inflight.pop(_digest(key), None)
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(value)
+
+
+def _compute_leased(cache: SharedCache, key: tuple, compute, lease_s: float):
+    """
+    compute() under the cross-process lease: waits (up to the lease) while
+    another process holds it, returning that process's value once stored.
+    """
+    owner = cache.claim(key, lease_s)
+    deadline = time.time() + lease_s
+    while owner is None and time.time() < deadline:
+        time.sleep(0.05)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        owner = cache.claim(key, lease_s)
+    try:
+        value = compute()
+        cache.put(key, value)
+        return value
+    finally:
+        if owner is not None:
+            cache.release(key, owner)
+
+
+async def _acompute_leased(cache: SharedCache, key: tuple, compute, lease_s: float):
+    """_compute_leased for a coroutine function `compute`, waiting without blocking the event loop."""
+    owner = cache.claim(key, lease_s)
+    deadline = time.time() + lease_s
+    while owner is None and time.time() < deadline:
+        await asyncio.sleep(0.05)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        owner = cache.claim(key, lease_s)
+    try:
+        value = await compute()
+        cache.put(key, value)
+        return value
+    finally:
+        if owner is not None:
+            cache.release(key, owner)
+
+
+def get_or_compute(key: tuple, compute, lease_s: float = DEFAULT_LEASE_S):
+    """
+    compute(), computed once across threads and worker processes: a value
+    another worker stored is returned as is; if another thread or worker is
+    computing it, this one waits for that result instead of repeating the work.
+    """
+    cache = shared_cache()
+    if cache is None:
+        return compute()
+    value = _lookup(cache, key)
+    if value is not None:
+        return value
+    future, leading = _join(key)
+    if not leading:
+        return future.result()
+    try:
+        value = _compute_leased(cache, key, compute, lease_s)
+    except BaseException as e:
+        _settle(key, future, error=e)
+        raise
+    _settle(key, future, value)
+    return value
+
+
+async def aget_or_compute(key: tuple, compute, lease_s: float = DEFAULT_LEASE_S):
+    """
+    get_or_compute for a coroutine function `compute`. The computation runs
+    as its own task, so a caller that is cancelled (e.g. a disconnected
+    client) does not cancel it for the others waiting on it.
+    """
+    cache = shared_cache()
+    if cache is None:
+        return await compute()
+    value = _lookup(cache, key)
+    if value is not None:
+        return value
+    future, leading = _join(key)
+    if leading:
+        task = asyncio.ensure_future(_acompute_leased(cache, key, compute, lease_s))
+
+        def settle(task):
+            if task.cancelled():
+                _settle(key, future, error=asyncio.CancelledError())
+            else:
+                _settle(key, future, task.result() if task.exception() is None else None, task.exception())
+
+        task.add_done_callback(settle)
+    return await asyncio.shield(asyncio.wrap_future(future))
+
+
+if __name__ == "__main__":
+    cache = shared_cache()
+    if cache is None:
+        print("Shared cache disabled.")
+    else:
+        for name, value in cache.stats().items():
+            print(f"  {name:<11} {value}")
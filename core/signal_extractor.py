@@ -1,5 +1,7 @@
 import datetime
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+
+from core.metrics import CACHE_REQUESTS, timed
 
 def _parse_iso(iso_str: str) -> datetime.datetime:
     """Helper to parse ISO-8601 strings and make them timezone-aware."""
@@ -16,29 +18,295 @@ def _safe_div(num: float, den: float) -> float:
     if den == 0: return 0.0
     return float(num) / float(den)
 
-def extract_signals(data: dict) -> dict:
-    simulated_now = _parse_iso(data["metadata"]["simulated_now"])
-
-    tasks = data.get("tasks", [])
-    prs = data.get("pull_requests", [])
-    devs = data.get("developers", [])
-    threads = data.get("messages", [])
-    sprints = data.get("sprints", [])
-
-    total_tasks = len(tasks)
-    active_tasks = [t for t in tasks if t["status"] != "done"]
-    total_active_tasks = len(active_tasks)
-    
-    # ---- Dependency Signals ----
-    
-    # 1. blocked_task_ratio
-    blocked_count = sum(1 for t in active_tasks if t["status"] == "blocked")
-    val_blocked = _safe_div(blocked_count, total_active_tasks)
-    score_blocked = _limit(val_blocked / 0.40)
-
-    # 2. critical_path_depth
-    adj = {t["task_id"]: t["depends_on"] for t in tasks}
-    
+SIGNAL_NAMES = (
+    "blocked_task_ratio",
+    "critical_path_depth",
+    "dependency_centrality_max",
+    "overloaded_dev_ratio",
+    "task_concentration_index",
+    "unassigned_task_ratio",
+    "mid_sprint_task_additions",
+    "scope_growth_rate",
+    "out_of_scope_pr_count",
+    "overdue_task_ratio",
+    "stale_task_ratio",
+    "avg_pr_age_days",
+    "silent_dev_ratio",
+    "unanswered_thread_ratio",
+    "escalation_keyword_count",
+)
+
+# Raw value at which each signal saturates to a score of 1.0
+SIGNAL_SCALES = {
+    "blocked_task_ratio":        0.40,
+    "critical_path_depth":       6.0,
+    "dependency_centrality_max": 5.0,
+    "overloaded_dev_ratio":      0.50,
+    "task_concentration_index":  0.40,
+    "unassigned_task_ratio":     0.30,
+    "mid_sprint_task_additions": 8.0,
+    "scope_growth_rate":         0.40,
+    "out_of_scope_pr_count":     5.0,
+    "overdue_task_ratio":        0.50,
+    "stale_task_ratio":          0.60,
+    "avg_pr_age_days":           15.0,
+    "silent_dev_ratio":          0.50,
+    "unanswered_thread_ratio":   0.40,
+    "escalation_keyword_count":  10.0,
+}
+
+def signal_entry(name: str, value) -> dict:
+    """Builds a {"value", "score"} signal entry from a raw value."""
+    return {"value": value, "score": _limit(value / SIGNAL_SCALES[name])}
+
+# ---- Signal registry ----
+#
+# Each signal declares the shared intermediates it reads; a SignalContext
+# computes an intermediate the first time any signal asks for it and keeps it,
+# so asking for a few signals only pays for the passes those signals need.
+
+class Computation:
+    """A registered signal or intermediate: `compute(ctx, **needs)`."""
+
+    def __init__(self, name: str, needs: tuple, compute):
+        self.name = name
+        self.needs = needs
+        self.compute = compute
+
+# name -> Computation building a shared intermediate
+INTERMEDIATES = {}
+# name -> Computation returning a signal's raw value
+SIGNALS = {}
+
+
+def intermediate(name: str, needs: tuple = ()):
+    """Registers an intermediate; `compute(ctx, **needs)` gets each intermediate in `needs` as a keyword."""
+    def register(fn):
+        INTERMEDIATES[name] = Computation(name, tuple(needs), fn)
+        return fn
+    return register
+
+
+def signal(name: str, needs: tuple = ()):
+    """Registers a signal; `compute(ctx, **needs)` gets each intermediate in `needs` as a keyword."""
+    def register(fn):
+        SIGNALS[name] = Computation(name, tuple(needs), fn)
+        return fn
+    return register
+
+
+def required_intermediates(names) -> set:
+    """Every intermediate that computing `names` builds."""
+    required = set()
+    pending = [n for name in names for n in SIGNALS[name].needs]
+    while pending:
+        name = pending.pop()
+        if name not in required:
+            required.add(name)
+            pending.extend(INTERMEDIATES[name].needs)
+    return required
+
+
+class SignalContext:
+    """
+    One project state with its intermediates and signal values memoized.
+    A context may be shared between threads: two threads racing on the same
+    entry both compute it and store equal values.
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.simulated_now = _parse_iso(data["metadata"]["simulated_now"])
+        self.tasks = data.get("tasks", [])
+        self.prs = data.get("pull_requests", [])
+        self.devs = data.get("developers", [])
+        self.threads = data.get("messages", [])
+        self.sprints = data.get("sprints", [])
+        self._intermediates = {}
+        self._values = {}
+        self._bundle = None
+
+    def _run(self, computation: Computation):
+        return computation.compute(self, **{n: self.intermediate(n) for n in computation.needs})
+
+    def intermediate(self, name: str):
+        if name not in self._intermediates:
+            self._intermediates[name] = self._run(INTERMEDIATES[name])
+        return self._intermediates[name]
+
+    def value(self, name: str):
+        if name not in self._values:
+            self._values[name] = self._run(SIGNALS[name])
+        return self._values[name]
+
+    def signals(self, names=None) -> dict:
+        """extract_signals() output for `names` (default: all 15)."""
+        wanted = set(SIGNAL_NAMES) if names is None else set(names)
+        unknown = wanted - SIGNALS.keys()
+        if unknown:
+            raise ValueError(f"Unknown signals: {', '.join(sorted(unknown))}")
+        if len(wanted) == len(SIGNALS):
+            self.fuse()
+        return {
+            "signals": {name: signal_entry(name, self.value(name)) for name in SIGNAL_NAMES if name in wanted},
+            "metadata": {
+                "simulated_now": self.data["metadata"]["simulated_now"],
+                "extraction_timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+            }
+        }
+
+
+    def fuse(self):
+        """
+        Computes every signal and intermediate with one pass over the tasks,
+        one over the messages and one over the PRs, parsing each timestamp at
+        most once, instead of one pass per signal. Same values as computing
+        the signals one at a time.
+        """
+        if len(self._values) == len(SIGNALS):
+            return
+        now = self.simulated_now
+        # Comparing against cutoffs is exact: `(now - ts).total_seconds() > 5 days`
+        # holds exactly when ts < now - 5 days, both being whole microseconds
+        stale_before = now - datetime.timedelta(seconds=5 * 24 * 3600)
+        recent_from = now - datetime.timedelta(seconds=72 * 3600)
+        # Python 3.11+ (render.yaml) parses a trailing "Z" itself, same result as _parse_iso
+        parse = datetime.datetime.fromisoformat
+        current_sprint = self.intermediate("current_sprint")
+        sp_start = _parse_iso(current_sprint["start_date"]) if current_sprint else None
+
+        active_tasks, blocked, unassigned, overdue, stale, mid_sprint = [], [], [], [], [], []
+        adj, open_assigned, dep_counts = {}, defaultdict(int), defaultdict(int)
+        active_dev_ids = set()
+        baseline = 0
+        for t in self.tasks:
+            adj[t["task_id"]] = t["depends_on"]
+            for dep in t["depends_on"]:
+                if dep:
+                    dep_counts[dep] += 1
+            if t["is_baseline"] == True:
+                baseline += 1
+            elif (current_sprint and t["is_baseline"] == False
+                  and t["sprint_id"] == current_sprint["sprint_id"] and parse(t["created_at"]) > sp_start):
+                mid_sprint.append(t)
+            if t["status"] == "done":
+                continue
+            active_tasks.append(t)
+            if t["status"] == "blocked":
+                blocked.append(t)
+            if t["assigned_to"]:
+                open_assigned[t["assigned_to"]] += 1
+            if t["assigned_to"] is None:
+                unassigned.append(t)
+            else:
+                active_dev_ids.add(t["assigned_to"])
+            if parse(t["due_date"]) < now:
+                overdue.append(t)
+            if parse(t["updated_at"]) < stale_before:
+                stale.append(t)
+
+        thread_counts, recent_messages = defaultdict(int), []
+        for m in self.threads:
+            thread_counts[m["thread_id"]] += 1
+            if parse(m["timestamp"]) >= recent_from:
+                recent_messages.append(m)
+
+        open_pr_ages = [(now - parse(p["created_at"])).total_seconds() / 86400 for p in self.prs if p["status"] == "open"]
+
+        self._intermediates.update({
+            "active_tasks": active_tasks,
+            "blocked_tasks": blocked,
+            "unassigned_tasks": unassigned,
+            "overdue_tasks": overdue,
+            "stale_tasks": stale,
+            "mid_sprint_tasks": mid_sprint,
+            "baseline_count": baseline,
+            "open_assigned": dict(open_assigned),
+            "active_dev_ids": active_dev_ids,
+            "graph_depths": _chain_depths(adj),
+            "dep_counts": dict(dep_counts),
+            "recent_messages": recent_messages,
+            "thread_counts": dict(thread_counts),
+            "open_pr_ages": open_pr_ages,
+        })
+        # Every signal now reads only intermediates
+        for name in SIGNAL_NAMES:
+            self.value(name)
+
+    def bundle(self) -> dict:
+        """
+        What the agents build their evidence from, as ids and counts: the
+        intermediates of a full (fused) extraction, so evidence never
+        rescans the raw state.
+        """
+        if self._bundle is None:
+            self.fuse()
+            get = self.intermediate
+            ids = lambda name: [t["task_id"] for t in get(name)]
+            overdue = get("overdue_tasks")
+            oldest = min(overdue, key=lambda t: _parse_iso(t["due_date"])) if overdue else None
+            self._bundle = {
+                "active_task_count":   len(get("active_tasks")),
+                "open_assigned":       get("open_assigned"),
+                "blocked_task_ids":    ids("blocked_tasks"),
+                "unassigned_task_ids": ids("unassigned_tasks"),
+                "overdue_task_ids":    ids("overdue_tasks"),
+                "oldest_overdue":      {"task_id": oldest["task_id"], "due_date": oldest["due_date"]} if oldest else None,
+                "stale_task_ids":      ids("stale_tasks"),
+                "open_pr_ages_days":   get("open_pr_ages"),
+                "current_sprint":      get("current_sprint"),
+                "mid_sprint_task_ids": ids("mid_sprint_tasks"),
+                "baseline_count":      get("baseline_count"),
+                "in_degree":           get("dep_counts"),
+                "longest_chain":       get("longest_chain"),
+                "silent_dev_ids":      get("silent_dev_ids"),
+                "thread_sizes":        get("thread_counts"),
+            }
+        return self._bundle
+
+
+# ---- Shared intermediates ----
+
+@intermediate("active_tasks")
+def _active_tasks(ctx):
+    return [t for t in ctx.tasks if t["status"] != "done"]
+
+@intermediate("blocked_tasks", needs=("active_tasks",))
+def _blocked_tasks(ctx, active_tasks):
+    return [t for t in active_tasks if t["status"] == "blocked"]
+
+@intermediate("unassigned_tasks", needs=("active_tasks",))
+def _unassigned_tasks(ctx, active_tasks):
+    return [t for t in active_tasks if t["assigned_to"] is None]
+
+@intermediate("overdue_tasks", needs=("active_tasks",))
+def _overdue_tasks(ctx, active_tasks):
+    return [t for t in active_tasks if _parse_iso(t["due_date"]) < ctx.simulated_now]
+
+@intermediate("stale_tasks", needs=("active_tasks",))
+def _stale_tasks(ctx, active_tasks):
+    """Active tasks not updated for more than 5 days."""
+    return [t for t in active_tasks if (ctx.simulated_now - _parse_iso(t["updated_at"])).total_seconds() > 5 * 24 * 3600]
+
+@intermediate("open_assigned", needs=("active_tasks",))
+def _open_assigned(ctx, active_tasks):
+    """Developer -> number of active tasks assigned to them."""
+    open_assigned = defaultdict(int)
+    for t in active_tasks:
+        if t["assigned_to"]:
+            open_assigned[t["assigned_to"]] += 1
+    return dict(open_assigned)
+
+@intermediate("active_dev_ids", needs=("active_tasks",))
+def _active_dev_ids(ctx, active_tasks):
+    return {t["assigned_to"] for t in active_tasks if t["assigned_to"] is not None}
+
+@intermediate("graph_depths")
+def _graph_depths(ctx):
+    """Task -> length of the longest depends_on chain below it."""
+    return _chain_depths({t["task_id"]: t["depends_on"] for t in ctx.tasks})
+
+def _chain_depths(adj: dict) -> dict:
     def dfs_depth(node, memo):
         if node in memo: return memo[node]
         deps = adj.get(node, [])
@@ -50,168 +318,201 @@ def extract_signals(data: dict) -> dict:
             max_d = max(max_d, dfs_depth(dep, memo))
         memo[node] = 1 + max_d
         return memo[node]
-        
+
     depths = {}
     for t_id in adj.keys():
         dfs_depth(t_id, depths)
-    val_crit_path = max(depths.values()) if depths else 0
-    score_crit_path = _limit(val_crit_path / 6.0)
+    return depths
+
+@intermediate("longest_chain", needs=("graph_depths",))
+def _longest_chain(ctx, graph_depths):
+    """
+    Task ids along a longest depends_on chain, top task first: the first
+    deepest task, then at each step its first dependency one level down.
+    Its length is critical_path_depth + 1.
+    """
+    if not ctx.tasks:
+        return []
+    adj = {t["task_id"]: t["depends_on"] for t in ctx.tasks}
+    node = max(adj, key=graph_depths.get)
+    chain = [node]
+    while graph_depths[node] > 0:
+        node = next(dep for dep in adj[node] if graph_depths[dep] == graph_depths[node] - 1)
+        chain.append(node)
+    return chain
 
-    # 3. dependency_centrality_max
+@intermediate("dep_counts")
+def _dep_counts(ctx):
+    """Task -> number of tasks that depend on it."""
     dep_counts = defaultdict(int)
-    for t in tasks:
+    for t in ctx.tasks:
         for dep in t["depends_on"]:
             if dep:  # ensure it's not empty
                 dep_counts[dep] += 1
-                
-    # If tasks are listed but never depended on, they have 0
-    val_dep_centrality = max(dep_counts.values()) if dep_counts else 0
-    score_dep_centrality = _limit(val_dep_centrality / 5.0)
+    return dict(dep_counts)
 
+@intermediate("current_sprint")
+def _current_sprint(ctx):
+    for sp in ctx.sprints:
+        if _parse_iso(sp["start_date"]) <= ctx.simulated_now <= _parse_iso(sp["end_date"]):
+            return sp
+    return None
 
-    # ---- Workload Signals ----
+@intermediate("mid_sprint_tasks", needs=("current_sprint",))
+def _mid_sprint_tasks(ctx, current_sprint):
+    """Non-baseline tasks created in the current sprint after it started."""
+    if not current_sprint:
+        return []
+    sp_start = _parse_iso(current_sprint["start_date"])
+    return [
+        t for t in ctx.tasks
+        if t["sprint_id"] == current_sprint["sprint_id"]
+        and _parse_iso(t["created_at"]) > sp_start
+        and t["is_baseline"] == False
+    ]
 
-    # Calculate developer assignment mapping
-    open_assigned = defaultdict(int)
-    for t in active_tasks:
-        if t["assigned_to"]:
-            open_assigned[t["assigned_to"]] += 1
-            
-    # 4. overloaded_dev_ratio
-    overloaded_count = sum(1 for d in devs if open_assigned[d["dev_id"]] > 5)
-    total_devs = len(devs)
-    val_overload = _safe_div(overloaded_count, total_devs)
-    score_overload = _limit(val_overload / 0.50)
+@intermediate("baseline_count")
+def _baseline_count(ctx):
+    return sum(1 for t in ctx.tasks if t["is_baseline"] == True)
 
-    # 5. task_concentration_index
-    max_dev_tasks = max(open_assigned.values()) if open_assigned else 0
-    val_concentration = _safe_div(max_dev_tasks, total_active_tasks)
-    score_concentration = _limit(val_concentration / 0.40)
-
-    # 6. unassigned_task_ratio
-    unassigned_count = sum(1 for t in active_tasks if t["assigned_to"] is None)
-    val_unassigned = _safe_div(unassigned_count, total_active_tasks)
-    score_unassigned = _limit(val_unassigned / 0.30)
-
-
-    # ---- Scope Signals ----
-    
-    # 7. mid_sprint_task_additions
-    current_sprint = None
-    for sp in sprints:
-        if _parse_iso(sp["start_date"]) <= simulated_now <= _parse_iso(sp["end_date"]):
-            current_sprint = sp
-            break
-
-    mid_sprint_additions = 0
-    if current_sprint:
-        sp_start = _parse_iso(current_sprint["start_date"])
-        mid_sprint_additions = sum(
-            1 for t in tasks 
-            if t["sprint_id"] == current_sprint["sprint_id"]
-            and _parse_iso(t["created_at"]) > sp_start
-            and t["is_baseline"] == False
-        )
-    score_mid_sprint = _limit(mid_sprint_additions / 8.0)
-
-    # 8. scope_growth_rate
-    baseline_count = sum(1 for t in tasks if t["is_baseline"] == True)
-    val_scope_growth = _safe_div((total_tasks - baseline_count), baseline_count)
-    score_scope_growth = _limit(val_scope_growth / 0.40)
-
-    # 9. out_of_scope_pr_count
-    out_of_scope_prs = sum(1 for p in prs if p["task_id"] is None)
-    score_out_of_scope = _limit(out_of_scope_prs / 5.0)
-
-
-    # ---- Delay Signals ----
-    
-    # 10. overdue_task_ratio
-    overdue_count = sum(1 for t in active_tasks if _parse_iso(t["due_date"]) < simulated_now)
-    val_overdue = _safe_div(overdue_count, total_active_tasks)
-    score_overdue = _limit(val_overdue / 0.50)
-
-    # 11. stale_task_ratio
-    stale_count = sum(1 for t in active_tasks if (simulated_now - _parse_iso(t["updated_at"])).total_seconds() > 5 * 24 * 3600)
-    val_stale = _safe_div(stale_count, total_active_tasks)
-    score_stale = _limit(val_stale / 0.60)
-
-    # 12. avg_pr_age_days
-    open_prs = [p for p in prs if p["status"] == "open"]
-    if open_prs:
-        pr_ages = [(simulated_now - _parse_iso(p["created_at"])).total_seconds() / 86400 for p in open_prs]
-        avg_pr_age = sum(pr_ages) / len(pr_ages)
-    else:
-        avg_pr_age = 0.0
-    score_avg_pr_age = _limit(avg_pr_age / 15.0)
-
-
-    # ---- Comms Signals ----
-
-    # 13. silent_dev_ratio
-    active_dev_ids = {t["assigned_to"] for t in active_tasks if t["assigned_to"] is not None}
-    total_active_devs = len(active_dev_ids)
-    
-    devs_with_recent_msgs = set()
-    for m in threads:
-        if (simulated_now - _parse_iso(m["timestamp"])).total_seconds() <= 72 * 3600:
-            devs_with_recent_msgs.add(m["user_id"])
-            
-    silent_active_devs = sum(1 for d_id in active_dev_ids if d_id not in devs_with_recent_msgs)
-    val_silent_dev = _safe_div(silent_active_devs, total_active_devs)
-    score_silent_dev = _limit(val_silent_dev / 0.50)
+@intermediate("open_pr_ages")
+def _open_pr_ages(ctx):
+    """Age in days of each open PR."""
+    return [(ctx.simulated_now - _parse_iso(p["created_at"])).total_seconds() / 86400 for p in ctx.prs if p["status"] == "open"]
+
+@intermediate("recent_messages")
+def _recent_messages(ctx):
+    """Messages from the last 72 hours."""
+    return [m for m in ctx.threads if (ctx.simulated_now - _parse_iso(m["timestamp"])).total_seconds() <= 72 * 3600]
+
+@intermediate("silent_dev_ids", needs=("active_dev_ids", "recent_messages"))
+def _silent_dev_ids(ctx, active_dev_ids, recent_messages):
+    """Developers with active tasks and no message in the last 72 hours, sorted."""
+    devs_with_recent_msgs = {m["user_id"] for m in recent_messages}
+    return sorted(d_id for d_id in active_dev_ids if d_id not in devs_with_recent_msgs)
 
-    # 14. unanswered_thread_ratio
+@intermediate("thread_counts")
+def _thread_counts(ctx):
     thread_msg_counts = defaultdict(int)
-    for m in threads:
+    for m in ctx.threads:
         thread_msg_counts[m["thread_id"]] += 1
-        
-    unanswered_threads = sum(1 for c in thread_msg_counts.values() if c == 1)
-    total_threads = len(thread_msg_counts)
-    val_unanswered = _safe_div(unanswered_threads, total_threads)
-    score_unanswered = _limit(val_unanswered / 0.40)
-
-    # 15. escalation_keyword_count
-    escalations = sum(
-        1 for m in threads 
-        if m["contains_trigger_word"] == True 
-        and (simulated_now - _parse_iso(m["timestamp"])).total_seconds() <= 72 * 3600
-    )
-    score_escalation = _limit(escalations / 10.0)
-
-
-    # Wrap up Output Structure
-    signals_dict = {
-        "blocked_task_ratio":         {"value": val_blocked,           "score": score_blocked},
-        "critical_path_depth":        {"value": val_crit_path,         "score": score_crit_path},
-        "dependency_centrality_max":  {"value": val_dep_centrality,    "score": score_dep_centrality},
-        "overloaded_dev_ratio":       {"value": val_overload,          "score": score_overload},
-        "task_concentration_index":   {"value": val_concentration,     "score": score_concentration},
-        "unassigned_task_ratio":      {"value": val_unassigned,        "score": score_unassigned},
-        "mid_sprint_task_additions":  {"value": mid_sprint_additions,  "score": score_mid_sprint},
-        "scope_growth_rate":          {"value": val_scope_growth,      "score": score_scope_growth},
-        "out_of_scope_pr_count":      {"value": out_of_scope_prs,      "score": score_out_of_scope},
-        "overdue_task_ratio":         {"value": val_overdue,           "score": score_overdue},
-        "stale_task_ratio":           {"value": val_stale,             "score": score_stale},
-        "avg_pr_age_days":            {"value": avg_pr_age,            "score": score_avg_pr_age},
-        "silent_dev_ratio":           {"value": val_silent_dev,        "score": score_silent_dev},
-        "unanswered_thread_ratio":    {"value": val_unanswered,        "score": score_unanswered},
-        "escalation_keyword_count":   {"value": escalations,           "score": score_escalation},
-    }
-
-    return {
-        "signals": signals_dict,
-        "metadata": {
-            "simulated_now": data["metadata"]["simulated_now"],
-            "extraction_timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
-        }
-    }
+    return dict(thread_msg_counts)
+
+
+# ---- Dependency Signals ----
+
+@signal("blocked_task_ratio", needs=("active_tasks", "blocked_tasks"))
+def _blocked_task_ratio(ctx, active_tasks, blocked_tasks):
+    return _safe_div(len(blocked_tasks), len(active_tasks))
+
+@signal("critical_path_depth", needs=("graph_depths",))
+def _critical_path_depth(ctx, graph_depths):
+    return max(graph_depths.values()) if graph_depths else 0
+
+@signal("dependency_centrality_max", needs=("dep_counts",))
+def _dependency_centrality_max(ctx, dep_counts):
+    # Tasks that are never depended on count as 0
+    return max(dep_counts.values()) if dep_counts else 0
+
+
+# ---- Workload Signals ----
+
+@signal("overloaded_dev_ratio", needs=("open_assigned",))
+def _overloaded_dev_ratio(ctx, open_assigned):
+    overloaded_count = sum(1 for d in ctx.devs if open_assigned.get(d["dev_id"], 0) > 5)
+    return _safe_div(overloaded_count, len(ctx.devs))
+
+@signal("task_concentration_index", needs=("active_tasks", "open_assigned"))
+def _task_concentration_index(ctx, active_tasks, open_assigned):
+    max_dev_tasks = max(open_assigned.values()) if open_assigned else 0
+    return _safe_div(max_dev_tasks, len(active_tasks))
+
+@signal("unassigned_task_ratio", needs=("active_tasks", "unassigned_tasks"))
+def _unassigned_task_ratio(ctx, active_tasks, unassigned_tasks):
+    return _safe_div(len(unassigned_tasks), len(active_tasks))
+
+
+# ---- Scope Signals ----
+
+@signal("mid_sprint_task_additions", needs=("mid_sprint_tasks",))
+def _mid_sprint_task_additions(ctx, mid_sprint_tasks):
+    return len(mid_sprint_tasks)
+
+@signal("scope_growth_rate", needs=("baseline_count",))
+def _scope_growth_rate(ctx, baseline_count):
+    return _safe_div((len(ctx.tasks) - baseline_count), baseline_count)
+
+@signal("out_of_scope_pr_count")
+def _out_of_scope_pr_count(ctx):
+    return sum(1 for p in ctx.prs if p["task_id"] is None)
+
+
+# ---- Delay Signals ----
+
+@signal("overdue_task_ratio", needs=("active_tasks", "overdue_tasks"))
+def _overdue_task_ratio(ctx, active_tasks, overdue_tasks):
+    return _safe_div(len(overdue_tasks), len(active_tasks))
+
+@signal("stale_task_ratio", needs=("active_tasks", "stale_tasks"))
+def _stale_task_ratio(ctx, active_tasks, stale_tasks):
+    return _safe_div(len(stale_tasks), len(active_tasks))
+
+@signal("avg_pr_age_days", needs=("open_pr_ages",))
+def _avg_pr_age_days(ctx, open_pr_ages):
+    return sum(open_pr_ages) / len(open_pr_ages) if open_pr_ages else 0.0
+
+
+# ---- Comms Signals ----
+
+@signal("silent_dev_ratio", needs=("active_dev_ids", "silent_dev_ids"))
+def _silent_dev_ratio(ctx, active_dev_ids, silent_dev_ids):
+    return _safe_div(len(silent_dev_ids), len(active_dev_ids))
+
+@signal("unanswered_thread_ratio", needs=("thread_counts",))
+def _unanswered_thread_ratio(ctx, thread_counts):
+    unanswered_threads = sum(1 for c in thread_counts.values() if c == 1)
+    return _safe_div(unanswered_threads, len(thread_counts))
+
+@signal("escalation_keyword_count", needs=("recent_messages",))
+def _escalation_keyword_count(ctx, recent_messages):
+    return sum(1 for m in recent_messages if m["contains_trigger_word"] == True)
+
+
+# state_version -> SignalContext, so repeated queries against one state share intermediates
+_context_cache = OrderedDict()
+CONTEXT_CACHE_SIZE = 8
+
+
+def signal_context(data: dict, state_version: str = None) -> SignalContext:
+    """SignalContext for a state, cached per state version."""
+    if state_version is not None:
+        cached = _context_cache.get(state_version)
+        if cached is not None:
+            CACHE_REQUESTS.inc(cache="signal_context", result="hit")
+            _context_cache.move_to_end(state_version)
+            return cached
+        CACHE_REQUESTS.inc(cache="signal_context", result="miss")
+
+    ctx = SignalContext(data)
+
+    if state_version is not None:
+        _context_cache[state_version] = ctx
+        while len(_context_cache) > CONTEXT_CACHE_SIZE:
+            _context_cache.popitem(last=False)
+    return ctx
+
+
+@timed("extract_signals")
+def extract_signals(data: dict, names=None) -> dict:
+    """
+    Computes the 15 normalised signals. When `names` is given only those
+    signals (and the intermediates they need) are computed and returned.
+    """
+    return SignalContext(data).signals(names)
 
 if __name__ == "__main__":
-    import json
-    with open("data/unified_project_state.json") as f:
-        data = json.load(f)
-    result = extract_signals(data)
+    from core.state_loader import load_project_signals
+    result, _ = load_project_signals()
     for name, sig in result["signals"].items():
         bar = "█" * int(sig["score"] * 20)
         
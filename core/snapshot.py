@@ -0,0 +1,350 @@
+import datetime
+import json
+import os
+import shutil
+import sys
+import threading
+from array import array
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.signal_extractor import SIGNAL_NAMES, signal_entry, _parse_iso, _safe_div
+from core.stream_loader import SignalAccumulator, iter_state_records
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot"
+MANIFEST_FILE = "manifest.json"
+VOCAB_FILE = "vocab.json"
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+STALE_US = 5 * 24 * 3600 * 10**6
+RECENT_US = 72 * 3600 * 10**6
+
+# is_baseline is compared with == True / == False, so non-boolean values get their own code
+BASELINE_FALSE, BASELINE_TRUE, BASELINE_OTHER = 0, 1, 2
+
+# column name -> array typecode used while converting
+COLUMNS = {
+    "tasks.status":          "b",
+    "tasks.assignee":        "i",
+    "tasks.sprint":          "i",
+    "tasks.baseline":        "b",
+    "tasks.created_us":      "q",
+    "tasks.updated_us":      "q",
+    "tasks.due_us":          "q",
+    "prs.task_null":         "b",
+    "prs.open":              "b",
+    "prs.created_us":        "q",
+    "messages.thread":       "i",
+    "messages.user":         "i",
+    "messages.timestamp_us": "q",
+    "messages.trigger":      "b",
+    "developers.person":     "i",
+}
+
+
+def _to_us(iso_str: str) -> int:
+    """Microseconds since the epoch; exact, so comparisons match datetime comparisons."""
+    dt = _parse_iso(iso_str)
+    if dt.tzinfo is None:
+        raise ValueError(f"Timestamp without a timezone: {iso_str!r}")
+    return (dt - EPOCH) // ONE_MICROSECOND
+
+
+class _Vocabulary:
+    """Interns JSON scalars (ids, names, None) to dense ints."""
+
+    def __init__(self):
+        self.index = {}
+
+    def __call__(self, value) -> int:
+        idx = self.index.get(value)
+        if idx is None:
+            idx = self.index[value] = len(self.index)
+        return idx
+
+    def values(self) -> list:
+        return list(self.index)
+
+
+def snapshot_path_for(state_path) -> str:
+    """Default snapshot location: next to the JSON, e.g. unified_project_state.snapshot/."""
+    return os.path.splitext(str(state_path))[0] + SNAPSHOT_SUFFIX
+
+
+def convert_state(state_path, snapshot_path) -> dict:
+    """
+    Converts a JSON project state into a snapshot directory of raw .npy
+    columns plus a manifest. The JSON is streamed, so only the columns are
+    ever held in memory. The directory is written next to its final location
+    and renamed into place, so readers never see a half-written snapshot.
+    """
+    from core.state_loader import state_version
+
+    source_version = state_version(state_path)
+    columns = {name: array(code) for name, code in COLUMNS.items()}
+    statuses, people, sprint_ids, threads = _Vocabulary(), _Vocabulary(), _Vocabulary(), _Vocabulary()
+    accumulator = SignalAccumulator()
+    metadata, sprints = None, []
+
+    # People are interned with None kept out of the vocabulary (-1), as "unassigned" / "no user"
+    person = lambda value: -1 if value is None else people(value)
+
+    for section, record in iter_state_records(state_path):
+        if section == "metadata":
+            metadata = record
+        elif section == "sprints":
+            sprints.append(record)
+        elif section == "developers":
+            columns["developers.person"].append(person(record["dev_id"]))
+        elif section == "tasks":
+            b = record["is_baseline"]
+            columns["tasks.status"].append(statuses(record["status"]))
+            columns["tasks.assignee"].append(person(record["assigned_to"]))
+            columns["tasks.sprint"].append(sprint_ids(record["sprint_id"]))
+            columns["tasks.baseline"].append(BASELINE_TRUE if b == True else BASELINE_FALSE if b == False else BASELINE_OTHER)
+            columns["tasks.created_us"].append(_to_us(record["created_at"]))
+            columns["tasks.updated_us"].append(_to_us(record["updated_at"]))
+            columns["tasks.due_us"].append(_to_us(record["due_date"]))
+        elif section == "pull_requests":
+            columns["prs.task_null"].append(record["task_id"] is None)
+            columns["prs.open"].append(record["status"] == "open")
+            columns["prs.created_us"].append(_to_us(record["created_at"]))
+        elif section == "messages":
+            columns["messages.thread"].append(threads(record["thread_id"]))
+            columns["messages.user"].append(person(record["user_id"]))
+            columns["messages.timestamp_us"].append(_to_us(record["timestamp"]))
+            columns["messages.trigger"].append(record["contains_trigger_word"] == True)
+        # The accumulator owns the dependency graph (CSR + depth) and dependent counts
+        if section in ("tasks", "metadata", "sprints"):
+            accumulator.add(section, record)
+
+    if metadata is None:
+        raise ValueError("Project state has no metadata section")
+    status_list = statuses.values()
+    people_list = people.values()
+
+    # Dependency CSR indexed by interned task/dependency id, from the latest record per id
+    node_list = list(accumulator.node_ids)
+    dep_offsets = np.zeros(len(node_list) + 1, dtype=np.int64)
+    row_offsets = np.frombuffer(accumulator.edge_offsets, dtype=np.int64)
+    row_edges = np.frombuffer(accumulator.edges, dtype=np.int64)
+    rows = np.full(len(node_list), -1, dtype=np.int64)
+    for node, row in accumulator.row_of.items():
+        rows[node] = row
+    lengths = np.where(rows >= 0, row_offsets[rows + 1] - row_offsets[np.maximum(rows, 0)], 0)
+    np.cumsum(lengths, out=dep_offsets[1:])
+    dep_indices = np.concatenate(
+        [row_edges[row_offsets[r]:row_offsets[r + 1]] for r in rows if r >= 0] or [np.empty(0, dtype=np.int64)]
+    ).astype(np.int32)
+    in_degree = np.array([accumulator.dep_counts.get(node, 0) for node in node_list], dtype=np.int32)
+
+    tmp_path = f"{snapshot_path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    counts = {}
+    for name, values in columns.items():
+        arr = np.frombuffer(values, dtype=np.dtype(values.typecode)) if len(values) else np.empty(0, dtype=np.dtype(values.typecode))
+        if values.typecode == "b" and name in ("prs.task_null", "prs.open", "messages.trigger"):
+            arr = arr.astype(bool)
+        np.save(os.path.join(tmp_path, f"{name}.npy"), arr)
+        counts[name.split(".")[0]] = len(arr)
+    np.save(os.path.join(tmp_path, "deps.offsets.npy"), dep_offsets)
+    np.save(os.path.join(tmp_path, "deps.indices.npy"), dep_indices)
+    np.save(os.path.join(tmp_path, "deps.in_degree.npy"), in_degree)
+
+    with open(os.path.join(tmp_path, VOCAB_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "statuses": status_list,
+            "people": people_list,
+            "sprints": sprint_ids.values(),
+            "task_nodes": node_list,
+            "threads": threads.values(),
+        }, f)
+
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "source_path": os.path.abspath(str(state_path)),
+        "source_version": source_version,
+        "metadata": metadata,
+        "sprints": sprints,
+        "counts": counts,
+        "status_codes": {
+            "done": status_list.index("done") if "done" in status_list else -1,
+            "blocked": status_list.index("blocked") if "blocked" in status_list else -1,
+        },
+        "sprint_codes": {sid: i for i, sid in enumerate(sprint_ids.values()) if isinstance(sid, str)},
+        # Falsy assignees ("") count as assigned for unassigned/silent-dev, but not for workload
+        "falsy_people": [i for i, p in enumerate(people_list) if not p],
+        "n_threads": len(threads.index),
+        "critical_path_depth": accumulator.critical_path_depth() if accumulator.row_of else 0,
+    }
+    with open(os.path.join(tmp_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    old_path = None
+    if os.path.exists(snapshot_path):
+        old_path = f"{snapshot_path}.old-{os.getpid()}"
+        os.rename(snapshot_path, old_path)
+    os.rename(tmp_path, snapshot_path)
+    if old_path:
+        shutil.rmtree(old_path, ignore_errors=True)
+    return manifest
+
+
+class Snapshot:
+    """
+    A loaded snapshot. Columns are opened with np.load(mmap_mode="r") on first
+    access, so every process reading the same snapshot shares one page-cache
+    copy and nothing is parsed or copied up front.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(os.path.join(self.path, MANIFEST_FILE), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format: {self.manifest.get('format_version')}")
+        self._columns = {}
+        self._vocab = None
+
+    def column(self, name: str) -> np.ndarray:
+        arr = self._columns.get(name)
+        if arr is None:
+            file_path = os.path.join(self.path, f"{name}.npy")
+            # Empty arrays cannot be memory-mapped
+            arr = np.load(file_path, mmap_mode="r") if os.path.getsize(file_path) > 128 else np.load(file_path)
+            self._columns[name] = arr
+        return arr
+
+    def vocabulary(self) -> dict:
+        """Id and name tables (not needed for signals; loaded on demand)."""
+        if self._vocab is None:
+            with open(os.path.join(self.path, VOCAB_FILE), encoding="utf-8") as f:
+                self._vocab = json.load(f)
+        return self._vocab
+
+    @property
+    def source_version(self) -> str:
+        return self.manifest["source_version"]
+
+
+_snapshot_cache = {}
+_snapshot_lock = threading.Lock()
+
+
+def load_snapshot(path) -> Snapshot:
+    """Opens a snapshot once per manifest version; later calls reuse the mapped columns."""
+    path = str(path)
+    st = os.stat(os.path.join(path, MANIFEST_FILE))
+    version = (st.st_mtime_ns, st.st_ino)
+    cached = _snapshot_cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    with _snapshot_lock:
+        snapshot = Snapshot(path)
+        _snapshot_cache[path] = (version, snapshot)
+    return snapshot
+
+
+def snapshot_signals(snapshot: Snapshot) -> dict:
+    """
+    extract_signals() over a snapshot's columns, vectorised with NumPy.
+    Returns the same values, bit for bit, as extract_signals on the source JSON.
+    """
+    m = snapshot.manifest
+    col = snapshot.column
+    now_us = _to_us(m["metadata"]["simulated_now"])
+    simulated_now = _parse_iso(m["metadata"]["simulated_now"])
+
+    status = col("tasks.status")
+    assignee = col("tasks.assignee")
+    active = status != m["status_codes"]["done"]
+    total_active = int(active.sum())
+    total_tasks = len(status)
+
+    active_assignees = assignee[active]
+    assigned = active_assignees[active_assignees >= 0]
+    workload_assigned = assigned[~np.isin(assigned, m["falsy_people"])] if m["falsy_people"] else assigned
+    n_people = int(max(assignee.max(initial=-1), col("developers.person").max(initial=-1), col("messages.user").max(initial=-1))) + 1
+    open_assigned = np.bincount(workload_assigned, minlength=n_people)
+    dev_people = col("developers.person")
+    overloaded = int((open_assigned[dev_people[dev_people >= 0]] > 5).sum())
+
+    current_sprint = None
+    for sp in m["sprints"]:
+        if _parse_iso(sp["start_date"]) <= simulated_now <= _parse_iso(sp["end_date"]):
+            current_sprint = sp
+            break
+    mid_sprint = 0
+    if current_sprint is not None and current_sprint["sprint_id"] in m["sprint_codes"]:
+        mid_sprint = int((
+            (col("tasks.sprint") == m["sprint_codes"][current_sprint["sprint_id"]])
+            & (col("tasks.created_us") > _to_us(current_sprint["start_date"]))
+            & (col("tasks.baseline") == BASELINE_FALSE)
+        ).sum())
+    baseline_count = int((col("tasks.baseline") == BASELINE_TRUE).sum())
+
+    open_created = col("prs.created_us")[col("prs.open")]
+    if len(open_created):
+        # Same operations as timedelta.total_seconds() / 86400, summed left to right like sum()
+        ages = (now_us - open_created).astype(np.float64) / 1e6 / 86400
+        avg_pr_age = float(np.cumsum(ages)[-1]) / len(ages)
+    else:
+        avg_pr_age = 0.0
+
+    active_devs = np.unique(assigned)
+    recent = (now_us - col("messages.timestamp_us")) <= RECENT_US
+    recent_users = np.unique(col("messages.user")[recent])
+    silent = int((~np.isin(active_devs, recent_users)).sum())
+    thread_sizes = np.bincount(col("messages.thread"), minlength=m["n_threads"])
+
+    in_degree = col("deps.in_degree")
+    values = {
+        "blocked_task_ratio":        _safe_div(int((status[active] == m["status_codes"]["blocked"]).sum()), total_active),
+        "critical_path_depth":       m["critical_path_depth"],
+        "dependency_centrality_max": int(in_degree.max()) if (in_degree > 0).any() else 0,
+        "overloaded_dev_ratio":      _safe_div(overloaded, len(dev_people)),
+        "task_concentration_index":  _safe_div(int(open_assigned.max(initial=0)), total_active),
+        "unassigned_task_ratio":     _safe_div(int((active_assignees < 0).sum()), total_active),
+        "mid_sprint_task_additions": mid_sprint,
+        "scope_growth_rate":         _safe_div(total_tasks - baseline_count, baseline_count),
+        "out_of_scope_pr_count":     int(col("prs.task_null").sum()),
+        "overdue_task_ratio":        _safe_div(int((col("tasks.due_us")[active] < now_us).sum()), total_active),
+        "stale_task_ratio":          _safe_div(int(((now_us - col("tasks.updated_us")[active]) > STALE_US).sum()), total_active),
+        "avg_pr_age_days":           avg_pr_age,
+        "silent_dev_ratio":          _safe_div(silent, len(active_devs)),
+        "unanswered_thread_ratio":   _safe_div(int((thread_sizes == 1).sum()), int((thread_sizes > 0).sum())),
+        "escalation_keyword_count":  int((recent & col("messages.trigger")).sum()),
+    }
+    return {
+        "signals": {name: signal_entry(name, values[name]) for name in SIGNAL_NAMES},
+        "metadata": {
+            "simulated_now": m["metadata"]["simulated_now"],
+            "extraction_timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+        }
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from core.state_loader import DATA_PATH
+
+    parser = argparse.ArgumentParser(description="Convert a project state JSON file into a memory-mapped snapshot.")
+    parser.add_argument("state", nargs="?", default=str(DATA_PATH))
+    parser.add_argument("--out", default=None, help="snapshot directory (default: <state>.snapshot next to the JSON)")
+    args = parser.parse_args()
+
+    out = args.out or snapshot_path_for(args.state)
+    t0 = time.perf_counter()
+    manifest = convert_state(args.state, out)
+    print(f"✅ {out} in {time.perf_counter() - t0:.2f}s: " + " | ".join(f"{k}: {v}" for k, v in manifest["counts"].items()))
+
+    t0 = time.perf_counter()
+    result = snapshot_signals(load_snapshot(out))
+    print(f"Signals from snapshot in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    for name, sig in result["signals"].items():
+        print(f"  {name:<28} value={sig['value']:<10.4g} score={sig['score']:.2f}")
@@ -0,0 +1,485 @@
+import datetime
+import json
+import os
+import sqlite3
+import sys
+from array import array
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.metrics import timed
+from core.signal_extractor import SIGNAL_NAMES, signal_entry, _safe_div
+from core.snapshot import BASELINE_FALSE, BASELINE_OTHER, BASELINE_TRUE, RECENT_US, STALE_US, _to_us
+from core.stream_loader import STATE_SECTIONS, build_state, csr_critical_path_depth, iter_state_records
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+SCHEMA_VERSION = 1
+IMPORT_BATCH = 5000
+
+# Every record keeps its original JSON in `doc`; the other columns are derived
+# from it for indexing, with timestamps as exact epoch microseconds.
+TABLES = """
+CREATE TABLE documents (
+    name  TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE store_meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE sprints (
+    row_id    INTEGER PRIMARY KEY,
+    sprint_id TEXT,
+    start_us  INTEGER,
+    end_us    INTEGER,
+    doc       TEXT NOT NULL
+);
+CREATE TABLE developers (
+    row_id INTEGER PRIMARY KEY,
+    dev_id TEXT,
+    doc    TEXT NOT NULL
+);
+CREATE TABLE tasks (
+    row_id      INTEGER PRIMARY KEY,
+    task_id     TEXT,
+    status      TEXT,
+    assigned_to TEXT,
+    sprint_id   TEXT,
+    baseline    INTEGER NOT NULL,
+    created_us  INTEGER,
+    updated_us  INTEGER,
+    due_us      INTEGER,
+    doc         TEXT NOT NULL
+);
+CREATE TABLE task_deps (
+    task_row INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    dep      TEXT,
+    PRIMARY KEY (task_row, position)
+) WITHOUT ROWID;
+CREATE TABLE pull_requests (
+    row_id     INTEGER PRIMARY KEY,
+    pr_id      TEXT,
+    task_id    TEXT,
+    status     TEXT,
+    created_us INTEGER,
+    doc        TEXT NOT NULL
+);
+CREATE TABLE messages (
+    row_id       INTEGER PRIMARY KEY,
+    thread_id    TEXT,
+    user_id      TEXT,
+    timestamp_us INTEGER,
+    has_trigger  INTEGER NOT NULL,
+    doc          TEXT NOT NULL
+);
+"""
+
+# Built after a bulk import rather than maintained row by row during it
+INDEXES = """
+CREATE INDEX tasks_status       ON tasks (status);
+CREATE INDEX tasks_assigned_to  ON tasks (assigned_to, status);
+CREATE INDEX tasks_due_date     ON tasks (due_us, status);
+CREATE INDEX tasks_updated_at   ON tasks (updated_us, status);
+CREATE INDEX tasks_task_id      ON tasks (task_id);
+CREATE INDEX tasks_sprint       ON tasks (sprint_id, created_us, baseline);
+CREATE INDEX tasks_baseline     ON tasks (baseline);
+CREATE INDEX task_deps_dep      ON task_deps (dep);
+CREATE INDEX prs_status         ON pull_requests (status, created_us);
+CREATE INDEX prs_task_id        ON pull_requests (task_id);
+CREATE INDEX messages_thread_id ON messages (thread_id);
+CREATE INDEX messages_timestamp ON messages (timestamp_us, has_trigger);
+CREATE INDEX messages_user_time ON messages (user_id, timestamp_us);
+
+-- Per-dependency and per-thread counts, kept current by the triggers below,
+-- so centrality and unanswered threads are index lookups, not GROUP BYs.
+-- A NULL thread_id is one thread, as in extract_signals; X'00' stands in for it.
+CREATE TABLE dep_counts (
+    dep TEXT PRIMARY KEY,
+    n   INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX dep_counts_n ON dep_counts (n);
+INSERT INTO dep_counts SELECT dep, COUNT(*) FROM task_deps WHERE dep != '' GROUP BY dep;
+
+CREATE TABLE thread_counts (
+    thread_key PRIMARY KEY,
+    n          INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX thread_counts_n ON thread_counts (n);
+INSERT INTO thread_counts SELECT IFNULL(thread_id, X'00'), COUNT(*) FROM messages GROUP BY thread_id;
+
+-- graph_version changes whenever the dependency graph can have changed,
+-- so the cached critical path depth is only reused while it is still valid
+INSERT OR REPLACE INTO store_meta VALUES ('graph_version', 0);
+"""
+
+TRIGGERS = """
+CREATE TRIGGER task_deps_insert AFTER INSERT ON task_deps BEGIN
+    UPDATE store_meta SET value = value + 1 WHERE key = 'graph_version';
+    INSERT INTO dep_counts SELECT NEW.dep, 1 WHERE NEW.dep != ''
+        ON CONFLICT (dep) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER task_deps_delete AFTER DELETE ON task_deps BEGIN
+    UPDATE store_meta SET value = value + 1 WHERE key = 'graph_version';
+    UPDATE dep_counts SET n = n - 1 WHERE dep = OLD.dep;
+    DELETE FROM dep_counts WHERE dep = OLD.dep AND n = 0;
+END;
+CREATE TRIGGER tasks_insert AFTER INSERT ON tasks BEGIN
+    UPDATE store_meta SET value = value + 1 WHERE key = 'graph_version';
+END;
+CREATE TRIGGER tasks_id_change AFTER UPDATE OF task_id ON tasks BEGIN
+    UPDATE store_meta SET value = value + 1 WHERE key = 'graph_version';
+END;
+CREATE TRIGGER tasks_delete AFTER DELETE ON tasks BEGIN
+    DELETE FROM task_deps WHERE task_row = OLD.row_id;
+    UPDATE store_meta SET value = value + 1 WHERE key = 'graph_version';
+END;
+CREATE TRIGGER messages_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO thread_counts VALUES (IFNULL(NEW.thread_id, X'00'), 1)
+        ON CONFLICT (thread_key) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER messages_delete AFTER DELETE ON messages BEGIN
+    UPDATE thread_counts SET n = n - 1 WHERE thread_key = IFNULL(OLD.thread_id, X'00');
+    DELETE FROM thread_counts WHERE thread_key = IFNULL(OLD.thread_id, X'00') AND n = 0;
+END;
+CREATE TRIGGER messages_thread_change AFTER UPDATE OF thread_id ON messages BEGIN
+    UPDATE thread_counts SET n = n - 1 WHERE thread_key = IFNULL(OLD.thread_id, X'00');
+    DELETE FROM thread_counts WHERE thread_key = IFNULL(OLD.thread_id, X'00') AND n = 0;
+    INSERT INTO thread_counts VALUES (IFNULL(NEW.thread_id, X'00'), 1)
+        ON CONFLICT (thread_key) DO UPDATE SET n = n + 1;
+END;
+"""
+
+
+def is_sqlite_path(path) -> bool:
+    return str(path).lower().endswith(SQLITE_SUFFIXES)
+
+
+def connect(db_path, readonly: bool = False) -> sqlite3.Connection:
+    """
+    Opens a store. WAL journaling lets any number of readers (threads or
+    processes) query while a single writer applies updates.
+    """
+    if readonly:
+        conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True, timeout=30)
+    else:
+        conn = sqlite3.connect(str(db_path), timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            _create_tables(conn)
+            _finish_schema(conn)
+    return conn
+
+
+def _create_tables(conn):
+    # WAL mode is persistent in the file, so it is set once here
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(TABLES)
+
+
+def _finish_schema(conn):
+    conn.executescript(f"BEGIN; {INDEXES} {TRIGGERS} PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;")
+
+
+def store_version(db_path) -> str:
+    """Like state_version: changes whenever the database or its WAL is written."""
+    parts = []
+    for suffix in ("", "-wal"):
+        try:
+            st = os.stat(f"{db_path}{suffix}")
+        except FileNotFoundError:
+            continue
+        parts.append(f"{st.st_mtime_ns:x}-{st.st_size:x}")
+    if not parts:
+        raise FileNotFoundError(db_path)
+    return "-".join(parts)
+
+
+# ---- Writing ----
+
+def _dumps(record) -> str:
+    return json.dumps(record, separators=(",", ":"))
+
+
+def _baseline_code(value) -> int:
+    return BASELINE_TRUE if value == True else BASELINE_FALSE if value == False else BASELINE_OTHER
+
+
+def _task_row(t: dict) -> tuple:
+    return (
+        t["task_id"], t["status"], t["assigned_to"], t["sprint_id"], _baseline_code(t["is_baseline"]),
+        _to_us(t["created_at"]), _to_us(t["updated_at"]), _to_us(t["due_date"]), _dumps(t),
+    )
+
+
+def _insert_tasks(conn, tasks: list):
+    first_row = conn.execute("SELECT IFNULL(MAX(row_id), 0) + 1 FROM tasks").fetchone()[0]
+    conn.executemany(
+        "INSERT INTO tasks (row_id, task_id, status, assigned_to, sprint_id, baseline, created_us, updated_us, due_us, doc) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [(first_row + i, *_task_row(t)) for i, t in enumerate(tasks)])
+    conn.executemany(
+        "INSERT INTO task_deps VALUES (?, ?, ?)",
+        [(first_row + i, pos, dep) for i, t in enumerate(tasks) for pos, dep in enumerate(t["depends_on"])])
+
+
+def insert_records(conn, section: str, records: list):
+    """Appends records to a section, leaving every other row untouched."""
+    if section == "tasks":
+        _insert_tasks(conn, records)
+    elif section == "sprints":
+        conn.executemany(
+            "INSERT INTO sprints (sprint_id, start_us, end_us, doc) VALUES (?, ?, ?, ?)",
+            [(s["sprint_id"], _to_us(s["start_date"]), _to_us(s["end_date"]), _dumps(s)) for s in records])
+    elif section == "developers":
+        conn.executemany(
+            "INSERT INTO developers (dev_id, doc) VALUES (?, ?)",
+            [(d["dev_id"], _dumps(d)) for d in records])
+    elif section == "pull_requests":
+        conn.executemany(
+            "INSERT INTO pull_requests (pr_id, task_id, status, created_us, doc) VALUES (?, ?, ?, ?, ?)",
+            [(p["pr_id"], p["task_id"], p["status"], _to_us(p["created_at"]), _dumps(p)) for p in records])
+    elif section == "messages":
+        conn.executemany(
+            "INSERT INTO messages (thread_id, user_id, timestamp_us, has_trigger, doc) VALUES (?, ?, ?, ?, ?)",
+            [(m["thread_id"], m["user_id"], _to_us(m["timestamp"]), m["contains_trigger_word"] == True, _dumps(m))
+             for m in records])
+    else:
+        raise ValueError(f"Unknown section: {section}")
+
+
+def set_document(conn, name: str, value):
+    """Stores a non-array top-level value, e.g. set_document(conn, "metadata", {...})."""
+    conn.execute("INSERT OR REPLACE INTO documents VALUES (?, ?)", (name, _dumps(value)))
+
+
+def update_task(conn, task_id: str, changes: dict) -> dict:
+    """
+    Merges `changes` into the task (its latest record, if the id repeats) and
+    rewrites that one row and, if depends_on changed, its dependency rows.
+    """
+    row = conn.execute(
+        "SELECT row_id, doc FROM tasks WHERE task_id = ? ORDER BY row_id DESC LIMIT 1", (task_id,)).fetchone()
+    if row is None:
+        raise ValueError(f"Unknown task: {task_id}")
+    row_id, doc = row
+    task = {**json.loads(doc), **changes}
+    conn.execute(
+        "UPDATE tasks SET task_id = ?, status = ?, assigned_to = ?, sprint_id = ?, baseline = ?, "
+        "created_us = ?, updated_us = ?, due_us = ?, doc = ? WHERE row_id = ?", (*_task_row(task), row_id))
+    if "depends_on" in changes:
+        conn.execute("DELETE FROM task_deps WHERE task_row = ?", (row_id,))
+        conn.executemany(
+            "INSERT INTO task_deps VALUES (?, ?, ?)",
+            [(row_id, i, dep) for i, dep in enumerate(task["depends_on"])])
+    return task
+
+
+def delete_task(conn, task_id: str) -> int:
+    """Removes every record of a task (dependency rows go with them); returns how many."""
+    return conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,)).rowcount
+
+
+def import_state(state_path, db_path) -> dict:
+    """
+    Loads a JSON project state into a new store, streaming it record by
+    record, and returns the row count per section. Indexes, count tables and
+    triggers are built once the rows are in.
+    """
+    if os.path.exists(db_path):
+        raise ValueError(f"{db_path} already exists")
+    conn = sqlite3.connect(str(db_path))
+    _create_tables(conn)
+    counts = {}
+    batch, batch_section = [], None
+    try:
+        with conn:
+            for section, record in iter_state_records(state_path):
+                if section != batch_section or len(batch) >= IMPORT_BATCH:
+                    if batch:
+                        insert_records(conn, batch_section, batch)
+                    batch, batch_section = [], section
+                if section in STATE_SECTIONS:
+                    batch.append(record)
+                    counts[section] = counts.get(section, 0) + 1
+                else:
+                    set_document(conn, section, record)
+            if batch:
+                insert_records(conn, batch_section, batch)
+        _finish_schema(conn)
+        conn.execute("ANALYZE")
+        _critical_path_depth(conn)
+    finally:
+        conn.close()
+    return counts
+
+
+def export_state(conn) -> dict:
+    """Rebuilds the state dict, for consumers that need whole records (the agents)."""
+    def records():
+        for name, value in conn.execute("SELECT name, value FROM documents"):
+            yield name, json.loads(value)
+        for section in STATE_SECTIONS:
+            for (doc,) in conn.execute(f"SELECT doc FROM {section} ORDER BY row_id"):
+                yield section, json.loads(doc)
+    return build_state(records())
+
+
+# ---- Signals ----
+
+def _scalar(conn, sql: str, params=()):
+    return conn.execute(sql, params).fetchone()[0]
+
+
+def _critical_path_depth(conn) -> int:
+    graph_version = _scalar(conn, "SELECT value FROM store_meta WHERE key = 'graph_version'")
+    cached = conn.execute(
+        "SELECT value FROM store_meta WHERE key = 'critical_path_depth' "
+        "AND (SELECT value FROM store_meta WHERE key = 'critical_path_version') = ?", (graph_version,)).fetchone()
+    if cached is not None:
+        return cached[0]
+
+    # The latest record per task_id defines its adjacency, as the {task_id: depends_on} dict does
+    node_ids, row_of = {}, {}
+    offsets, edges = array("q", [0]), array("q")
+    node = lambda task_id: node_ids.setdefault(task_id, len(node_ids))
+    rows = conn.execute(
+        "SELECT t.row_id, t.task_id, d.position, d.dep FROM tasks t LEFT JOIN task_deps d ON d.task_row = t.row_id "
+        "WHERE t.row_id IN (SELECT MAX(row_id) FROM tasks GROUP BY task_id) ORDER BY t.row_id, d.position")
+    current = None
+    for row_id, task_id, position, dep in rows:
+        if row_id != current:
+            if current is not None:
+                offsets.append(len(edges))
+            current = row_id
+            row_of[node(task_id)] = len(offsets) - 1
+        if position is not None:
+            edges.append(node(dep))
+    if current is None:
+        return 0
+    offsets.append(len(edges))
+    depth = csr_critical_path_depth(len(node_ids), offsets, edges, row_of)
+
+    if not conn.in_transaction:
+        try:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO store_meta VALUES (?, ?)",
+                                 [("critical_path_depth", depth), ("critical_path_version", graph_version)])
+        except sqlite3.OperationalError:
+            pass  # read-only connection or a busy writer: recomputed next time
+    return depth
+
+
+@timed("sql_signals")
+def sql_signals(conn, names=None) -> dict:
+    """
+    extract_signals() as indexed aggregate queries: each signal reads an
+    index range or a GROUP BY over one, never the record documents. Returns
+    the same values as extract_signals on the exported state. `names`
+    restricts the computation to a subset of signals.
+    """
+    want = (lambda name: True) if names is None else set(names).__contains__
+    metadata = json.loads(_scalar(conn, "SELECT value FROM documents WHERE name = 'metadata'"))
+    now_us = _to_us(metadata["simulated_now"])
+    values = {}
+
+    total_tasks = _scalar(conn, "SELECT COUNT(*) FROM tasks")
+    total_active = total_tasks - _scalar(conn, "SELECT COUNT(*) FROM tasks WHERE status = 'done'")
+    active = "status IS NOT 'done'"
+
+    if want("blocked_task_ratio"):
+        values["blocked_task_ratio"] = _safe_div(
+            _scalar(conn, "SELECT COUNT(*) FROM tasks WHERE status = 'blocked'"), total_active)
+    if want("critical_path_depth"):
+        values["critical_path_depth"] = _critical_path_depth(conn)
+    if want("dependency_centrality_max"):
+        values["dependency_centrality_max"] = _scalar(conn, "SELECT IFNULL(MAX(n), 0) FROM dep_counts")
+
+    workload = f"SELECT assigned_to, COUNT(*) AS n FROM tasks WHERE assigned_to != '' AND {active} GROUP BY assigned_to"
+    if want("overloaded_dev_ratio"):
+        overloaded = _scalar(
+            conn, f"SELECT COUNT(*) FROM developers d JOIN ({workload}) w ON w.assigned_to = d.dev_id WHERE w.n > 5")
+        values["overloaded_dev_ratio"] = _safe_div(overloaded, _scalar(conn, "SELECT COUNT(*) FROM developers"))
+    if want("task_concentration_index"):
+        values["task_concentration_index"] = _safe_div(
+            _scalar(conn, f"SELECT IFNULL(MAX(n), 0) FROM ({workload})"), total_active)
+    if want("unassigned_task_ratio"):
+        values["unassigned_task_ratio"] = _safe_div(
+            _scalar(conn, f"SELECT COUNT(*) FROM tasks WHERE assigned_to IS NULL AND {active}"), total_active)
+
+    if want("mid_sprint_task_additions"):
+        mid_sprint = 0
+        for sprint_id, start_us, end_us in conn.execute("SELECT sprint_id, start_us, end_us FROM sprints ORDER BY row_id"):
+            if start_us <= now_us <= end_us:
+                mid_sprint = _scalar(
+                    conn, "SELECT COUNT(*) FROM tasks WHERE sprint_id = ? AND created_us > ? AND baseline = ?",
+                    (sprint_id, start_us, BASELINE_FALSE))
+                break
+        values["mid_sprint_task_additions"] = mid_sprint
+    if want("scope_growth_rate"):
+        baseline_count = _scalar(conn, "SELECT COUNT(*) FROM tasks WHERE baseline = ?", (BASELINE_TRUE,))
+        values["scope_growth_rate"] = _safe_div(total_tasks - baseline_count, baseline_count)
+    if want("out_of_scope_pr_count"):
+        values["out_of_scope_pr_count"] = _scalar(conn, "SELECT COUNT(*) FROM pull_requests WHERE task_id IS NULL")
+
+    if want("overdue_task_ratio"):
+        values["overdue_task_ratio"] = _safe_div(
+            _scalar(conn, f"SELECT COUNT(*) FROM tasks WHERE due_us < ? AND {active}", (now_us,)), total_active)
+    if want("stale_task_ratio"):
+        values["stale_task_ratio"] = _safe_div(
+            _scalar(conn, f"SELECT COUNT(*) FROM tasks WHERE updated_us < ? AND {active}", (now_us - STALE_US,)),
+            total_active)
+    if want("avg_pr_age_days"):
+        # Summed in Python, in record order, so the float matches extract_signals exactly
+        # ((now - created) in microseconds) / 10**6 is exactly timedelta.total_seconds()
+        ages = [
+            (now_us - us) / 10**6 / 86400
+            for (us,) in conn.execute("SELECT created_us FROM pull_requests WHERE status = 'open' ORDER BY row_id")
+        ]
+        values["avg_pr_age_days"] = sum(ages) / len(ages) if ages else 0.0
+
+    recent = "timestamp_us >= ?"
+    cutoff = now_us - RECENT_US
+    if want("silent_dev_ratio"):
+        silent, total_active_devs = conn.execute(
+            f"SELECT IFNULL(SUM(NOT EXISTS (SELECT 1 FROM messages m WHERE m.user_id = a.assigned_to AND m.{recent})), 0), "
+            f"COUNT(*) FROM (SELECT DISTINCT assigned_to FROM tasks WHERE assigned_to IS NOT NULL AND {active}) a",
+            (cutoff,)).fetchone()
+        values["silent_dev_ratio"] = _safe_div(silent, total_active_devs)
+    if want("unanswered_thread_ratio"):
+        unanswered = _scalar(conn, "SELECT COUNT(*) FROM thread_counts WHERE n = 1")
+        total_threads = _scalar(conn, "SELECT COUNT(*) FROM thread_counts")
+        values["unanswered_thread_ratio"] = _safe_div(unanswered, total_threads)
+    if want("escalation_keyword_count"):
+        values["escalation_keyword_count"] = _scalar(
+            conn, f"SELECT COUNT(*) FROM messages WHERE {recent} AND has_trigger = 1", (cutoff,))
+
+    return {
+        "signals": {name: signal_entry(name, values[name]) for name in SIGNAL_NAMES if name in values},
+        "metadata": {
+            "simulated_now": metadata["simulated_now"],
+            "extraction_timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+        }
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from contextlib import closing
+    from core.state_loader import DATA_PATH
+
+    parser = argparse.ArgumentParser(description="Import a project state JSON file into a SQLite store.")
+    parser.add_argument("state", nargs="?", default=str(DATA_PATH))
+    parser.add_argument("--out", default=None, help="database path (default: <state>.db next to the JSON)")
+    args = parser.parse_args()
+
+    out = args.out or os.path.splitext(args.state)[0] + ".db"
+    t0 = time.perf_counter()
+    counts = import_state(args.state, out)
+    print(f"✅ {out} in {time.perf_counter() - t0:.2f}s: " + " | ".join(f"{k}: {v}" for k, v in counts.items()))
+
+    with closing(connect(out, readonly=True)) as conn:
+        t0 = time.perf_counter()
+        result = sql_signals(conn)
+        print(f"Signals from SQL in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    for name, sig in result["signals"].items():
+        print(f"  {name:<28} value={sig['value']:<10.4g} score={sig['score']:.2f}")
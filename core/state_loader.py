@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+from contextlib import closing
+from pathlib import Path
+
+from core.metrics import CACHE_REQUESTS, STAGE_SECONDS
+from core.signal_extractor import SIGNAL_NAMES, signal_context
+from core.snapshot import MANIFEST_FILE, load_snapshot, snapshot_path_for, snapshot_signals
+from core import sqlite_store
+from core.stream_loader import stream_signals
+
+# A .json state file, or a SQLite store (.db/.sqlite) built by core/sqlite_store.py
+DATA_PATH = Path(os.getenv("MERIDIAN_DATA_PATH") or Path(__file__).parent.parent / "data" / "unified_project_state.json")
+
+# path -> (version, data). Parsed states are shared read-only between requests;
+# anything that needs to change a state must go through a ScenarioOverlay.
+_state_cache = {}
+_state_lock = threading.Lock()
+
+# Files at least this large are reduced to signals by streaming rather than parsed whole
+STREAMING_MIN_BYTES = 64 << 20
+
+# path -> (version, signals) for callers that only need the 15 signals
+_signals_cache = {}
+
+
+def state_version(path=DATA_PATH) -> str:
+    """Cheap version tag for a state file: changes whenever the file is rewritten."""
+    if sqlite_store.is_sqlite_path(path):
+        return sqlite_store.store_version(path)
+    st = os.stat(path)
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def load_project_state(path=DATA_PATH) -> tuple:
+    """
+    Returns (data, version) for a project state file. The file is parsed once
+    per version; later calls return the same dict, which callers must treat
+    as immutable.
+    """
+    path = str(path)
+    version = state_version(path)
+    cached = _state_cache.get(path)
+    if cached is not None and cached[0] == version:
+        CACHE_REQUESTS.inc(cache="project_state", result="hit")
+        return cached[1], version
+
+    with _state_lock:
+        cached = _state_cache.get(path)
+        if cached is not None and cached[0] == version:
+            CACHE_REQUESTS.inc(cache="project_state", result="hit")
+            return cached[1], version
+        CACHE_REQUESTS.inc(cache="project_state", result="miss")
+        if sqlite_store.is_sqlite_path(path):
+            with STAGE_SECONDS.time(stage="load_state"), closing(sqlite_store.connect(path)) as conn:
+                data = sqlite_store.export_state(conn)
+        else:
+            with STAGE_SECONDS.time(stage="load_state"), open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        _state_cache[path] = (version, data)
+    return data, version
+
+
+def _current_snapshot(path: str, version: str):
+    """The snapshot next to `path`, if there is one and it was converted from `version`."""
+    snapshot_path = snapshot_path_for(path)
+    if not os.path.exists(os.path.join(snapshot_path, MANIFEST_FILE)):
+        return None
+    snapshot = load_snapshot(snapshot_path)
+    return snapshot if snapshot.source_version == version else None
+
+
+def load_project_signals(path=DATA_PATH) -> tuple:
+    """
+    Returns (signals, version) for a project state file. A SQLite store
+    computes them as indexed queries. For JSON, a columnar snapshot
+    converted from this exact version (core/snapshot.py) is read in place;
+    otherwise a state that is already parsed, or small enough to parse, goes
+    through a SignalContext kept per version, and a large one is streamed through a
+    SignalAccumulator, so its dict tree is never built.
+    """
+    path = str(path)
+    version = state_version(path)
+    cached = _signals_cache.get(path)
+    if cached is not None and cached[0] == version:
+        CACHE_REQUESTS.inc(cache="project_signals", result="hit")
+        return cached[1], version
+    CACHE_REQUESTS.inc(cache="project_signals", result="miss")
+
+    if sqlite_store.is_sqlite_path(path):
+        with closing(sqlite_store.connect(path)) as conn:
+            signals = sqlite_store.sql_signals(conn)
+        _signals_cache[path] = (version, signals)
+        return signals, version
+
+    snapshot = _current_snapshot(path, version)
+    parsed = _state_cache.get(path)
+    if snapshot is not None:
+        with STAGE_SECONDS.time(stage="snapshot_signals"):
+            signals = snapshot_signals(snapshot)
+    elif parsed is not None and parsed[0] == version:
+        with STAGE_SECONDS.time(stage="extract_signals"):
+            signals = signal_context(parsed[1], version).signals()
+    elif os.path.getsize(path) >= STREAMING_MIN_BYTES:
+        with STAGE_SECONDS.time(stage="stream_signals"):
+            signals = stream_signals(path)
+    else:
+        data = load_project_state(path)[0]
+        with STAGE_SECONDS.time(stage="extract_signals"):
+            signals = signal_context(data, version).signals()
+    _signals_cache[path] = (version, signals)
+    return signals, version
+
+
+def query_signals(names=None, path=DATA_PATH) -> tuple:
+    """
+    Returns (signals, version) with only the signals in `names` (default:
+    all 15), doing only the work those signals need. A SQLite store runs just
+    their queries; a JSON state is parsed once per version and computed on a
+    SignalContext kept per version, so later queries reuse the intermediates
+    earlier ones built.
+    """
+    if names is not None:
+        unknown = set(names) - set(SIGNAL_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown signals: {', '.join(sorted(unknown))}")
+    path = str(path)
+    if sqlite_store.is_sqlite_path(path):
+        version = state_version(path)
+        with closing(sqlite_store.connect(path, readonly=True)) as conn:
+            return sqlite_store.sql_signals(conn, names), version
+    data, version = load_project_state(path)
+    return signal_context(data, version).signals(names), version
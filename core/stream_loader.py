@@ -0,0 +1,393 @@
+import datetime
+import json
+import re
+from array import array
+from collections import Counter
+
+from core.signal_extractor import SIGNAL_NAMES, signal_entry, _parse_iso, _safe_div
+
+CHUNK_SIZE = 1 << 20
+STATE_SECTIONS = ("sprints", "developers", "tasks", "pull_requests", "messages")
+
+_scan_once = json.scanner.make_scanner(json.JSONDecoder())
+_skip_whitespace = re.compile(r"[ \t\n\r]*").match
+
+
+class _Reader:
+    """Buffered text reader that decodes one JSON value at a time with raw_decode."""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop the consumed prefix so the buffer stays around one record + one chunk
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _skip_whitespace(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, found {self.buf[self.pos]!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _scan_once(self.buf, self.pos)
+                # A number or literal running into the buffer edge may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except (StopIteration, json.JSONDecodeError):
+                if self.eof:
+                    raise ValueError(f"Invalid JSON value at offset {self.pos}")
+            self._fill()
+
+    def array_items(self):
+        """Elements of the array whose opening bracket was just consumed."""
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            # Fast path: a complete value followed by a separator already in the buffer
+            try:
+                value, end = _scan_once(self.buf, _skip_whitespace(self.buf, self.pos).end())
+            except (StopIteration, json.JSONDecodeError):
+                value = self.value()
+            else:
+                if end < len(self.buf):
+                    self.pos = end
+                else:
+                    value = self.value()
+            yield value
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {self.pos - 1}, found {char!r}")
+
+
+def iter_state_records(path, chunk_size: int = CHUNK_SIZE):
+    """
+    Yields (section, record) pairs from a project state file without reading
+    it whole: each element of a top-level array is decoded on its own, and
+    other top-level values (metadata) are yielded as one record. Pairs come
+    in file order, the same shape data/simulate_project.iter_project() emits.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _Reader(f, chunk_size)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            key = reader.value()
+            reader.expect(":")
+            if reader.peek() == "[":
+                reader.pos += 1
+                for record in reader.array_items():
+                    yield key, record
+            else:
+                yield key, reader.value()
+            if reader.peek() == "}":
+                return
+            reader.expect(",")
+
+
+def build_state(records) -> dict:
+    """Assembles (section, record) pairs into the usual state dict."""
+    state = {}
+    for section, record in records:
+        if section in STATE_SECTIONS:
+            state.setdefault(section, []).append(record)
+        else:
+            state[section] = record
+    return state
+
+
+def csr_critical_path_depth(n: int, offsets, edges, row_of: dict) -> int:
+    """
+    Longest depends_on chain, via an iterative post-order walk of a CSR graph:
+    node -> row via row_of, row's dependencies are edges[offsets[row]:offsets[row + 1]].
+    """
+    depth = array("q", [-1]) * n
+    on_stack = bytearray(n)
+    best = 0
+    for root in range(n):
+        if depth[root] >= 0:
+            continue
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            row = row_of.get(node)
+            if row is None or offsets[row] == offsets[row + 1]:
+                depth[node] = 0
+                on_stack[node] = 0
+                stack.pop()
+                continue
+            on_stack[node] = 1
+            pending = False
+            deepest = 0
+            for i in range(offsets[row], offsets[row + 1]):
+                dep = edges[i]
+                if depth[dep] < 0:
+                    if on_stack[dep]:
+                        raise ValueError("Task dependency graph contains a cycle.")
+                    stack.append(dep)
+                    pending = True
+                elif depth[dep] > deepest:
+                    deepest = depth[dep]
+            if not pending:
+                depth[node] = 1 + deepest
+                on_stack[node] = 0
+                stack.pop()
+        best = max(best, depth[root])
+    return best
+
+
+class SignalAccumulator:
+    """
+    Folds state records into the counters behind the 15 signals, keeping
+    only per-task integers for the dependency graph and per-thread message
+    counts instead of the records themselves. finalize() returns exactly what
+    extract_signals() returns for the same state.
+
+    Task and message flags depend on metadata.simulated_now and the current
+    sprint. Records that arrive before those are known are parked in compact
+    form and folded in once they are (state files list metadata and sprints
+    first, so normally nothing is parked).
+    """
+
+    def __init__(self):
+        self.metadata = None
+        self.simulated_now = None
+        self.sprints = []
+        self.current_sprint = None
+        self._sprints_done = False
+
+        # Tasks
+        self.total_tasks = 0
+        self.total_active = 0
+        self.blocked = 0
+        self.unassigned = 0
+        self.overdue = 0
+        self.stale = 0
+        self.baseline_count = 0
+        self.mid_sprint = 0
+        self.active_assignees = Counter()
+        self.dep_counts = Counter()
+        self._pending_tasks = []
+        self._pending_mid_sprint = []
+
+        # Dependency graph: task ids interned to ints, edges in a CSR of the latest record per id
+        self.node_ids = {}
+        self.row_of = {}
+        self.edge_offsets = array("q", [0])
+        self.edges = array("q")
+
+        # Developers
+        self.dev_ids = []
+
+        # Pull requests
+        self.out_of_scope_prs = 0
+        self.open_pr_count = 0
+        self.open_pr_age_total = 0
+        self._pending_open_pr_created = []
+
+        # Messages
+        self.thread_counts = Counter()
+        self.recent_users = set()
+        self.escalations = 0
+        self._pending_messages = []
+
+    # ---- Feeding ----
+
+    def add(self, section: str, record):
+        if section != "sprints" and self.sprints and not self._sprints_done:
+            self._sprints_done = True
+            if self._no_current_sprint():
+                self._pending_mid_sprint.clear()
+        if section == "metadata":
+            self.metadata = record
+            self.simulated_now = _parse_iso(record["simulated_now"])
+            self._resolve_sprint()
+            if self._no_current_sprint():
+                self._pending_mid_sprint.clear()
+            self._flush_tasks()
+            self._flush_prs()
+            self._flush_messages()
+        elif section == "sprints":
+            self.sprints.append(record)
+            self._resolve_sprint()
+        elif section == "developers":
+            self.dev_ids.append(record["dev_id"])
+        elif section == "tasks":
+            self._add_task(record)
+        elif section == "pull_requests":
+            self._add_pr(record)
+        elif section == "messages":
+            self._add_message(record)
+
+    def feed(self, records):
+        for section, record in records:
+            self.add(section, record)
+        return self
+
+    def _resolve_sprint(self):
+        if self.simulated_now is None:
+            return
+        # Like extract_signals, the current sprint is the first listed sprint containing simulated_now
+        if self.current_sprint is None:
+            for sp in self.sprints:
+                if _parse_iso(sp["start_date"]) <= self.simulated_now <= _parse_iso(sp["end_date"]):
+                    self.current_sprint = (sp["sprint_id"], _parse_iso(sp["start_date"]))
+                    break
+            if self.current_sprint is not None:
+                self._flush_mid_sprint()
+
+    def _no_current_sprint(self) -> bool:
+        """True once it is settled that no sprint contains simulated_now."""
+        return self.current_sprint is None and self._sprints_done and self.simulated_now is not None
+
+    def _node(self, task_id) -> int:
+        idx = self.node_ids.get(task_id)
+        if idx is None:
+            idx = self.node_ids[task_id] = len(self.node_ids)
+        return idx
+
+    def _add_task(self, t: dict):
+        self.total_tasks += 1
+        self.baseline_count += t["is_baseline"] == True
+
+        deps = t["depends_on"]
+        for dep in deps:
+            if dep:
+                self.dep_counts[dep] += 1
+        # A repeated task_id replaces the earlier adjacency, as the {task_id: depends_on} dict does
+        self.row_of[self._node(t["task_id"])] = len(self.edge_offsets) - 1
+        self.edges.extend(self._node(dep) for dep in deps)
+        self.edge_offsets.append(len(self.edges))
+
+        if t["is_baseline"] == False and not self._no_current_sprint():
+            self._pending_mid_sprint.append((t["sprint_id"], t["created_at"]))
+            if self.current_sprint is not None:
+                self._flush_mid_sprint()
+
+        if t["status"] != "done":
+            # Only the fields the time-dependent flags need
+            self._pending_tasks.append((t["status"] == "blocked", t["assigned_to"], t["due_date"], t["updated_at"]))
+            if self.simulated_now is not None:
+                self._flush_tasks()
+
+    def _flush_mid_sprint(self):
+        sprint_id, sprint_start = self.current_sprint
+        for task_sprint_id, created in self._pending_mid_sprint:
+            if task_sprint_id == sprint_id and _parse_iso(created) > sprint_start:
+                self.mid_sprint += 1
+        self._pending_mid_sprint.clear()
+
+    def _flush_tasks(self):
+        now = self.simulated_now
+        for is_blocked, assignee, due, updated in self._pending_tasks:
+            self.total_active += 1
+            self.blocked += is_blocked
+            if assignee is None:
+                self.unassigned += 1
+            else:
+                self.active_assignees[assignee] += 1
+            self.overdue += _parse_iso(due) < now
+            self.stale += (now - _parse_iso(updated)).total_seconds() > 5 * 24 * 3600
+        self._pending_tasks.clear()
+
+    def _add_pr(self, p: dict):
+        self.out_of_scope_prs += p["task_id"] is None
+        if p["status"] == "open":
+            self._pending_open_pr_created.append(p["created_at"])
+            if self.simulated_now is not None:
+                self._flush_prs()
+
+    def _flush_prs(self):
+        for created in self._pending_open_pr_created:
+            self.open_pr_count += 1
+            self.open_pr_age_total += (self.simulated_now - _parse_iso(created)).total_seconds() / 86400
+        self._pending_open_pr_created.clear()
+
+    def _add_message(self, m: dict):
+        self.thread_counts[m["thread_id"]] += 1
+        if self.simulated_now is None:
+            self._pending_messages.append((m["timestamp"], m["user_id"], m["contains_trigger_word"]))
+        elif (self.simulated_now - _parse_iso(m["timestamp"])).total_seconds() <= 72 * 3600:
+            self.recent_users.add(m["user_id"])
+            self.escalations += m["contains_trigger_word"] == True
+
+    def _flush_messages(self):
+        for timestamp, user_id, trigger in self._pending_messages:
+            recent = (self.simulated_now - _parse_iso(timestamp)).total_seconds() <= 72 * 3600
+            if recent:
+                self.recent_users.add(user_id)
+                self.escalations += trigger == True
+        self._pending_messages.clear()
+
+    # ---- Results ----
+
+    def critical_path_depth(self) -> int:
+        """Longest depends_on chain over the CSR built so far."""
+        return csr_critical_path_depth(len(self.node_ids), self.edge_offsets, self.edges, self.row_of)
+
+    def finalize(self) -> dict:
+        if self.simulated_now is None:
+            raise ValueError("Project state has no metadata.simulated_now")
+        self._flush_tasks()
+        self._flush_prs()
+        self._flush_messages()
+
+        open_assigned = {dev: n for dev, n in self.active_assignees.items() if dev}
+        active_devs = self.active_assignees.keys()
+        values = {
+            "blocked_task_ratio":        _safe_div(self.blocked, self.total_active),
+            "critical_path_depth":       self.critical_path_depth() if self.row_of else 0,
+            "dependency_centrality_max": max(self.dep_counts.values()) if self.dep_counts else 0,
+            "overloaded_dev_ratio":      _safe_div(sum(1 for d in self.dev_ids if open_assigned.get(d, 0) > 5), len(self.dev_ids)),
+            "task_concentration_index":  _safe_div(max(open_assigned.values()) if open_assigned else 0, self.total_active),
+            "unassigned_task_ratio":     _safe_div(self.unassigned, self.total_active),
+            "mid_sprint_task_additions": self.mid_sprint,
+            "scope_growth_rate":         _safe_div(self.total_tasks - self.baseline_count, self.baseline_count),
+            "out_of_scope_pr_count":     self.out_of_scope_prs,
+            "overdue_task_ratio":        _safe_div(self.overdue, self.total_active),
+            "stale_task_ratio":          _safe_div(self.stale, self.total_active),
+            "avg_pr_age_days":           self.open_pr_age_total / self.open_pr_count if self.open_pr_count else 0.0,
+            "silent_dev_ratio":          _safe_div(sum(1 for d in active_devs if d not in self.recent_users), len(active_devs)),
+            "unanswered_thread_ratio":   _safe_div(sum(1 for c in self.thread_counts.values() if c == 1), len(self.thread_counts)),
+            "escalation_keyword_count":  self.escalations,
+        }
+        return {
+            "signals": {name: signal_entry(name, values[name]) for name in SIGNAL_NAMES},
+            "metadata": {
+                "simulated_now": self.metadata["simulated_now"],
+                "extraction_timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+            }
+        }
+
+
+def stream_signals(path, chunk_size: int = CHUNK_SIZE) -> dict:
+    """extract_signals() for a state file, in one streaming pass with bounded memory."""
+    return SignalAccumulator().feed(iter_state_records(path, chunk_size)).finalize()
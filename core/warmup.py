@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.metrics import STARTUP_SECONDS
+from core.monte_carlo import cached_monte_carlo
+from core.signal_extractor import signal_context
+from core.state_loader import DATA_PATH, load_project_signals, load_project_state
+from core.whatif_engine import score_baseline
+
+
+def warm_up(path=DATA_PATH) -> dict:
+    """
+    Fills the per-version caches a first request would otherwise fill on its
+    own time: the parsed state, its signals and intermediates bundle, the
+    baseline score and the Monte Carlo distribution. Returns seconds per step,
+    also reported as meridian_startup_seconds{phase="warmup_<step>"}.
+    """
+    timings = {}
+    t0 = time.perf_counter()
+
+    def step(name):
+        nonlocal t0
+        now = time.perf_counter()
+        timings[name] = now - t0
+        STARTUP_SECONDS.set(timings[name], phase=f"warmup_{name}")
+        t0 = now
+
+    data, version = load_project_state(path)
+    step("load_state")
+    context = signal_context(data, version)
+    context.signals()
+    context.bundle()
+    signals, _ = load_project_signals(path)
+    step("signals")
+    score_baseline(data, version)
+    step("score")
+    cached_monte_carlo(signals, version)
+    step("monte_carlo")
+    return timings
+
+
+async def prewarm_narratives(path=DATA_PATH):
+    """Runs the agents once so the LLM cache holds the current state's narratives."""
+    from agents import supervisor_agent
+
+    data, version = load_project_state(path)
+    t0 = time.perf_counter()
+    await supervisor_agent.run_full_analysis(data, version)
+    STARTUP_SECONDS.set(time.perf_counter() - t0, phase="warmup_narratives")
+
+
+if __name__ == "__main__":
+    timings = warm_up()
+    for name, seconds in timings.items():
+        print(f"  {name:<12} {seconds * 1000:8.1f} ms")
@@ -1,13 +1,15 @@
 import copy
 import datetime
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import sys
 import os
 
 # Ensure safe import of core modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from core.signal_extractor import extract_signals
+from core.signal_extractor import SIGNAL_NAMES, extract_signals
 from core.risk_formula import compute_risk_score
+from core.monte_carlo import run_paired_monte_carlo
+from core.metrics import CACHE_REQUESTS, timed
 
 
 def _parse_iso(iso_str: str) -> datetime.datetime:
@@ -16,99 +18,266 @@ def _parse_iso(iso_str: str) -> datetime.datetime:
     return datetime.datetime.fromisoformat(iso_str)
 
 
-def run_simulation(data: dict, mutation: dict) -> dict:
-    # 1. Deep copy the input data
-    sim_data = copy.deepcopy(data)
-    mut_type = mutation.get("type")
-    
-    # 2. Apply the mutation to the copy
-    if mut_type == "add_developers":
-        count = mutation.get("count", 0)
-        
-        # Add new devs
-        new_dev_ids = []
-        existing_devs_count = len(sim_data["developers"])
-        for i in range(count):
-            n_id = f"dev_{existing_devs_count + i + 1}_sim"
-            sim_data["developers"].append({
-                "dev_id": n_id,
-                "name": f"Simulated Dev {i+1}",
-                "role": "developer"
-            })
-            new_dev_ids.append(n_id)
-            
-        # Find exactly the most overloaded dev
-        open_assigned = defaultdict(int)
-        for t in sim_data["tasks"]:
-            if t["status"] != "done" and t["assigned_to"]:
-                open_assigned[t["assigned_to"]] += 1
-                
-        if open_assigned and new_dev_ids:
-            most_overloaded_dev = max(open_assigned, key=open_assigned.get)
-            tasks_to_reassign = count * 3
-            
-            # Reassign tasks
-            reassigned = 0
-            dev_idx = 0
-            for t in sim_data["tasks"]:
-                if reassigned >= tasks_to_reassign:
-                    break
-                if t["status"] != "done" and t["assigned_to"] == most_overloaded_dev:
-                    t["assigned_to"] = new_dev_ids[dev_idx % len(new_dev_ids)]
-                    dev_idx += 1
-                    reassigned += 1
-                    
-    elif mut_type == "extend_deadline":
-        days = mutation.get("days", 0)
-        delta = datetime.timedelta(days=days)
-        
-        for t in sim_data["tasks"]:
-            if t["status"] != "done":
-                dt = _parse_iso(t["due_date"])
-                new_dt = dt + delta
-                t["due_date"] = new_dt.isoformat().replace("+00:00", "Z")
-                
-    elif mut_type == "remove_scope":
-        task_count = mutation.get("task_count", 0)
-        
-        # Find eligible tasks
-        eligible_tasks = [
-            t for t in sim_data["tasks"] 
-            if t["is_baseline"] == False and t["status"] != "done"
-        ]
-        
-        # Select tasks to remove from the end
-        to_remove = eligible_tasks[-task_count:] if task_count < len(eligible_tasks) else eligible_tasks
-        to_remove_ids = {t["task_id"] for t in to_remove}
-        
-        # Remove them from main list
-        sim_data["tasks"] = [t for t in sim_data["tasks"] if t["task_id"] not in to_remove_ids]
-        
-        # Remove depends_on references
-        for t in sim_data["tasks"]:
-            t["depends_on"] = [dep for dep in t["depends_on"] if dep not in to_remove_ids]
-            
-    elif mut_type == "close_prs":
-        pr_count = mutation.get("pr_count", 0)
-        sim_now_str = sim_data["metadata"]["simulated_now"]
-        
-        open_prs = [p for p in sim_data["pull_requests"] if p["status"] == "open"]
-        open_prs.sort(key=lambda x: _parse_iso(x["created_at"]))
-        
-        to_close = open_prs[:pr_count]
-        to_close_ids = {p["pr_id"] for p in to_close}
-        
-        for p in sim_data["pull_requests"]:
-            if p["pr_id"] in to_close_ids:
-                p["status"] = "closed"
-                p["merged_at"] = sim_now_str
+class ScenarioOverlay:
+    """
+    Copy-on-write view over an immutable project state. Mutations record only
+    the tasks, PRs and developers they touch; everything else is shared with
+    the baseline, so a scenario costs O(size of the mutation), not O(project).
+    """
 
+    def __init__(self, base: dict):
+        self.base = base
+        self.task_patches = {}
+        self.removed_task_ids = set()
+        self.pr_patches = {}
+        self.added_developers = []
+
+    def tasks(self):
+        for t in self.base.get("tasks", []):
+            if t["task_id"] in self.removed_task_ids:
+                continue
+            yield self.task_patches.get(t["task_id"], t)
+
+    def pull_requests(self):
+        for p in self.base.get("pull_requests", []):
+            yield self.pr_patches.get(p["pr_id"], p)
+
+    def developers(self) -> list:
+        return self.base.get("developers", []) + self.added_developers
+
+    def patch_task(self, task: dict, **changes) -> dict:
+        patched = self.task_patches.get(task["task_id"])
+        if patched is None:
+            patched = dict(task)
+            self.task_patches[task["task_id"]] = patched
+        patched.update(changes)
+        return patched
+
+    def patch_pr(self, pr: dict, **changes) -> dict:
+        patched = self.pr_patches.get(pr["pr_id"])
+        if patched is None:
+            patched = dict(pr)
+            self.pr_patches[pr["pr_id"]] = patched
+        patched.update(changes)
+        return patched
+
+    def remove_tasks(self, task_ids: set):
+        self.removed_task_ids |= task_ids
+        # Drop depends_on references to removed tasks, copying only the referrers
+        for t in list(self.tasks()):
+            if any(dep in task_ids for dep in t["depends_on"]):
+                self.patch_task(t, depends_on=[dep for dep in t["depends_on"] if dep not in task_ids])
+
+    def materialize(self) -> dict:
+        """Shallow project-state dict: unchanged records are the baseline objects."""
+        view = dict(self.base)
+        if self.task_patches or self.removed_task_ids:
+            view["tasks"] = list(self.tasks())
+        if self.pr_patches:
+            view["pull_requests"] = list(self.pull_requests())
+        if self.added_developers:
+            view["developers"] = self.developers()
+        return view
+
+
+def _apply_add_developers(overlay: ScenarioOverlay, mutation: dict):
+    count = mutation.get("count", 0)
+
+    # Add new devs
+    new_dev_ids = []
+    existing_devs_count = len(overlay.developers())
+    for i in range(count):
+        n_id = f"dev_{existing_devs_count + i + 1}_sim"
+        overlay.added_developers.append({
+            "dev_id": n_id,
+            "name": f"Simulated Dev {i+1}",
+            "role": "developer"
+        })
+        new_dev_ids.append(n_id)
+
+    # Find exactly the most overloaded dev
+    open_assigned = defaultdict(int)
+    for t in overlay.tasks():
+        if t["status"] != "done" and t["assigned_to"]:
+            open_assigned[t["assigned_to"]] += 1
+
+    if open_assigned and new_dev_ids:
+        most_overloaded_dev = max(open_assigned, key=open_assigned.get)
+        tasks_to_reassign = count * 3
+
+        # Reassign tasks
+        reassigned = 0
+        dev_idx = 0
+        for t in list(overlay.tasks()):
+            if reassigned >= tasks_to_reassign:
+                break
+            if t["status"] != "done" and t["assigned_to"] == most_overloaded_dev:
+                overlay.patch_task(t, assigned_to=new_dev_ids[dev_idx % len(new_dev_ids)])
+                dev_idx += 1
+                reassigned += 1
+
+
+def _apply_extend_deadline(overlay: ScenarioOverlay, mutation: dict):
+    days = mutation.get("days", 0)
+    if not days:
+        return
+    delta = datetime.timedelta(days=days)
+
+    for t in list(overlay.tasks()):
+        if t["status"] != "done":
+            new_dt = _parse_iso(t["due_date"]) + delta
+            overlay.patch_task(t, due_date=new_dt.isoformat().replace("+00:00", "Z"))
+
+
+def _apply_remove_scope(overlay: ScenarioOverlay, mutation: dict):
+    task_count = mutation.get("task_count", 0)
+    if task_count <= 0:
+        return
+
+    # Find eligible tasks
+    eligible_tasks = [
+        t for t in overlay.tasks()
+        if t["is_baseline"] == False and t["status"] != "done"
+    ]
+
+    # Select tasks to remove from the end
+    to_remove = eligible_tasks[-task_count:] if task_count < len(eligible_tasks) else eligible_tasks
+    overlay.remove_tasks({t["task_id"] for t in to_remove})
+
+
+def _apply_close_prs(overlay: ScenarioOverlay, mutation: dict):
+    pr_count = mutation.get("pr_count", 0)
+    if pr_count <= 0:
+        return
+    sim_now_str = overlay.base["metadata"]["simulated_now"]
+
+    open_prs = [p for p in overlay.pull_requests() if p["status"] == "open"]
+    open_prs.sort(key=lambda x: _parse_iso(x["created_at"]))
+
+    for p in open_prs[:pr_count]:
+        overlay.patch_pr(p, status="closed", merged_at=sim_now_str)
+
+
+MUTATION_HANDLERS = {
+    "add_developers":  _apply_add_developers,
+    "extend_deadline": _apply_extend_deadline,
+    "remove_scope":    _apply_remove_scope,
+    "close_prs":       _apply_close_prs,
+}
+
+
+# Amount parameter carried by each mutation type
+MUTATION_PARAMS = {
+    "add_developers":  "count",
+    "extend_deadline": "days",
+    "remove_scope":    "task_count",
+    "close_prs":       "pr_count",
+}
+
+# Order in which a combined plan is applied: scope is cut before work is
+# redistributed, so new developers never pick up tasks that are then removed
+COMBINED_MUTATION_ORDER = ("remove_scope", "add_developers", "extend_deadline", "close_prs")
+
+
+# Signals each mutation type can change; every other signal keeps its baseline value
+MUTATION_SIGNALS = {
+    # Reassignment moves open tasks onto new developers, who have no recent messages
+    "add_developers":  ("overloaded_dev_ratio", "task_concentration_index", "silent_dev_ratio"),
+    "extend_deadline": ("overdue_task_ratio",),
+    "close_prs":       ("avg_pr_age_days",),
+    # Removing tasks shifts every task-derived count and the dependency graph
+    "remove_scope": tuple(
+        name for name in SIGNAL_NAMES
+        if name not in ("out_of_scope_pr_count", "avg_pr_age_days",
+                        "unanswered_thread_ratio", "escalation_keyword_count")
+    ),
+}
+
+
+def affected_signals(mutations: list) -> set:
+    names = set()
+    for mutation in mutations:
+        names.update(MUTATION_SIGNALS.get(mutation.get("type"), ()))
+    return names
+
+
+def rescore(base_signals: dict, overlay: ScenarioOverlay, mutations: list) -> dict:
+    """
+    Signals for a mutated state: only the signals the mutations can affect are
+    recomputed on the overlay, the rest are reused from the baseline. Matches
+    a full extract_signals on the mutated state.
+    """
+    names = affected_signals(mutations)
+    if not names:
+        return base_signals
+    recomputed = extract_signals(overlay.materialize(), names=names)
+    signals = dict(base_signals["signals"])
+    signals.update(recomputed["signals"])
+    return {"signals": signals, "metadata": recomputed["metadata"]}
+
+
+def apply_mutation(overlay: ScenarioOverlay, mutation: dict) -> ScenarioOverlay:
+    handler = MUTATION_HANDLERS.get(mutation.get("type"))
+    if handler is not None:
+        handler(overlay, mutation)
+    return overlay
+
+
+def plan_mutations(plan: dict) -> list:
+    """Expands {mutation_type: amount} into mutation dicts in COMBINED_MUTATION_ORDER."""
+    return [
+        {"type": mut_type, MUTATION_PARAMS[mut_type]: plan[mut_type]}
+        for mut_type in COMBINED_MUTATION_ORDER
+        if plan.get(mut_type)
+    ]
+
+
+# state_version -> (signals, risk) for the unmutated baseline
+_baseline_cache = OrderedDict()
+BASELINE_CACHE_SIZE = 8
+
+
+def score_baseline(data: dict, state_version: str = None) -> tuple:
+    """Signals and risk score for the unmutated state, cached per state version."""
+    if state_version is not None:
+        cached = _baseline_cache.get(state_version)
+        if cached is not None:
+            CACHE_REQUESTS.inc(cache="baseline_scores", result="hit")
+            _baseline_cache.move_to_end(state_version)
+            return cached
+        CACHE_REQUESTS.inc(cache="baseline_scores", result="miss")
 
-    # 3-6. Extraction and Scoring
     base_signals = extract_signals(data)
     base_risk = compute_risk_score(base_signals)
-    
-    sim_signals = extract_signals(sim_data)
+
+    if state_version is not None:
+        _baseline_cache[state_version] = (base_signals, base_risk)
+        while len(_baseline_cache) > BASELINE_CACHE_SIZE:
+            _baseline_cache.popitem(last=False)
+    return base_signals, base_risk
+
+
+def score_plan(data: dict, plan: dict, base_signals: dict = None) -> dict:
+    """Risk score of the state after applying a combined mutation plan."""
+    if base_signals is None:
+        base_signals, _ = score_baseline(data)
+    mutations = plan_mutations(plan)
+    overlay = ScenarioOverlay(data)
+    for mutation in mutations:
+        apply_mutation(overlay, mutation)
+    return compute_risk_score(rescore(base_signals, overlay, mutations))
+
+
+@timed("run_simulation")
+def run_simulation(data: dict, mutation: dict, state_version: str = None,
+                   monte_carlo: bool = False, n_simulations: int = 10000) -> dict:
+    # 1-2. Record the mutation on a copy-on-write overlay of the shared baseline
+    overlay = apply_mutation(ScenarioOverlay(data), mutation)
+
+    # 3-6. Extraction and Scoring
+    base_signals, base_risk = score_baseline(data, state_version)
+
+    sim_signals = rescore(base_signals, overlay, [mutation])
     sim_risk = compute_risk_score(sim_signals)
     
     # 7. Compute Deltas
@@ -122,7 +291,7 @@ def run_simulation(data: dict, mutation: dict) -> dict:
     risk_level_changed = base_risk["risk_level"] != sim_risk["risk_level"]
 
     # 8. Return Result
-    return {
+    result = {
         "baseline": {
             "total_score": base_risk["total_score"],
             "risk_level": base_risk["risk_level"],
@@ -142,12 +311,16 @@ def run_simulation(data: dict, mutation: dict) -> dict:
         "simulation_version": "1.0"
     }
 
+    # 9. Optional score distributions for both states from shared random draws
+    if monte_carlo:
+        result["monte_carlo"] = run_paired_monte_carlo(base_signals, sim_signals, n_simulations)
+    return result
+
 
 if __name__ == "__main__":
-    import json
+    from core.state_loader import load_project_state
 
-    with open("data/unified_project_state.json") as f:
-        data = json.load(f)
+    data, _ = load_project_state()
 
     scenarios = [
         {"type": "add_developers",  "count": 2},
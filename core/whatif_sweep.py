@@ -0,0 +1,209 @@
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from core.whatif_engine import MUTATION_PARAMS, COMBINED_MUTATION_ORDER, score_baseline, score_plan
+
+MAX_SWEEP_POINTS = 5000
+
+# The first chunk is always scored in-process and prices a point; the rest go
+# to the process pool only if scoring them here would take longer than this
+PARALLEL_MIN_SECONDS = 1.0
+POINTS_PER_CHUNK = 32
+
+# Baseline state and signals, set only inside pool worker processes by the initializer
+_worker_data = None
+_worker_base_signals = None
+
+# ((state_version, max_workers), ProcessPoolExecutor): one long-lived pool for the
+# current state, so the state is pickled to the workers once, not per request
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(data: dict, base_signals: dict):
+    global _worker_data, _worker_base_signals
+    _worker_data = data
+    _worker_base_signals = base_signals
+
+
+def _score_chunk(plans: list, data: dict, base_signals: dict) -> list:
+    results = []
+    for plan in plans:
+        risk = score_plan(data, plan, base_signals)
+        results.append((risk["total_score"], risk["risk_level"]))
+    return results
+
+
+def _score_worker_chunk(plans: list) -> list:
+    return _score_chunk(plans, _worker_data, _worker_base_signals)
+
+
+def _state_pool(state_version: str, data: dict, base_signals: dict, max_workers: int) -> ProcessPoolExecutor:
+    global _pool
+    key = (state_version, max_workers)
+    with _pool_lock:
+        if _pool is not None and _pool[0] == key:
+            return _pool[1]
+        if _pool is not None:
+            # Work already queued on the old pool still finishes
+            _pool[1].shutdown(wait=False)
+        # spawn, not fork: the API process runs executor threads that must not be cloned mid-lock
+        ctx = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx,
+                                   initializer=_init_worker, initargs=(data, base_signals))
+        _pool = (key, pool)
+        return pool
+
+
+def _drop_pool(pool: ProcessPoolExecutor):
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool[1] is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _axis_values(spec: dict) -> list:
+    start = int(spec.get("start", 0))
+    stop = int(spec.get("stop", start))
+    step = max(int(spec.get("step", 1)), 1)
+    if stop < start:
+        raise ValueError("Sweep range stop must be >= start.")
+    return list(range(start, stop + 1, step))
+
+
+def build_grid(ranges: dict) -> tuple:
+    """
+    Returns (axes, plans) for inclusive parameter ranges such as
+    {"add_developers": {"start": 1, "stop": 10}}. Plans are in row-major
+    order over the axes, last axis varying fastest.
+    """
+    axes = []
+    for mut_type in COMBINED_MUTATION_ORDER:
+        spec = ranges.get(mut_type)
+        if spec is None:
+            continue
+        axes.append({
+            "type": mut_type,
+            "param": MUTATION_PARAMS[mut_type],
+            "values": _axis_values(spec),
+        })
+    if not axes:
+        raise ValueError("Sweep needs at least one mutation range.")
+
+    n_points = 1
+    for axis in axes:
+        n_points *= len(axis["values"])
+    if n_points > MAX_SWEEP_POINTS:
+        raise ValueError(f"Sweep grid has {n_points} points; the limit is {MAX_SWEEP_POINTS}.")
+
+    plans = [
+        {axis["type"]: value for axis, value in zip(axes, combo)}
+        for combo in itertools.product(*[axis["values"] for axis in axes])
+    ]
+    return axes, plans
+
+
+def _score_grid(data: dict, base_signals: dict, plans: list, max_workers: int, state_version: str = None) -> list:
+    t0 = time.perf_counter()
+    head = _score_chunk(plans[:POINTS_PER_CHUNK], data, base_signals)
+    rest = plans[POINTS_PER_CHUNK:]
+    seconds_per_point = (time.perf_counter() - t0) / max(len(head), 1)
+    # Without a state version the pool could not be reused, so it would never pay off
+    if (not rest or max_workers <= 1 or state_version is None
+            or seconds_per_point * len(rest) < PARALLEL_MIN_SECONDS):
+        return head + _score_chunk(rest, data, base_signals)
+
+    pool = _state_pool(state_version, data, base_signals, max_workers)
+    chunks = [rest[i:i + POINTS_PER_CHUNK] for i in range(0, len(rest), POINTS_PER_CHUNK)]
+    results = list(head)
+    try:
+        for chunk_result in pool.map(_score_worker_chunk, chunks):
+            results.extend(chunk_result)
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool next time and finish this sweep here
+        _drop_pool(pool)
+        return head + _score_chunk(rest, data, base_signals)
+    return results
+
+
+def _level_boundaries(axes: list, plans: list, scored: list) -> list:
+    """Pairs of grid neighbours (one step apart on one axis) whose risk level differs."""
+    shape = [len(axis["values"]) for axis in axes]
+    strides = [1] * len(shape)
+    for i in range(len(shape) - 2, -1, -1):
+        strides[i] = strides[i + 1] * shape[i + 1]
+
+    boundaries = []
+    for idx, combo in enumerate(itertools.product(*[range(n) for n in shape])):
+        for axis_idx, axis in enumerate(axes):
+            if combo[axis_idx] + 1 >= shape[axis_idx]:
+                continue
+            neighbour = idx + strides[axis_idx]
+            if scored[idx][1] != scored[neighbour][1]:
+                boundaries.append({
+                    "axis": axis["type"],
+                    "from": plans[idx],
+                    "to": plans[neighbour],
+                    "from_level": scored[idx][1],
+                    "to_level": scored[neighbour][1],
+                })
+    return boundaries
+
+
+def run_sweep(data: dict, ranges: dict, state_version: str = None, max_workers: int = None) -> dict:
+    axes, plans = build_grid(ranges)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    base_signals, base_risk = score_baseline(data, state_version)
+    scored = _score_grid(data, base_signals, plans, max_workers, state_version)
+
+    best_idx = min(range(len(scored)), key=lambda i: scored[i][0])
+    return {
+        "baseline": {
+            "total_score": base_risk["total_score"],
+            "risk_level": base_risk["risk_level"],
+        },
+        "axes": axes,
+        "shape": [len(axis["values"]) for axis in axes],
+        "scores": [score for score, _ in scored],
+        "risk_levels": [level for _, level in scored],
+        "boundaries": _level_boundaries(axes, plans, scored),
+        "best": {
+            "plan": plans[best_idx],
+            "total_score": scored[best_idx][0],
+            "risk_level": scored[best_idx][1],
+            "delta": scored[best_idx][0] - base_risk["total_score"],
+        },
+        "n_points": len(plans),
+        "sweep_version": "1.0"
+    }
+
+
+if __name__ == "__main__":
+    import time
+    from core.state_loader import load_project_state
+
+    data, _ = load_project_state()
+
+    ranges = {
+        "add_developers":  {"start": 1, "stop": 10},
+        "extend_deadline": {"start": 0, "stop": 30, "step": 5},
+        "close_prs":       {"start": 0, "stop": 5},
+    }
+    t0 = time.perf_counter()
+    result = run_sweep(data, ranges)
+    elapsed = time.perf_counter() - t0
+
+    print(f"\nSweep: {result['n_points']} plans in {elapsed:.2f}s")
+    print(f"  Baseline: {result['baseline']['total_score']:.2f} ({result['baseline']['risk_level']})")
+    print(f"  Best:     {result['best']['total_score']:.2f} ({result['best']['risk_level']}) with {result['best']['plan']}")
+    print(f"  Level boundaries: {len(result['boundaries'])}")
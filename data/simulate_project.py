@@ -1,5 +1,8 @@
+import argparse
 import json
+import os
 import random
+from array import array
 from datetime import datetime, timezone, timedelta
 
 def to_iso(dt):
@@ -8,8 +11,35 @@ def to_iso(dt):
         return s.replace("+00:00", "Z")
     return s
 
-def main():
-    simulated_now = datetime.now(timezone.utc)
+def find_cyclic_tasks(n: int, deps) -> list:
+    """
+    Kahn's algorithm over integer adjacency (deps[i] = indices task i depends
+    on). Returns the indices that sit on, or depend through, a cycle — empty
+    for a DAG. O(V + E).
+    """
+    indegree = array("l", [0]) * n
+    for i in range(n):
+        for d in deps[i]:
+            indegree[d] += 1
+    stack = [i for i in range(n) if indegree[i] == 0]
+    seen = 0
+    while stack:
+        i = stack.pop()
+        seen += 1
+        for d in deps[i]:
+            indegree[d] -= 1
+            if indegree[d] == 0:
+                stack.append(d)
+    if seen == n:
+        return []
+    return [i for i in range(n) if indegree[i] > 0]
+
+
+def build_demo_state(seed=None, simulated_now=None) -> dict:
+    """The hand-tuned 40-task demo project Meridian ships with."""
+    rng = random.Random(seed)
+    if simulated_now is None:
+        simulated_now = datetime.now(timezone.utc)
     kickoff_date = simulated_now - timedelta(days=20)
     deadline_date = kickoff_date + timedelta(days=42)
     
@@ -52,7 +82,7 @@ def main():
     for i in range(2): assignees[open_tasks[i]] = "dev_1"
     pool_devs = ["dev_3", "dev_4", "dev_5", "dev_6"]
     # Reassign the other 4 blocked tasks to dev_3 through dev_6
-    for i in range(2, 6): assignees[open_tasks[i]] = random.choice(pool_devs)
+    for i in range(2, 6): assignees[open_tasks[i]] = rng.choice(pool_devs)
     # Give dev_1 and dev_2 their remaining tasks
     for i in range(6, 10): assignees[open_tasks[i]] = "dev_1"
     for i in range(10, 12): assignees[open_tasks[i]] = "dev_2"
@@ -62,11 +92,11 @@ def main():
     
     pool_devs = ["dev_3", "dev_4", "dev_5", "dev_6"]
     for i in range(15, 30):
-        assignees[open_tasks[i]] = random.choice(pool_devs)
+        assignees[open_tasks[i]] = rng.choice(pool_devs)
         
     done_tasks = [i for i, s in enumerate(statuses) if s == 'done']
     for idx in done_tasks:
-        assignees[idx] = random.choice(pool_devs)
+        assignees[idx] = rng.choice(pool_devs)
         
     for i in range(40):
         is_baseline = (i < 30)
@@ -77,23 +107,23 @@ def main():
             sprint = sprints[sprint_idx]
             s_start = datetime.fromisoformat(sprint["start_date"].replace('Z', '+00:00'))
             
-            c_offset = random.randint(1, 5 * 86400)
+            c_offset = rng.randint(1, 5 * 86400)
             created_at = s_start + timedelta(seconds=c_offset)
             
             max_updated = simulated_now - timedelta(hours=72) if status in ['blocked', 'in_progress'] else simulated_now
             if created_at > max_updated - timedelta(hours=1):
                 created_at = max_updated - timedelta(hours=1)
         else:
-            sprint_idx = random.randint(0, 2)
+            sprint_idx = rng.randint(0, 2)
             sprint = sprints[sprint_idx]
             s_start = datetime.fromisoformat(sprint["start_date"].replace('Z', '+00:00'))
             
             c_max = min(simulated_now, s_start)
             c_max_sec = int((c_max - kickoff_date).total_seconds())
             if c_max_sec <= 0: c_max_sec = 86400
-            created_at = kickoff_date + timedelta(seconds=random.randint(0, c_max_sec))
+            created_at = kickoff_date + timedelta(seconds=rng.randint(0, c_max_sec))
 
-        d_offset = random.randint(0, 14 * 86400)
+        d_offset = rng.randint(0, 14 * 86400)
         due_date = s_start + timedelta(seconds=d_offset)
         if due_date < created_at:
             due_date = created_at + timedelta(days=1)
@@ -104,7 +134,7 @@ def main():
             
         u_max_sec = int((max_updated - created_at).total_seconds())
         if u_max_sec <= 0: u_max_sec = 1
-        updated_at = created_at + timedelta(seconds=random.randint(0, u_max_sec))
+        updated_at = created_at + timedelta(seconds=rng.randint(0, u_max_sec))
         
         tasks.append({
             "task_id": f"task_{i+1}",
@@ -143,35 +173,22 @@ def main():
     # Extra random deps to meet any leftover constraints
     dependent_on_blocked = [36, 37, 38]
     for idx in dependent_on_blocked:
-        blocked_target = f"task_{random.randint(3, 7)}"
+        blocked_target = f"task_{rng.randint(3, 7)}"
         tasks[idx]["depends_on"].append(blocked_target)
 
-    # Validate DAG iteratively
-    visited = {}
-    
-    def has_cycle(tid, path):
-        if tid in path: return True
-        if tid in visited: return visited[tid]
-        path.add(tid)
-        t_obj = next(t for t in tasks if t["task_id"] == tid)
-        for dep in t_obj["depends_on"]:
-            if has_cycle(dep, path): return True
-        path.remove(tid)
-        visited[tid] = False
-        return False
-
-    for t in tasks:
-        if has_cycle(t["task_id"], set()):
-            print(f"Cycle detected at {t['task_id']}, removing dependencies")
-            t["depends_on"] = []
+    # Validate DAG in linear time; drop the dependencies of tasks on or behind a cycle
+    index = {t["task_id"]: i for i, t in enumerate(tasks)}
+    for i in find_cyclic_tasks(len(tasks), [[index[d] for d in t["depends_on"] if d in index] for t in tasks]):
+        print(f"Cycle detected at {tasks[i]['task_id']}, removing dependencies")
+        tasks[i]["depends_on"] = []
 
     # Pull Requests
     prs = []
     pool_tasks = [t["task_id"] for t in tasks]
     for i in range(15):
         pr_id = f"pr_{i+1}"
-        author = random.choice([d["dev_id"] for d in developers])
-        t_id = None if i < 2 else random.choice(pool_tasks)
+        author = rng.choice([d["dev_id"] for d in developers])
+        t_id = None if i < 2 else rng.choice(pool_tasks)
             
         if i < 5:
             status = "open"
@@ -179,15 +196,15 @@ def main():
             max_c = simulated_now - timedelta(days=5)
             c_sec = int((max_c - kickoff_date).total_seconds())
             if c_sec <= 0: c_sec = 86400
-            created_at = kickoff_date + timedelta(seconds=random.randint(0, c_sec))
+            created_at = kickoff_date + timedelta(seconds=rng.randint(0, c_sec))
         else:
             status = "merged"
             c_sec = int((simulated_now - kickoff_date).total_seconds())
-            c_offset = random.randint(0, c_sec - 1000)
+            c_offset = rng.randint(0, c_sec - 1000)
             created_at = kickoff_date + timedelta(seconds=c_offset)
             m_sec = int((simulated_now - created_at).total_seconds())
             if m_sec <= 0: m_sec = 3600
-            merged_at = created_at + timedelta(seconds=random.randint(1, m_sec))
+            merged_at = created_at + timedelta(seconds=rng.randint(1, m_sec))
             
         prs.append({
             "pr_id": pr_id,
@@ -209,19 +226,19 @@ def main():
         reply_to = None
         
         t_sec = int((simulated_now - kickoff_date).total_seconds())
-        base_time = kickoff_date + timedelta(seconds=random.randint(0, t_sec - 86400))
+        base_time = kickoff_date + timedelta(seconds=rng.randint(0, t_sec - 86400))
         
         for m in range(size):
             msg_id = f"msg_{msg_idx}"
             m_time = base_time + timedelta(hours=m*2)
             if m_time > simulated_now:
-                m_time = simulated_now - timedelta(minutes=random.randint(1, 60))
+                m_time = simulated_now - timedelta(minutes=rng.randint(1, 60))
                 
             cutoff = simulated_now - timedelta(hours=72)
             allowed_devs = [d["dev_id"] for d in developers]
             if m_time > cutoff:
                 allowed_devs.remove("dev_6")
-            author = random.choice(allowed_devs)
+            author = rng.choice(allowed_devs)
             
             if t_idx == 0 and m == 0:
                 author = "dev_6"
@@ -229,7 +246,7 @@ def main():
                 base_time = m_time
 
             has_trigger = False
-            if triggers > 0 and random.random() < 0.2:
+            if triggers > 0 and rng.random() < 0.2:
                 has_trigger = True
                 triggers -= 1
                 
@@ -257,9 +274,12 @@ def main():
         "messages": messages
     }
     
-    with open("data/unified_project_state.json", "w") as f:
-        json.dump(state, f, indent=2)
-        
+    return state
+
+
+def print_demo_summary(state: dict):
+    tasks = state["tasks"]
+    simulated_now = datetime.fromisoformat(state["metadata"]["simulated_now"].replace('Z', '+00:00'))
     blocked = len([t for t in tasks if t["status"] == "blocked"])
     overdue = 0
     for t in tasks:
@@ -269,16 +289,260 @@ def main():
             
     devs_with_msg_last_72 = set()
     cutoff = simulated_now - timedelta(hours=72)
-    for m in messages:
+    for m in state["messages"]:
         dt = datetime.fromisoformat(m["timestamp"].replace('Z', '+00:00'))
         if dt > cutoff:
             devs_with_msg_last_72.add(m["user_id"])
             
-    silent_devs = len([d for d in developers if d["dev_id"] not in devs_with_msg_last_72])
+    silent_devs = len([d for d in state["developers"] if d["dev_id"] not in devs_with_msg_last_72])
     
     print("✅ unified_project_state.json generated")
-    print(f"   Tasks: {len(tasks)} | PRs: {len(prs)} | Messages: {len(messages)} | Developers: {len(developers)}")
+    print(f"   Tasks: {len(tasks)} | PRs: {len(state['pull_requests'])} | Messages: {len(state['messages'])} | Developers: {len(state['developers'])}")
     print(f"   Blocked tasks: {blocked} | Overdue tasks: {overdue} | Silent devs: {silent_devs}")
 
+
+# ---- Scale generator ----
+
+GRAPH_SHAPES = ("chains", "hubs", "random")
+TASK_STATUSES = ["done"] * 25 + ["in_progress"] * 35 + ["todo"] * 25 + ["blocked"] * 15
+SPRINT_DAYS = 14
+
+
+class _DependencyCSR:
+    """Compact CSR of generated depends_on edges, kept only for the acyclicity check."""
+
+    def __init__(self):
+        self.offsets = array("q", [0])
+        self.targets = array("l")
+
+    def add(self, deps: list):
+        self.targets.extend(deps)
+        self.offsets.append(len(self.targets))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+
+def _task_deps(rng, i: int, n_tasks: int, graph: str, depth: int, chain_length: int, hubs: int) -> list:
+    if graph == "chains":
+        # Each chain runs task k -> k+1 -> ... for chain_length tasks
+        if (i + 1) % chain_length != 0 and i + 1 < n_tasks:
+            return [i + 1]
+        return []
+    if graph == "hubs":
+        # The first `hubs` tasks are depended on by roughly half of everything else
+        if i < hubs or rng.random() >= 0.5:
+            return []
+        return [rng.randrange(hubs)]
+    # random: tasks are split into `depth` contiguous levels; each depends on 1-3 tasks one level down.
+    # With fewer tasks than levels some levels would be empty, so there is one level per task
+    depth = min(depth, n_tasks)
+    level = i * depth // n_tasks
+    if level == 0:
+        return []
+    lo = -(-(level - 1) * n_tasks // depth)
+    hi = -(-level * n_tasks // depth)
+    return sorted({rng.randrange(lo, hi) for _ in range(rng.randint(1, 3))})
+
+
+def iter_project(seed: int, n_tasks: int, n_devs: int, n_prs: int, n_messages: int,
+                 graph: str = "random", depth: int = 8, chain_length: int = 8, hubs: int = 5,
+                 simulated_now: datetime = None, project_id: str = "proj_generated"):
+    """
+    Yields (section, record) pairs for a synthetic project in file order:
+    metadata, sprints, developers, tasks, pull_requests, messages. Nothing is
+    accumulated except a compact CSR of task dependencies, which is checked
+    for cycles in linear time once the tasks are exhausted.
+    """
+    if graph not in GRAPH_SHAPES:
+        raise ValueError(f"graph must be one of {', '.join(GRAPH_SHAPES)}")
+    rng = random.Random(seed)
+    if simulated_now is None:
+        simulated_now = datetime.now(timezone.utc)
+    kickoff_date = simulated_now - timedelta(days=45)
+    deadline_date = simulated_now + timedelta(days=45)
+    span = int((simulated_now - kickoff_date).total_seconds())
+
+    yield "metadata", {
+        "project_id": project_id,
+        "project_name": project_id.replace("_", " ").title(),
+        "kickoff_date": to_iso(kickoff_date),
+        "deadline_date": to_iso(deadline_date),
+        "simulated_now": to_iso(simulated_now)
+    }
+
+    n_sprints = -(-(deadline_date - kickoff_date).days // SPRINT_DAYS)
+    sprint_starts = [kickoff_date + timedelta(days=SPRINT_DAYS * i) for i in range(n_sprints)]
+    for i, start in enumerate(sprint_starts):
+        yield "sprints", {
+            "sprint_id": f"sprint_{i+1}",
+            "start_date": to_iso(start),
+            "end_date": to_iso(start + timedelta(days=SPRINT_DAYS))
+        }
+
+    dev_ids = [f"dev_{i+1}" for i in range(n_devs)]
+    for i, dev_id in enumerate(dev_ids):
+        yield "developers", {
+            "dev_id": dev_id,
+            "name": f"Developer {i+1}",
+            "role": "lead" if i % 8 == 0 else "developer"
+        }
+
+    csr = _DependencyCSR()
+    for i in range(n_tasks):
+        status = rng.choice(TASK_STATUSES)
+        created_at = kickoff_date + timedelta(seconds=rng.randint(0, span))
+        updated_at = created_at + timedelta(seconds=rng.randint(0, int((simulated_now - created_at).total_seconds())))
+        sprint_idx = min(int((created_at - kickoff_date).days // SPRINT_DAYS), n_sprints - 1)
+        due_date = sprint_starts[sprint_idx] + timedelta(seconds=rng.randint(0, SPRINT_DAYS * 86400))
+        deps = _task_deps(rng, i, n_tasks, graph, depth, chain_length, hubs)
+        csr.add(deps)
+        yield "tasks", {
+            "task_id": f"task_{i+1}",
+            "title": f"Task {i+1}",
+            "status": status,
+            "assigned_to": None if (not dev_ids or rng.random() < 0.08) else rng.choice(dev_ids),
+            "created_at": to_iso(created_at),
+            "updated_at": to_iso(updated_at),
+            "due_date": to_iso(due_date),
+            "sprint_id": f"sprint_{sprint_idx+1}",
+            "depends_on": [f"task_{d+1}" for d in deps],
+            "is_baseline": rng.random() < 0.8
+        }
+
+    cyclic = find_cyclic_tasks(len(csr), csr)
+    if cyclic:
+        raise RuntimeError(f"Generated dependency graph has a cycle through task_{cyclic[0] + 1}")
+
+    for i in range(n_prs):
+        created_at = kickoff_date + timedelta(seconds=rng.randint(0, span))
+        is_open = rng.random() < 0.3
+        merged_at = None if is_open else created_at + timedelta(
+            seconds=rng.randint(1, max(int((simulated_now - created_at).total_seconds()), 1)))
+        yield "pull_requests", {
+            "pr_id": f"pr_{i+1}",
+            "task_id": None if (n_tasks == 0 or rng.random() < 0.05) else f"task_{rng.randrange(n_tasks) + 1}",
+            "author_id": rng.choice(dev_ids) if dev_ids else None,
+            "created_at": to_iso(created_at),
+            "merged_at": to_iso(merged_at) if merged_at else None,
+            "status": "open" if is_open else "merged"
+        }
+
+    thread_idx = 0
+    remaining = 0
+    reply_to = None
+    m_time = kickoff_date
+    for i in range(n_messages):
+        if remaining == 0:
+            thread_idx += 1
+            remaining = rng.choice([1, 1, 2, 3, 4, 6])
+            reply_to = None
+            m_time = kickoff_date + timedelta(seconds=rng.randint(0, span))
+        else:
+            m_time = min(m_time + timedelta(minutes=rng.randint(5, 240)), simulated_now)
+        msg_id = f"msg_{i+1}"
+        yield "messages", {
+            "message_id": msg_id,
+            "user_id": rng.choice(dev_ids) if dev_ids else None,
+            "timestamp": to_iso(m_time),
+            "thread_id": f"thread_{thread_idx}",
+            "reply_to_id": reply_to,
+            "contains_trigger_word": rng.random() < 0.03
+        }
+        reply_to = msg_id
+        remaining -= 1
+
+
+def write_project(path: str, records) -> dict:
+    """Streams (section, record) pairs to a JSON state file; returns per-section counts."""
+    counts = {}
+    section = None
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{")
+        for name, record in records:
+            if name == "metadata":
+                f.write(f'"metadata": {json.dumps(record)}')
+                counts[name] = 1
+                continue
+            if name != section:
+                f.write("]" if section not in (None, "metadata") else "")
+                f.write(f',\n"{name}": [\n')
+                section = name
+                counts[name] = 0
+            else:
+                f.write(",\n")
+            f.write(json.dumps(record))
+            counts[name] += 1
+        if section not in (None, "metadata"):
+            f.write("]")
+        f.write("}\n")
+    return counts
+
+
+def generate_state(**kwargs) -> dict:
+    """Materialises iter_project() as an in-memory state dict (for benchmarks)."""
+    state = {"metadata": None, "sprints": [], "developers": [], "tasks": [], "pull_requests": [], "messages": []}
+    for name, record in iter_project(**kwargs):
+        if name == "metadata":
+            state["metadata"] = record
+        else:
+            state[name].append(record)
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Meridian project state files.")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed for reproducible output")
+    parser.add_argument("--now", default=None, help="simulated_now as ISO-8601 (default: current time)")
+    parser.add_argument("--tasks", type=int, default=None, help="generate a synthetic project with this many tasks instead of the demo")
+    parser.add_argument("--devs", type=int, default=50)
+    parser.add_argument("--prs", type=int, default=None, help="default: tasks / 3")
+    parser.add_argument("--messages", type=int, default=None, help="default: 3 x tasks")
+    parser.add_argument("--projects", type=int, default=1)
+    parser.add_argument("--graph", choices=GRAPH_SHAPES, default="random")
+    parser.add_argument("--depth", type=int, default=8, help="levels of the random DAG")
+    parser.add_argument("--chain-length", type=int, default=8)
+    parser.add_argument("--hubs", type=int, default=5, help="fan-in hub tasks for --graph hubs")
+    parser.add_argument("--out", default=None, help="output file (one project) or directory (several)")
+    args = parser.parse_args()
+
+    simulated_now = None
+    if args.now:
+        simulated_now = datetime.fromisoformat(args.now.replace("Z", "+00:00"))
+
+    if args.tasks is None:
+        state = build_demo_state(args.seed, simulated_now)
+        with open(args.out or "data/unified_project_state.json", "w") as f:
+            json.dump(state, f, indent=2)
+        print_demo_summary(state)
+        return
+
+    base_seed = args.seed if args.seed is not None else random.randrange(2**32)
+    out = args.out or ("data/generated" if args.projects > 1 else "data/generated_project_state.json")
+    for p in range(args.projects):
+        if args.projects > 1:
+            os.makedirs(out, exist_ok=True)
+            path = os.path.join(out, f"project_{p+1:03d}.json")
+        else:
+            path = out
+        counts = write_project(path, iter_project(
+            seed=base_seed + p,
+            n_tasks=args.tasks,
+            n_devs=args.devs,
+            n_prs=args.prs if args.prs is not None else args.tasks // 3,
+            n_messages=args.messages if args.messages is not None else args.tasks * 3,
+            graph=args.graph,
+            depth=args.depth,
+            chain_length=args.chain_length,
+            hubs=args.hubs,
+            simulated_now=simulated_now,
+            project_id=f"proj_{p+1:03d}",
+        ))
+        print(f"✅ {path}: " + " | ".join(f"{k}: {v}" for k, v in counts.items() if k != "metadata"))
+
+
 if __name__ == "__main__":
     main()